@@ -0,0 +1,33 @@
+"""transaction access path indexes
+
+Revision ID: 9b1d5e7c2a40
+Revises: 6334730e3fa7
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b1d5e7c2a40"
+down_revision: Union[str, None] = "6334730e3fa7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_accounts_user_id", "accounts", ["user_id"])
+    op.create_index("ix_transactions_account_id_date", "transactions", ["account_id", "date"])
+    op.create_index("ix_transactions_subcategory_id_date", "transactions", ["subcategory_id", "date"])
+    op.create_index("ix_transactions_income_id_date", "transactions", ["income_id", "date"])
+    op.create_index("ix_transactions_date", "transactions", ["date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_date", table_name="transactions")
+    op.drop_index("ix_transactions_income_id_date", table_name="transactions")
+    op.drop_index("ix_transactions_subcategory_id_date", table_name="transactions")
+    op.drop_index("ix_transactions_account_id_date", table_name="transactions")
+    op.drop_index("ix_accounts_user_id", table_name="accounts")
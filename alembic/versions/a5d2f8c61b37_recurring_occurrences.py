@@ -0,0 +1,61 @@
+"""recurring occurrences
+
+Revision ID: a5d2f8c61b37
+Revises: e7a3c9d14f52
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a5d2f8c61b37"
+down_revision: Union[str, None] = "e7a3c9d14f52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recurring_occurrences",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("occurrence_date", sa.DateTime(), nullable=False),
+        sa.Column("income_id", sa.Integer(), nullable=True),
+        sa.Column("subcategory_id", sa.Integer(), nullable=True),
+        sa.Column("transaction_id", sa.Integer(), nullable=True),
+        sa.CheckConstraint(
+            "(subcategory_id IS NOT NULL AND income_id IS NULL) OR (subcategory_id IS NULL AND income_id IS NOT NULL)",
+            name="check_subcategory_or_income",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="user"),
+        sa.ForeignKeyConstraint(["income_id"], ["incomes.id"], name="income"),
+        sa.ForeignKeyConstraint(["subcategory_id"], ["subcategories.id"], name="subcategory"),
+        sa.ForeignKeyConstraint(
+            ["transaction_id"], ["transactions.id"], name="occurrence_transaction", ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ux_recurring_occurrences_key",
+        "recurring_occurrences",
+        ["user_id", "occurrence_date", sa.text("ifnull(income_id, 0)"), sa.text("ifnull(subcategory_id, 0)")],
+        unique=True,
+    )
+    op.create_table(
+        "recurring_runs",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("last_run", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="user"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("recurring_runs")
+    op.drop_index("ux_recurring_occurrences_key", table_name="recurring_occurrences")
+    op.drop_table("recurring_occurrences")
@@ -0,0 +1,25 @@
+"""transaction value index
+
+Revision ID: b8e4c1d93f06
+Revises: a5d2f8c61b37
+Create Date: 2026-10-18 19:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e4c1d93f06"
+down_revision: Union[str, None] = "a5d2f8c61b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_transactions_value", "transactions", ["value"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_value", table_name="transactions")
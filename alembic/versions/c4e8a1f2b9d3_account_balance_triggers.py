@@ -0,0 +1,73 @@
+"""account balance triggers
+
+Revision ID: c4e8a1f2b9d3
+Revises: 9b1d5e7c2a40
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a1f2b9d3"
+down_revision: Union[str, None] = "9b1d5e7c2a40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def balance_updates(row: str, sign: str) -> str:
+    return f"""
+    UPDATE accounts
+    SET balance = balance {sign} (CASE {row}.transaction_type WHEN 'Income' THEN {row}.value ELSE -{row}.value END)
+        * (CASE WHEN account_type = 'CARD' AND {row}.transaction_type != 'Transfer' THEN -1 ELSE 1 END)
+    WHERE id = {row}.account_id;
+    UPDATE accounts SET balance = balance {sign} {row}.value
+    WHERE id = {row}.target_account_id AND {row}.transaction_type = 'Transfer';"""
+
+
+def upgrade() -> None:
+    op.add_column("accounts", sa.Column("opening_balance", sa.Integer(), nullable=False, server_default="0"))
+
+    # the opening balance is the current balance without the transactions, so the balances don't change
+    op.execute("""
+        UPDATE accounts
+        SET opening_balance = balance - COALESCE((
+            SELECT SUM(
+                (CASE transactions.transaction_type WHEN 'Income' THEN value ELSE -value END)
+                * (CASE WHEN accounts.account_type = 'CARD' AND transactions.transaction_type != 'Transfer'
+                   THEN -1 ELSE 1 END)
+            )
+            FROM transactions WHERE transactions.account_id = accounts.id
+        ), 0) - COALESCE((
+            SELECT SUM(value) FROM transactions
+            WHERE transactions.target_account_id = accounts.id AND transactions.transaction_type = 'Transfer'
+        ), 0)
+        """)
+
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_balance_insert AFTER INSERT ON transactions
+        BEGIN{balance_updates("NEW", "+")}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_balance_update
+        AFTER UPDATE OF account_id, target_account_id, transaction_type, value ON transactions
+        BEGIN{balance_updates("OLD", "-")}{balance_updates("NEW", "+")}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_balance_delete AFTER DELETE ON transactions
+        BEGIN{balance_updates("OLD", "-")}
+        END
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_balance_delete")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_balance_update")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_balance_insert")
+    op.drop_column("accounts", "opening_balance")
@@ -0,0 +1,60 @@
+"""transaction search index
+
+Revision ID: d3f7a2b59e18
+Revises: b8e4c1d93f06
+Create Date: 2026-10-18 21:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f7a2b59e18"
+down_revision: Union[str, None] = "b8e4c1d93f06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def search_add(row: str) -> str:
+    return f"""
+    INSERT INTO transactions_fts (rowid, description) VALUES ({row}.id, {row}.description);"""
+
+
+def search_remove(row: str) -> str:
+    return f"""
+    INSERT INTO transactions_fts (transactions_fts, rowid, description) VALUES ('delete', {row}.id, {row}.description);"""
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE VIRTUAL TABLE transactions_fts USING fts5(
+            description, content='transactions', content_rowid='id', tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+        """)
+    op.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_search_insert AFTER INSERT ON transactions
+        BEGIN{search_add("NEW")}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_search_update AFTER UPDATE OF description ON transactions
+        BEGIN{search_remove("OLD")}{search_add("NEW")}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_search_delete AFTER DELETE ON transactions
+        BEGIN{search_remove("OLD")}
+        END
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_search_delete")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_search_update")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_search_insert")
+    op.execute("DROP TABLE IF EXISTS transactions_fts")
@@ -0,0 +1,117 @@
+"""monthly rollups
+
+Revision ID: e7a3c9d14f52
+Revises: c4e8a1f2b9d3
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a3c9d14f52"
+down_revision: Union[str, None] = "c4e8a1f2b9d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def rollup_key(row: str) -> str:
+    return f"""user_id = (SELECT user_id FROM accounts WHERE id = {row}.account_id)
+        AND month = substr({row}.date, 1, 7)
+        AND account_id = {row}.account_id
+        AND transaction_type = {row}.transaction_type
+        AND ifnull(subcategory_id, 0) = ifnull({row}.subcategory_id, 0)
+        AND ifnull(income_id, 0) = ifnull({row}.income_id, 0)"""
+
+
+def rollup_add(row: str) -> str:
+    return f"""
+    INSERT OR IGNORE INTO monthly_rollups
+        (user_id, month, account_id, transaction_type, subcategory_id, income_id, total, count)
+    SELECT user_id, substr({row}.date, 1, 7), {row}.account_id, {row}.transaction_type, {row}.subcategory_id,
+        {row}.income_id, 0, 0
+    FROM accounts WHERE id = {row}.account_id;
+    UPDATE monthly_rollups SET total = total + {row}.value, count = count + 1
+    WHERE {rollup_key(row)};"""
+
+
+def rollup_remove(row: str) -> str:
+    return f"""
+    UPDATE monthly_rollups SET total = total - {row}.value, count = count - 1
+    WHERE {rollup_key(row)};
+    DELETE FROM monthly_rollups
+    WHERE count = 0 AND {rollup_key(row)};"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "transaction_type", sa.Enum("Income", "Expense", "Transfer", name="transactiontypeenum"), nullable=False
+        ),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("subcategory_id", sa.Integer(), nullable=True),
+        sa.Column("income_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="user"),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], name="account"),
+        sa.ForeignKeyConstraint(["subcategory_id"], ["subcategories.id"], name="subcategory"),
+        sa.ForeignKeyConstraint(["income_id"], ["incomes.id"], name="income"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ux_monthly_rollups_key",
+        "monthly_rollups",
+        [
+            "user_id",
+            "month",
+            "account_id",
+            "transaction_type",
+            sa.text("ifnull(subcategory_id, 0)"),
+            sa.text("ifnull(income_id, 0)"),
+        ],
+        unique=True,
+    )
+
+    op.execute("""
+        INSERT INTO monthly_rollups
+            (user_id, month, account_id, transaction_type, subcategory_id, income_id, total, count)
+        SELECT accounts.user_id, substr(transactions.date, 1, 7), transactions.account_id,
+            transactions.transaction_type, transactions.subcategory_id, transactions.income_id,
+            SUM(transactions.value), COUNT(*)
+        FROM transactions JOIN accounts ON transactions.account_id = accounts.id
+        GROUP BY 1, 2, 3, 4, 5, 6
+        """)
+
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_rollup_insert AFTER INSERT ON transactions
+        BEGIN{rollup_add("NEW")}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_rollup_update
+        AFTER UPDATE OF account_id, date, transaction_type, value, subcategory_id, income_id ON transactions
+        BEGIN{rollup_remove("OLD")}{rollup_add("NEW")}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_rollup_delete AFTER DELETE ON transactions
+        BEGIN{rollup_remove("OLD")}
+        END
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_rollup_delete")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_rollup_update")
+    op.execute("DROP TRIGGER IF EXISTS trg_transactions_rollup_insert")
+    op.drop_index("ux_monthly_rollups_key", table_name="monthly_rollups")
+    op.drop_table("monthly_rollups")
@@ -0,0 +1,171 @@
+"""exchange rates
+
+Revision ID: f2b6d8a41c73
+Revises: d3f7a2b59e18
+Create Date: 2026-10-18 23:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b6d8a41c73"
+down_revision: Union[str, None] = "d3f7a2b59e18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = ("trg_transactions_rollup_insert", "trg_transactions_rollup_update", "trg_transactions_rollup_delete")
+
+
+def rollup_key(row: str, currency: bool) -> str:
+    currency_key = (
+        f"""
+        AND currency_id = {row}.currency_id"""
+        if currency
+        else ""
+    )
+    return f"""user_id = (SELECT user_id FROM accounts WHERE id = {row}.account_id)
+        AND month = substr({row}.date, 1, 7)
+        AND account_id = {row}.account_id
+        AND transaction_type = {row}.transaction_type{currency_key}
+        AND ifnull(subcategory_id, 0) = ifnull({row}.subcategory_id, 0)
+        AND ifnull(income_id, 0) = ifnull({row}.income_id, 0)"""
+
+
+def rollup_add(row: str, currency: bool) -> str:
+    currency_column = "currency_id, " if currency else ""
+    currency_value = f"{row}.currency_id, " if currency else ""
+    return f"""
+    INSERT OR IGNORE INTO monthly_rollups
+        (user_id, month, account_id, transaction_type, {currency_column}subcategory_id, income_id, total, count)
+    SELECT user_id, substr({row}.date, 1, 7), {row}.account_id, {row}.transaction_type, {currency_value}
+        {row}.subcategory_id, {row}.income_id, 0, 0
+    FROM accounts WHERE id = {row}.account_id;
+    UPDATE monthly_rollups SET total = total + {row}.value, count = count + 1
+    WHERE {rollup_key(row, currency)};"""
+
+
+def rollup_remove(row: str, currency: bool) -> str:
+    return f"""
+    UPDATE monthly_rollups SET total = total - {row}.value, count = count - 1
+    WHERE {rollup_key(row, currency)};
+    DELETE FROM monthly_rollups
+    WHERE count = 0 AND {rollup_key(row, currency)};"""
+
+
+def create_rollups(currency: bool) -> None:
+    """Create the monthly rollups table, with or without the currency in the key, fill it from the transactions and
+    create the triggers that keep it."""
+    currency_columns = [sa.Column("currency_id", sa.Integer(), nullable=False)] if currency else []
+    currency_constraints = (
+        [sa.ForeignKeyConstraint(["currency_id"], ["currencies.id"], name="currency")] if currency else []
+    )
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.String(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "transaction_type", sa.Enum("Income", "Expense", "Transfer", name="transactiontypeenum"), nullable=False
+        ),
+        *currency_columns,
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("subcategory_id", sa.Integer(), nullable=True),
+        sa.Column("income_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="user"),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], name="account"),
+        *currency_constraints,
+        sa.ForeignKeyConstraint(["subcategory_id"], ["subcategories.id"], name="subcategory"),
+        sa.ForeignKeyConstraint(["income_id"], ["incomes.id"], name="income"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ux_monthly_rollups_key",
+        "monthly_rollups",
+        [
+            "user_id",
+            "month",
+            "account_id",
+            "transaction_type",
+            *(["currency_id"] if currency else []),
+            sa.text("ifnull(subcategory_id, 0)"),
+            sa.text("ifnull(income_id, 0)"),
+        ],
+        unique=True,
+    )
+
+    currency_column = "currency_id, " if currency else ""
+    currency_value = "transactions.currency_id, " if currency else ""
+    op.execute(f"""
+        INSERT INTO monthly_rollups
+            (user_id, month, account_id, transaction_type, {currency_column}subcategory_id, income_id, total, count)
+        SELECT accounts.user_id, substr(transactions.date, 1, 7), transactions.account_id,
+            transactions.transaction_type, {currency_value}transactions.subcategory_id, transactions.income_id,
+            SUM(transactions.value), COUNT(*)
+        FROM transactions JOIN accounts ON transactions.account_id = accounts.id
+        GROUP BY {", ".join(str(column) for column in range(1, 8 if currency else 7))}
+        """)
+
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_rollup_insert AFTER INSERT ON transactions
+        BEGIN{rollup_add("NEW", currency)}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_rollup_update
+        AFTER UPDATE OF account_id, date, transaction_type, {currency_column}value, subcategory_id, income_id
+        ON transactions
+        BEGIN{rollup_remove("OLD", currency)}{rollup_add("NEW", currency)}
+        END
+        """)
+    op.execute(f"""
+        CREATE TRIGGER trg_transactions_rollup_delete AFTER DELETE ON transactions
+        BEGIN{rollup_remove("OLD", currency)}
+        END
+        """)
+
+
+def drop_rollups() -> None:
+    for trigger in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_index("ux_monthly_rollups_key", table_name="monthly_rollups")
+    op.drop_table("monthly_rollups")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "exchange_rates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rate_date", sa.DateTime(), nullable=False),
+        sa.Column("base_currency_id", sa.Integer(), nullable=False),
+        sa.Column("quote_currency_id", sa.Integer(), nullable=False),
+        sa.Column("rate", sa.Float(), nullable=False),
+        sa.CheckConstraint("rate > 0", name="check_positive_rate"),
+        sa.ForeignKeyConstraint(["base_currency_id"], ["currencies.id"], name="base_currency"),
+        sa.ForeignKeyConstraint(["quote_currency_id"], ["currencies.id"], name="quote_currency"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ux_exchange_rates_key",
+        "exchange_rates",
+        ["base_currency_id", "quote_currency_id", "rate_date"],
+        unique=True,
+    )
+
+    # the rollups are recreated with the currency in their key, so the totals can be converted before they are added
+    drop_rollups()
+    create_rollups(currency=True)
+
+
+def downgrade() -> None:
+    drop_rollups()
+    create_rollups(currency=False)
+
+    op.drop_index("ux_exchange_rates_key", table_name="exchange_rates")
+    op.drop_table("exchange_rates")
@@ -0,0 +1,52 @@
+"""Measure the time to build a budget report over ten years of transactions.
+
+Run from the project root with the package installed (``poetry install``):
+
+    python benchmarks/budget_report.py --subcategories 200 --transactions 200000
+
+The report covers the last 120 months of a user with recurrent subcategories and transactions spread over ten years.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from login_time import populate
+
+from ezbudget.analytics import build_budget_report
+from ezbudget.model import Model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subcategories", type=int, default=200)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        model = Model(category_data=None, currency_data=None, database_name="budget_report")
+        populate(model, args.transactions, number_of_subcategories=args.subcategories)
+
+        now = datetime.now()
+        first_month = f"{now.year - 10:04d}-{now.month:02d}"
+        last_month = f"{now.year:04d}-{now.month:02d}"
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            report = build_budget_report(model, 1, first_month, last_month)
+            report.rolling_average(window=3)
+            report.year_over_year(relative=True)
+            report.yearly_totals()
+            timings.append(time.perf_counter() - start)
+        model.close_session()
+
+    print(f"{report.actual.shape[0]} subcategories x {report.actual.shape[1]} months")
+    print(f"best {min(timings) * 1000:.1f} ms, worst {max(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Generate a synthetic multi-year ledger for the benchmarks.
+
+The ledger has users, each with accounts, income sources and recurrent user categories, and transactions spread over
+the years before the end date. The same seed and sizes give the same ledger, with the dates counted back from the end
+date, so the results of two commits are comparable when they are run with the same arguments.
+
+Run from the project root with the package installed (``poetry install``) to create a database to explore:
+
+    python benchmarks/ledger.py --transactions 1000000 --database ledger
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+from ezbudget.model import Model, RecurrenceEnum
+from ezbudget.utils import get_hashed_password
+
+PASSWORD = "BenchmarkPassword1"
+CATEGORY_TYPES = ("NEED", "WANT", "SAVINGS", "DEBT")
+CURRENCIES = (("Euro", "€", "EUR"), ("Dollar", "$", "USD"))
+# share of the transactions of each type, the rest are expenses
+INCOME_SHARE = 0.1
+TRANSFER_SHARE = 0.05
+
+
+@dataclass(frozen=True)
+class LedgerSpec:
+    """The sizes of a synthetic ledger.
+
+    Attributes:
+        users: the number of users.
+        accounts: the number of accounts of each user.
+        incomes: the number of recurrent income sources of each user.
+        categories: the number of categories, shared by the users.
+        subcategories: the number of recurrent subcategories, spread over the categories and selected by every user.
+        transactions: the number of transactions, spread over the users.
+        years: the number of years the transactions are spread over.
+        seed: the seed of the random values.
+        end: the last day of the ledger, a fixed day so the same arguments give the same ledger on any day.
+    """
+
+    users: int = 3
+    accounts: int = 4
+    incomes: int = 2
+    categories: int = 8
+    subcategories: int = 60
+    transactions: int = 300000
+    years: int = 5
+    seed: int = 42
+    end: date = date(2025, 1, 1)
+
+    def to_dict(self) -> dict:
+        return asdict(self) | {"end": self.end.isoformat()}
+
+
+def username(user_number: int) -> str:
+    return f"benchmark{user_number}"
+
+
+def account_name(user_number: int, account_number: int) -> str:
+    """Return the name of an account, the account names are unique across the users."""
+    return f"user{user_number}-account{account_number}"
+
+
+def create_references(model: Model, spec: LedgerSpec) -> None:
+    """Create the currencies, users, accounts, incomes, categories and user subcategories of the ledger."""
+    rng = random.Random(spec.seed)
+    first_day = spec.end - timedelta(days=365 * spec.years)
+    for name, symbol, code in CURRENCIES:
+        model.model_currency.create_currency(name=name, symbol=symbol, code=code, symbol_position="prefix")
+
+    for category_number in range(1, spec.categories + 1):
+        model.model_category.create_category(
+            name=f"category{category_number}", category_type=CATEGORY_TYPES[category_number % len(CATEGORY_TYPES)]
+        )
+    recurrences = (RecurrenceEnum.DAY, RecurrenceEnum.WEEK, RecurrenceEnum.MONTH, RecurrenceEnum.YEAR)
+    for subcategory_number in range(1, spec.subcategories + 1):
+        model.model_subcategory.create_subcategory(
+            category_id=(subcategory_number - 1) % spec.categories + 1,
+            name=f"subcategory{subcategory_number}",
+            recurrent=True,
+            recurrence=recurrences[subcategory_number % len(recurrences)],
+            recurrence_value=rng.randint(100, 20000),
+            currency_id=1,
+        )
+
+    # every user has the same password, hashed once
+    password = get_hashed_password(PASSWORD)
+    for user_number in range(1, spec.users + 1):
+        user = model.model_user.create_user(username=username(user_number), password=password, personal_key=b"-")
+        for account_number in range(1, spec.accounts + 1):
+            model.model_account.create_account(
+                user_id=user.id,
+                name=account_name(user_number, account_number),
+                account_type="DEBIT" if account_number > 1 or spec.accounts == 1 else "CARD",
+                # the last account of each user is in another currency, so the totals have currencies to convert
+                currency_id=2 if account_number == spec.accounts and spec.accounts > 1 else 1,
+                balance=0,
+            )
+        first_account_id = (user_number - 1) * spec.accounts + 1
+        for income_number in range(1, spec.incomes + 1):
+            model.model_income.create_income(
+                user_id=user.id,
+                account_id=first_account_id + (income_number - 1) % spec.accounts,
+                name=f"user{user_number}-income{income_number}",
+                income_date=first_day,
+                recurrent=True,
+                recurrence=RecurrenceEnum.MONTH,
+                recurrence_value=rng.randint(100000, 400000),
+                currency_id=1,
+            )
+        for subcategory_id in range(1, spec.subcategories + 1):
+            model.model_user_subcategory.create_user_subcategory(user_id=user.id, subcategory_id=subcategory_id)
+
+
+def transaction_rows(spec: LedgerSpec):
+    """Yield the transactions of the ledger, as create_transactions_bulk tuples, in a deterministic order."""
+    rng = random.Random(spec.seed + 1)
+    first_day = datetime.combine(spec.end, datetime.min.time()) - timedelta(days=365 * spec.years)
+    minutes = 365 * spec.years * 24 * 60
+    for number in range(spec.transactions):
+        user_number = number % spec.users + 1
+        first_account_id = (user_number - 1) * spec.accounts + 1
+        account_id = first_account_id + rng.randrange(spec.accounts)
+        # the accounts of the other currency only get transactions in that currency
+        currency_id = 2 if account_id - first_account_id == spec.accounts - 1 and spec.accounts > 1 else 1
+        day = first_day + timedelta(minutes=rng.randrange(minutes))
+        kind = rng.random()
+        if kind < INCOME_SHARE:
+            income_id = (user_number - 1) * spec.incomes + rng.randrange(spec.incomes) + 1 if spec.incomes else None
+            if income_id is not None:
+                yield (account_id, day, "Income", rng.randint(1000, 400000), currency_id, None, income_id, "salary")
+                continue
+        subcategory_id = rng.randint(1, spec.subcategories)
+        description = f"payment {rng.randrange(1000)}"
+        if kind < INCOME_SHARE + TRANSFER_SHARE and spec.accounts > 1:
+            target_account_id = first_account_id + (account_id - first_account_id + 1) % spec.accounts
+            yield (
+                account_id,
+                day,
+                "Transfer",
+                rng.randint(1000, 100000),
+                currency_id,
+                subcategory_id,
+                None,
+                description,
+                target_account_id,
+            )
+        else:
+            yield (account_id, day, "Expense", rng.randint(100, 50000), currency_id, subcategory_id, None, description)
+
+
+def create_ledger(model: Model, spec: LedgerSpec, chunk_size: int = 5000) -> dict:
+    """Create the ledger in an empty database, the transactions through the bulk path.
+
+    Args:
+        model: the application model, on an empty database.
+        spec: the sizes of the ledger.
+        chunk_size: the number of transactions sent to the database at a time.
+
+    Returns:
+        dict: the seconds it took to create the references and the transactions.
+    """
+    start = time.perf_counter()
+    create_references(model, spec)
+    references_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    transaction_ids = model.model_transaction.create_transactions_bulk(transaction_rows(spec), chunk_size=chunk_size)
+    if isinstance(transaction_ids, str):
+        raise RuntimeError(transaction_ids)
+    model.session.expunge_all()
+    return {"references_seconds": references_seconds, "transactions_seconds": time.perf_counter() - start}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="ledger", help="the database file name, without the .db extension")
+    parser.add_argument("--users", type=int, default=LedgerSpec.users)
+    parser.add_argument("--transactions", type=int, default=LedgerSpec.transactions)
+    parser.add_argument("--years", type=int, default=LedgerSpec.years)
+    parser.add_argument("--seed", type=int, default=LedgerSpec.seed)
+    args = parser.parse_args()
+
+    spec = LedgerSpec(users=args.users, transactions=args.transactions, years=args.years, seed=args.seed)
+    model = Model(category_data=None, currency_data=None, database_name=args.database)
+    timings = create_ledger(model, spec)
+    model.session.close()
+    model.engine.dispose()
+    print(f"{args.database}.db: {spec.transactions} transactions of {spec.users} users over {spec.years} years")
+    print(f"  references {timings['references_seconds']:.1f} s, transactions {timings['transactions_seconds']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure the time from the login button to a homepage ready for input, and the time to open each tab.
+
+Run from the project root with the package installed (``poetry install``):
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/login_time.py --transactions 50000
+
+The ledger has a user with accounts, income sources and recurrent user categories, so every tab has data to load.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from PySide6.QtWidgets import QApplication
+
+from ezbudget.model import Model, RecurrenceEnum
+from ezbudget.presenter import Presenter
+from ezbudget.utils import get_hashed_password
+from ezbudget.view import MainWindow
+
+PASSWORD = "BenchmarkPassword1"
+
+
+def populate(model: Model, number_of_transactions: int, number_of_subcategories: int = 60, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    first_day = datetime.now() - timedelta(days=3650)
+    model.model_currency.create_currency(name="Euro", symbol="€", code="EUR", symbol_position="prefix")
+    model.model_user.create_user(username="benchmark", password=get_hashed_password(PASSWORD), personal_key=b"-")
+    for account_number in range(1, 6):
+        model.model_account.create_account(
+            user_id=1, name=f"account{account_number}", account_type="DEBIT", currency_id=1, balance=0
+        )
+        model.model_income.create_income(
+            user_id=1,
+            account_id=account_number,
+            name=f"income{account_number}",
+            income_date=first_day.date(),
+            recurrent=True,
+            recurrence=RecurrenceEnum.MONTH,
+            recurrence_value=100000,
+            currency_id=1,
+        )
+    model.model_category.create_category(name="category", category_type="NEED")
+    for subcategory_number in range(1, number_of_subcategories + 1):
+        model.model_subcategory.create_subcategory(
+            category_id=1,
+            name=f"subcategory{subcategory_number}",
+            recurrent=True,
+            recurrence=RecurrenceEnum.MONTH,
+            recurrence_value=5000,
+            currency_id=1,
+        )
+        model.model_user_subcategory.create_user_subcategory(user_id=1, subcategory_id=subcategory_number)
+
+    rows = (
+        (
+            rng.randint(1, 5),
+            first_day + timedelta(minutes=rng.randint(0, 3650 * 24 * 60)),
+            "Expense",
+            rng.randint(100, 50000),
+            1,
+            rng.randint(1, number_of_subcategories),
+        )
+        for _ in range(number_of_transactions)
+    )
+    model.model_transaction.create_transactions_bulk(rows)
+    model.session.expunge_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--subcategories", type=int, default=60)
+    arguments = parser.parse_args()
+
+    application = QApplication([])
+    with tempfile.TemporaryDirectory() as directory:
+        model = Model(category_data=None, currency_data=None, database_name=f"{directory}/login_time")
+        populate(model, arguments.transactions, arguments.subcategories)
+        presenter = Presenter(model, settings_dir=directory)
+        view = MainWindow(presenter, directory)
+        presenter.view = view
+        view.show()
+
+        start = time.perf_counter()
+        presenter.login({"username": "benchmark", "password": PASSWORD})
+        application.processEvents()
+        login_time = time.perf_counter() - start
+        print(f"{arguments.transactions} transactions, {arguments.subcategories} user categories")
+        presenter.dispatcher.wait()
+        application.processEvents()
+        loaded_time = time.perf_counter() - start
+        print(f"  login to homepage: {login_time * 1000:.1f} ms")
+        print(f"  login to background reads delivered: {loaded_time * 1000:.1f} ms")
+
+        tabs = view.homepage_view.tbl_homepage
+        for index in range(1, tabs.count()):
+            start = time.perf_counter()
+            tabs.setCurrentIndex(index)
+            presenter.dispatcher.wait()
+            application.processEvents()
+            print(f"  open {tabs.tabText(index)}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        presenter.dispatcher.wait()
+        model.session.close()
+        model.engine.dispose()
+
+    # the interpreter teardown of PySide6 6.12 can crash after many model resets, the results are already printed
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Show the SQLite query plans of the hot transaction reads, with and without the transaction indexes.
+
+Run from the project root with the package installed (``poetry install``):
+
+    python benchmarks/query_plans.py --transactions 200000
+
+The statements are captured from the real model methods, so the plans are the ones the application gets.
+"""
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+
+from ezbudget.model import Model, Transaction, TransactionFilters
+
+TRANSACTION_INDEXES = (
+    "ix_accounts_user_id",
+    "ix_transactions_account_id_date",
+    "ix_transactions_subcategory_id_date",
+    "ix_transactions_income_id_date",
+    "ix_transactions_date",
+    "ix_transactions_value",
+)
+
+
+def populate(model: Model, number_of_transactions: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    model.model_currency.create_currency(name="Euro", symbol="€", code="EUR", symbol_position="prefix")
+    for user_number in range(1, 4):
+        model.model_user.create_user(username=f"user{user_number}", password="-", personal_key=b"-")
+        for account_number in range(4):
+            model.model_account.create_account(
+                user_id=user_number,
+                name=f"account{user_number}-{account_number}",
+                account_type="DEBIT",
+                currency_id=1,
+                balance=0,
+            )
+        model.model_income.create_income(
+            user_id=user_number,
+            account_id=user_number * 4,
+            name=f"salary{user_number}",
+            recurrence_value=0,
+            currency_id=1,
+        )
+    model.model_category.create_category(name="category", category_type="NEED")
+    for subcategory_number in range(1, 41):
+        model.model_subcategory.create_subcategory(category_id=1, name=f"subcategory{subcategory_number}")
+        model.model_user_subcategory.create_user_subcategory(user_id=1, subcategory_id=subcategory_number)
+
+    first_day = datetime(2014, 1, 1)
+    rows = []
+    for _ in range(number_of_transactions):
+        is_income = rng.random() < 0.1
+        rows.append(
+            {
+                "account_id": rng.randint(1, 12),
+                "transaction_type": "Income" if is_income else "Expense",
+                "value": rng.randint(100, 50000),
+                "currency_id": 1,
+                "date": first_day + timedelta(days=rng.randint(0, 3650)),
+                "subcategory_id": None if is_income else rng.randint(1, 40),
+                "income_id": rng.randint(1, 3) if is_income else None,
+            }
+        )
+    model.session.execute(insert(Transaction), rows)
+    model.session.commit()
+
+
+def capture_statements(model: Model, read) -> list:
+    """Run a model read and return the SQL statements, with their parameters, that it executed."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(model.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        read()
+    finally:
+        event.remove(model.engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def explain(model: Model, statements: list) -> list:
+    # a fresh connection, as the plan of a cached EXPLAIN statement is not refreshed when an index is dropped
+    connection = sqlite3.connect(model.engine.url.database)
+    try:
+        plan = []
+        for statement, parameters in statements:
+            rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plan.extend(row[-1] for row in rows)
+        return plan
+    finally:
+        connection.close()
+
+
+def time_read(read, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        read()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        model = Model(category_data=None, currency_data=None, database_name=f"{directory}/query_plans")
+        populate(model, arguments.transactions)
+
+        month_start, month_end = datetime(2019, 6, 1), datetime(2019, 7, 1)
+        reads = {
+            "read_transaction_list_by_account": lambda: model.model_transaction.read_transaction_list_by_account(
+                account_id=1
+            ),
+            "read_transaction_list_by_subcategory": lambda: (
+                model.model_transaction.read_transaction_list_by_subcategory(subcategory_id=1)
+            ),
+            "read_user_subcategories_with_month_totals (one month)": lambda: (
+                model.model_user_subcategory.read_user_subcategories_with_month_totals(user_id=1, month="2019-06")
+            ),
+            "query_transactions (first page)": lambda: model.model_transaction.query_transactions(user_id=1, limit=200),
+            "query_transactions (one subcategory)": lambda: model.model_transaction.query_transactions(
+                user_id=1, filters=TransactionFilters(subcategory_ids=(1,)), limit=200
+            ),
+            "query_transactions (one month, by value)": lambda: model.model_transaction.query_transactions(
+                user_id=1, filters=TransactionFilters(start=month_start, end=month_end), order="value_desc", limit=200
+            ),
+            "query_transactions (value range, page after a cursor)": lambda: (
+                model.model_transaction.query_transactions(
+                    user_id=1,
+                    filters=TransactionFilters(min_value=40000, max_value=45000),
+                    order="value_asc",
+                    after_cursor=(41000, 0),
+                    limit=200,
+                )
+            ),
+        }
+
+        results = {}
+        for label in ("with indexes", "without indexes"):
+            if label == "without indexes":
+                connection = model.session.connection()
+                for index_name in TRANSACTION_INDEXES:
+                    connection.exec_driver_sql(f"DROP INDEX {index_name}")
+                model.session.commit()
+            for name, read in reads.items():
+                model.session.expunge_all()
+                plan = explain(model, capture_statements(model, read))
+                results.setdefault(name, {})[label] = (plan, time_read(read, arguments.repeat))
+
+        print(f"{arguments.transactions} transactions\n")
+        for name, by_label in results.items():
+            print(name)
+            for label in ("without indexes", "with indexes"):
+                plan, elapsed = by_label[label]
+                print(f"  {label}: {elapsed:.2f} ms")
+                for step in plan:
+                    print(f"    {step}")
+            print()
+
+        model.session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Time the hot paths of the model and the presenter on a synthetic ledger, and save the results as JSON.
+
+Run from the project root with the package installed (``poetry install``):
+
+    python benchmarks/run_benchmarks.py --transactions 1000000 --output results.json
+    python benchmarks/run_benchmarks.py --transactions 1000000 --compare results.json
+
+The ledger is generated by ledger.py with the given sizes, so two runs with the same arguments time the same data.
+Each benchmark is run once to warm up and then timed --repeat times, without the Qt widgets. With --compare, the
+median of each benchmark is compared with the one of a previous results file, and the run fails if any of them is
+slower by more than --threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from ledger import PASSWORD, LedgerSpec, account_name, create_ledger, username
+
+from ezbudget.model import Model
+from ezbudget.presenter import Presenter
+from ezbudget.view.models import TransactionItem
+
+DATABASE_NAME = "benchmarks"
+
+
+class HeadlessView:
+    """The view methods the presenter calls on login, without the widgets."""
+
+    def __init__(self) -> None:
+        self.login_view = self
+
+    def set_error(self, message: str) -> None:
+        raise RuntimeError(message)
+
+    def show_homepage(self, user) -> None:
+        pass
+
+
+def measure(function, repeat: int, setup=None) -> dict:
+    """Return the statistics in milliseconds of repeat timed calls of function, after an untimed one.
+
+    Args:
+        function: the function to time, called without arguments.
+        repeat: the number of timed calls.
+        setup: called without arguments before each call, out of the timing.
+
+    Returns:
+        dict: the number of calls and the min, median, mean and max time of a call.
+    """
+    timings = []
+    for run in range(repeat + 1):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        if run > 0:
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "max_ms": max(timings),
+    }
+
+
+def transaction_data(user_number: int, value: int, day: date) -> dict:
+    """Return the data of an expense on a day as the transactions tab sends it to the presenter."""
+    return {
+        "account_name": account_name(user_number, 2),
+        "target_account_name": "",
+        "category_name": "category1 - subcategory1",
+        "date": day.strftime("%Y/%m/%d"),
+        "currency_id": 1,
+        "transaction_type": "Expense",
+        "value": value,
+        "description": "benchmark",
+    }
+
+
+def run_benchmarks(spec: LedgerSpec, repeat: int, only: set = None) -> dict:
+    """Create the ledger in a temporary directory and time each hot path on it.
+
+    Returns:
+        dict: the ledger creation times, and the statistics of each benchmark by name.
+    """
+    results = {}
+
+    def benchmark(name: str, function, setup=None) -> None:
+        if only and name not in only:
+            return
+        results[name] = measure(function, repeat, setup=setup)
+        print(f"  {name:28} median {results[name]['median_ms']:10.2f} ms  min {results[name]['min_ms']:10.2f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        model = Model(category_data=None, currency_data=None, database_name=DATABASE_NAME)
+        ledger_seconds = create_ledger(model, spec)
+        model.session.close()
+        model.engine.dispose()
+        print(f"ledger of {spec.transactions} transactions in {sum(ledger_seconds.values()):.1f} s")
+
+        def startup() -> None:
+            opened = Model(category_data=None, currency_data=None, database_name=DATABASE_NAME)
+            Presenter(opened)
+            opened.session.close()
+            opened.engine.dispose()
+
+        benchmark("startup", startup)
+
+        model = Model(category_data=None, currency_data=None, database_name=DATABASE_NAME)
+        presenter = Presenter(model)
+        presenter.view = HeadlessView()
+        # the first login materializes the recurrent transactions due today, out of the timing, so the timed logins
+        # only read the last run and leave the ledger as it is
+        presenter.login({"username": username(1), "password": PASSWORD})
+        benchmark("login", lambda: presenter.login({"username": username(1), "password": PASSWORD}))
+
+        # the reads start from an empty identity map, like the first read of a tab
+        benchmark("get_total_real", presenter.get_total_real, setup=model.session.expunge_all)
+        benchmark("get_month_totals", presenter.get_month_totals, setup=model.session.expunge_all)
+        benchmark("get_month_summary", presenter.get_month_summary, setup=model.session.expunge_all)
+        benchmark("get_transactions_list", presenter.get_transactions_list, setup=model.session.expunge_all)
+        benchmark("get_transactions_page", presenter.get_transactions_page, setup=model.session.expunge_all)
+
+        values = iter(range(100, 10**9))
+        benchmark(
+            "create_transaction", lambda: presenter.create_transaction(transaction_data(1, next(values), spec.end))
+        )
+
+        transaction = presenter.create_transaction(transaction_data(1, 100, spec.end))
+        item = TransactionItem(
+            model.model_transaction.read_transaction_by_id(transaction.id),
+            presenter.get_currency_record(transaction.currency_id),
+        )
+        benchmark(
+            "update_transaction",
+            lambda: presenter.update_transaction(item, transaction_data(1, next(values), spec.end)),
+        )
+
+        presenter.dispatcher.wait()
+        model.session.close()
+        model.engine.dispose()
+        # leave the directory before it is removed
+        os.chdir(os.path.dirname(directory))
+
+    return {"ledger_seconds": ledger_seconds, "benchmarks": results}
+
+
+def git_commit() -> str | None:
+    """Return the commit of the working tree the benchmarks run on, None outside of a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print the change of each benchmark median from a baseline results file.
+
+    Returns:
+        list: the names of the benchmarks slower than the baseline by more than the threshold, a fraction.
+    """
+    regressions = []
+    print(f"compared with {baseline.get('commit') or 'the baseline'}:")
+    for name, statistics_ in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            print(f"  {name:28} new")
+            continue
+        ratio = statistics_["median_ms"] / previous["median_ms"] if previous["median_ms"] else float("inf")
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:28} {ratio:6.2f}x{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=LedgerSpec.users)
+    parser.add_argument("--accounts", type=int, default=LedgerSpec.accounts)
+    parser.add_argument("--subcategories", type=int, default=LedgerSpec.subcategories)
+    parser.add_argument("--transactions", type=int, default=LedgerSpec.transactions)
+    parser.add_argument("--years", type=int, default=LedgerSpec.years)
+    parser.add_argument("--seed", type=int, default=LedgerSpec.seed)
+    parser.add_argument("--end", type=date.fromisoformat, default=LedgerSpec.end, help="the last day of the ledger")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="the names of the benchmarks to run, all of them if not given")
+    parser.add_argument("--output", help="the JSON file the results are written to")
+    parser.add_argument("--compare", help="a JSON results file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="the slowdown that fails --compare")
+    args = parser.parse_args()
+
+    spec = LedgerSpec(
+        users=args.users,
+        accounts=args.accounts,
+        subcategories=args.subcategories,
+        transactions=args.transactions,
+        years=args.years,
+        seed=args.seed,
+        end=args.end,
+    )
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = {
+        "commit": git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "ledger": spec.to_dict(),
+        **run_benchmarks(spec, args.repeat, only=set(args.only or ())),
+    }
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"results written to {output}")
+    if baseline is not None:
+        if baseline.get("ledger") != results["ledger"]:
+            print("the baseline was run on another ledger, the times may not be comparable")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
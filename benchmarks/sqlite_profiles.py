@@ -0,0 +1,59 @@
+"""Measure the write throughput of each SQLite profile preset.
+
+Run from the project root with the package installed (``poetry install``):
+
+    python benchmarks/sqlite_profiles.py --transactions 2000
+
+Each transaction is written with ModelTransaction.create_transaction, one commit per row, which is what the
+application does for every form submit.
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from ezbudget.model import PROFILES, Model
+
+
+def setup_ledger(model: Model) -> None:
+    model.model_currency.create_currency(name="Euro", symbol="€", code="EUR", symbol_position="prefix")
+    model.model_user.create_user(username="benchmark", password="-", personal_key=b"-")
+    model.model_account.create_account(user_id=1, name="account", account_type="DEBIT", currency_id=1, balance=0)
+    model.model_category.create_category(name="category", category_type="NEED")
+    model.model_subcategory.create_subcategory(category_id=1, name="subcategory")
+
+
+def write_transactions(model: Model, number_of_transactions: int) -> float:
+    first_day = datetime(2024, 1, 1)
+    start = time.perf_counter()
+    for number in range(number_of_transactions):
+        model.model_transaction.create_transaction(
+            account_id=1,
+            subcategory_id=1,
+            date=first_day + timedelta(days=number % 365),
+            transaction_type="Expense",
+            value=number,
+            currency_id=1,
+        )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=2000)
+    arguments = parser.parse_args()
+
+    print(f"{arguments.transactions} single-row commits\n")
+    for name in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            model = Model(category_data=None, currency_data=None, database_name=f"{directory}/profile", profile=name)
+            setup_ledger(model)
+            elapsed = write_transactions(model, arguments.transactions)
+            model.session.close()
+            model.engine.dispose()
+        print(f"{name:>10}: {arguments.transactions / elapsed:8.0f} rows/s  ({elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measure TableModel.data() calls per second, the work done by the transactions table on every repaint and scroll.
+
+Run from the project root with the package installed (``poetry install``):
+
+    python benchmarks/table_model_data.py --rows 100000
+
+The transactions are transient model objects with their relationships set, so no database is needed.
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from PySide6.QtCore import QCoreApplication, Qt
+
+from ezbudget.model import (
+    Account,
+    Category,
+    CurrencyRecord,
+    SubCategory,
+    Transaction,
+    TransactionTypeEnum,
+)
+from ezbudget.view.models import TableModel, TransactionItem
+
+
+def build_items(number_of_rows: int) -> list:
+    currency = CurrencyRecord(id=1, name="Euro", symbol="€", code="EUR", symbol_position="prefix")
+    account = Account(id=1, name="account")
+    subcategory = SubCategory(id=1, name="subcategory", category=Category(id=1, name="category"))
+    first_day = datetime(2014, 1, 1)
+    return [
+        TransactionItem(
+            Transaction(
+                id=number,
+                account_id=1,
+                account=account,
+                subcategory=subcategory,
+                transaction_type=TransactionTypeEnum.Expense,
+                currency_id=1,
+                value=number,
+                date=first_day + timedelta(hours=number),
+                description=f"transaction {number}",
+            ),
+            currency,
+        )
+        for number in range(number_of_rows)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    arguments = parser.parse_args()
+
+    _ = QCoreApplication([])
+    start = time.perf_counter()
+    table_model = TableModel(build_items(arguments.rows))
+    build_time = time.perf_counter() - start
+
+    indexes = [
+        table_model.index(row, column)
+        for row in range(table_model.rowCount())
+        for column in range(table_model.columnCount())
+    ]
+    display_role = Qt.ItemDataRole.DisplayRole
+    start = time.perf_counter()
+    for index in indexes:
+        table_model.data(index, display_role)
+    elapsed = time.perf_counter() - start
+
+    print(f"{arguments.rows} rows, items built in {build_time:.2f} s")
+    print(f"{len(indexes)} data() calls in {elapsed:.2f} s: {len(indexes) / elapsed:,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
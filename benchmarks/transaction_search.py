@@ -0,0 +1,77 @@
+"""Measure the time to search the transaction descriptions with the full-text index.
+
+Run from the project root with the package installed (``poetry install``):
+
+    python benchmarks/transaction_search.py --transactions 1000000
+
+The descriptions are made of random words from a small vocabulary, so the common words match a large part of the
+transactions. Each query is timed as typed in the search box, one prefix at a time.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from login_time import populate
+
+from ezbudget.model import Model
+
+WORDS = (
+    "groceries supermarket coffee restaurant fuel station pharmacy rent electricity water internet phone insurance "
+    "cinema books clothes shoes gift train bus taxi parking gym doctor dentist bakery butcher market hardware garden "
+    "school tuition daycare holiday hotel flight museum concert streaming subscription bank transfer salary refund"
+).split()
+QUERIES = ("gro", "groceries", "coffee sta", "dentist", "holiday hotel flight", "xyz")
+
+
+def add_described_transactions(model: Model, number_of_transactions: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    first_day = datetime.now() - timedelta(days=3650)
+    rows = (
+        (
+            rng.randint(1, 5),
+            first_day + timedelta(minutes=rng.randint(0, 3650 * 24 * 60)),
+            "Expense",
+            rng.randint(100, 50000),
+            1,
+            rng.randint(1, 60),
+            None,
+            " ".join(rng.sample(WORDS, rng.randint(1, 4))),
+        )
+        for _ in range(number_of_transactions)
+    )
+    model.model_transaction.create_transactions_bulk(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        model = Model(category_data=None, currency_data=None, database_name="transaction_search")
+        populate(model, 0)
+        start = time.perf_counter()
+        add_described_transactions(model, args.transactions)
+        print(f"inserted {args.transactions} transactions in {time.perf_counter() - start:.1f} s")
+
+        for query in QUERIES:
+            for length in range(1, len(query) + 1):
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    matches = model.model_transaction.search(1, query[:length], limit=args.limit)
+                    timings.append(time.perf_counter() - start)
+                if length == len(query) or length == 3:
+                    print(f"{query[:length]!r:24} {len(matches):3} matches, best {min(timings) * 1000:.1f} ms")
+        model.close_session()
+
+
+if __name__ == "__main__":
+    main()
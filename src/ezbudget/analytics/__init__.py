@@ -0,0 +1,14 @@
+from .currency import ExchangeRateCache, ExchangeRates
+from .forecast import CashFlowForecast, ForecastCache, build_cash_flow_forecast
+from .recurrence import (
+    DEFAULT_ANCHOR,
+    RECURRENCE_CODES,
+    Recurrences,
+    month_calendar,
+    monthly_amounts,
+    occurrence_dates,
+    occurrences_before,
+    recurrence_codes,
+    yearly_amounts,
+)
+from .reporting import BudgetReport, build_budget_report, month_span
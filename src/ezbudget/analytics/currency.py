@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import date
+from threading import Lock
+
+import numpy as np
+
+
+class ExchangeRates:
+    """The exchange rates of every currency pair in memory, looked up as of a day on their sorted dates.
+
+    The rate of a pair on a day is its last rate on or before that day, there's no rate before the first one. A pair
+    without rates is converted with the inverse of the opposite pair, or through a currency with rates to both.
+    """
+
+    def __init__(self, rows) -> None:
+        """Index the (base currency id, quote currency id, rate date, rate) rows of read_exchange_rates by pair."""
+        pairs = {}
+        for base_currency_id, quote_currency_id, rate_date, rate in sorted(rows, key=lambda row: row[:3]):
+            dates, rates = pairs.setdefault((base_currency_id, quote_currency_id), ([], []))
+            dates.append(rate_date.date() if hasattr(rate_date, "date") else rate_date)
+            rates.append(rate)
+
+        self.dates = {pair: dates for pair, (dates, _) in pairs.items()}
+        self.days = {pair: np.array(dates, dtype="datetime64[D]") for pair, (dates, _) in pairs.items()}
+        self.rates = {pair: np.array(rates, dtype=np.float64) for pair, (_, rates) in pairs.items()}
+        # the currencies each currency has rates with, in either direction, the pivots of the triangulation
+        self.neighbours = {}
+        for base_currency_id, quote_currency_id in sorted(pairs):
+            self.neighbours.setdefault(base_currency_id, []).append(quote_currency_id)
+            self.neighbours.setdefault(quote_currency_id, []).append(base_currency_id)
+
+    @classmethod
+    def from_model(cls, model) -> ExchangeRates:
+        """Create the exchange rates of all the pairs, in a single query."""
+        return cls(model.model_exchange_rate.read_exchange_rates())
+
+    def __len__(self) -> int:
+        return sum(len(dates) for dates in self.dates.values())
+
+    def _pair_rate(self, base_currency_id: int, quote_currency_id: int, day: date) -> float:
+        if base_currency_id == quote_currency_id:
+            return 1.0
+        if (base_currency_id, quote_currency_id) in self.dates:
+            index = bisect_right(self.dates[(base_currency_id, quote_currency_id)], day) - 1
+            return float(self.rates[(base_currency_id, quote_currency_id)][index]) if index >= 0 else np.nan
+        if (quote_currency_id, base_currency_id) in self.dates:
+            return 1 / self._pair_rate(quote_currency_id, base_currency_id, day)
+        return np.nan
+
+    def rate(self, from_currency_id: int, to_currency_id: int, day: date) -> float:
+        """Return the value of one unit of a currency in another on a day.
+
+        Args:
+            from_currency_id: the currency id to convert from.
+            to_currency_id: the currency id to convert to.
+            day: the date of the rate.
+
+        Returns:
+            float: the rate, NaN if there's no rate between the currencies on that day.
+        """
+        rate = self._pair_rate(from_currency_id, to_currency_id, day)
+        for pivot in self.neighbours.get(from_currency_id, ()):
+            if not np.isnan(rate):
+                break
+            rate = self._pair_rate(from_currency_id, pivot, day) * self._pair_rate(pivot, to_currency_id, day)
+        return rate
+
+    def _pair_rates(self, base_currency_id: int, quote_currency_id: int, days: np.ndarray) -> np.ndarray:
+        if base_currency_id == quote_currency_id:
+            return np.ones(days.shape)
+        if (base_currency_id, quote_currency_id) in self.days:
+            rates = self.rates[(base_currency_id, quote_currency_id)]
+            indexes = np.searchsorted(self.days[(base_currency_id, quote_currency_id)], days, side="right") - 1
+            return np.where(indexes >= 0, rates[np.maximum(indexes, 0)], np.nan)
+        if (quote_currency_id, base_currency_id) in self.days:
+            return 1 / self._pair_rates(quote_currency_id, base_currency_id, days)
+        return np.full(days.shape, np.nan)
+
+    def rates_to(self, currency_ids, to_currency_id: int, days) -> np.ndarray:
+        """Return the rate of many currencies to another on many days, the vectorized rate.
+
+        The rates of each currency are looked up with np.searchsorted, the bisect of all its days at once.
+
+        Args:
+            currency_ids: the currency ids to convert from.
+            to_currency_id: the currency id to convert to.
+            days: the dates of the rates, a date or a datetime64[D] array broadcast with currency_ids.
+
+        Returns:
+            np.ndarray: a float array with the rates, NaN where there's no rate.
+        """
+        currency_ids, days = np.broadcast_arrays(
+            np.asarray(currency_ids, dtype=np.int64), np.asarray(days, dtype="datetime64[D]")
+        )
+        result = np.full(currency_ids.shape, np.nan)
+        for currency_id in np.unique(currency_ids).tolist():
+            rows = currency_ids == currency_id
+            rates = self._pair_rates(currency_id, to_currency_id, days[rows])
+            for pivot in self.neighbours.get(currency_id, ()):
+                missing = np.isnan(rates)
+                if not missing.any():
+                    break
+                rates[missing] = self._pair_rates(currency_id, pivot, days[rows][missing]) * self._pair_rates(
+                    pivot, to_currency_id, days[rows][missing]
+                )
+            result[rows] = rates
+        return result
+
+    def convert(self, values, currency_ids, to_currency_id: int, days) -> np.ndarray:
+        """Return the values converted from their currencies to another, with the rates of their days.
+
+        Args:
+            values: the values to convert.
+            currency_ids: the currency id of each value.
+            to_currency_id: the currency id to convert to.
+            days: the date of each value rate, or a date for all of them.
+
+        Returns:
+            np.ndarray: a float array with the converted values, NaN where there's no rate.
+        """
+        return np.asarray(values, dtype=np.float64) * self.rates_to(currency_ids, to_currency_id, days)
+
+
+class ExchangeRateCache:
+    """Keep the exchange rates in memory until the exchange rates table is written.
+
+    The cache compares the Model.revision of the table, like the ForecastCache, so the rates are read again after any
+    write from any session.
+    """
+
+    TABLES = ("exchange_rates",)
+
+    def __init__(self, model) -> None:
+        self.model = model
+        self._cached = None
+        self._lock = Lock()
+
+    def get(self) -> ExchangeRates:
+        """Return the exchange rates, from the cache when the table wasn't written since."""
+        # read before building, a write while the rates are read leaves them outdated for the next call
+        revision = self.model.revision(*self.TABLES)
+        with self._lock:
+            if self._cached is not None and self._cached[0] == revision:
+                return self._cached[1]
+
+        exchange_rates = ExchangeRates.from_model(self.model)
+        with self._lock:
+            self._cached = (revision, exchange_rates)
+        return exchange_rates
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cached = None
@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from threading import Lock
+
+import numpy as np
+
+from ezbudget.analytics.recurrence import DEFAULT_ANCHOR, Recurrences
+
+
+@dataclass(frozen=True)
+class CashFlowForecast:
+    """Projected balance of each user account at the end of each day, from the recurrent incomes and expenses.
+
+    Attributes:
+        account_ids: the account id of each row.
+        account_names: the account name of each row.
+        days: the datetime64[D] days of the columns.
+        balances: a (accounts, days) float array with the balance in cents at the end of each day.
+    """
+
+    account_ids: np.ndarray
+    account_names: list
+    days: np.ndarray
+    balances: np.ndarray
+
+    def total(self) -> np.ndarray:
+        """Return the balance of all the accounts together at the end of each day."""
+        return self.balances.sum(axis=0)
+
+    def month_ends(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the balances at the end of each month, or of the last day for the last month.
+
+        Returns:
+            tuple: the datetime64[M] months, and a (accounts, months) array with the balances.
+        """
+        months = self.days.astype("datetime64[M]")
+        last_days = np.flatnonzero(np.r_[months[1:] != months[:-1], len(months) > 0])
+        return months[last_days], self.balances[:, last_days]
+
+    def alerts(self, threshold: int = 0) -> list:
+        """Return the accounts whose balance goes below a threshold.
+
+        Args:
+            threshold: the balance in cents.
+
+        Returns:
+            list: an (account id, first day below the threshold, lowest balance) tuple for each account below it.
+        """
+        below = self.balances < threshold
+        rows = np.flatnonzero(below.any(axis=1))
+        first_days = below[rows].argmax(axis=1)
+        return [
+            (int(self.account_ids[row]), self.days[first_day].item(), float(self.balances[row].min()))
+            for row, first_day in zip(rows, first_days)
+        ]
+
+
+def forecast_days(start: date, months: int) -> np.ndarray:
+    """Return the datetime64[D] days from start up to the same day months later, not included."""
+    first_day = np.datetime64(start, "D")
+    end_month = first_day.astype("datetime64[M]") + months
+    day_of_month = (first_day - first_day.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64)
+    month_length = ((end_month + 1).astype("datetime64[D]") - end_month.astype("datetime64[D]")).astype(np.int64)
+    return np.arange(first_day, end_month.astype("datetime64[D]") + min(day_of_month, month_length - 1))
+
+
+def account_rows(account_ids: np.ndarray, ids) -> tuple[np.ndarray, np.ndarray]:
+    """Return the row of each account id in the sorted account_ids of a forecast.
+
+    Args:
+        account_ids: the sorted account ids of the forecast rows.
+        ids: the account ids to look up.
+
+    Returns:
+        tuple: the row of each id, and a mask of the ids found in account_ids. The row of an id that wasn't found is
+            not meaningful, searchsorted gives it the row of a neighbouring account.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    if len(account_ids) == 0:
+        return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+    rows = np.minimum(np.searchsorted(account_ids, ids), len(account_ids) - 1)
+    return rows, account_ids[rows] == ids
+
+
+def build_cash_flow_forecast(model, user_id: int, months: int = 12, start: date = None) -> CashFlowForecast:
+    """Project the user account balances from the recurrent incomes and user subcategories.
+
+    Each income goes to its account from its income_date, the incomes of an account that isn't one of the user
+    accounts are left out. The expenses of a subcategory come from the account most of its transactions were made
+    from, or the first user account. The recurrences without a date are anchored on DEFAULT_ANCHOR, like the ones of
+    the RecurringMaterializer, and the balances already have the transactions it created, so the occurrences are only
+    counted from the day after its last run. They are counted as arrays for all the recurrences and days at once.
+
+    Args:
+        model: the application model.
+        user_id: the user id.
+        months: the number of months to forecast.
+        start: the first day of the forecast, today by default.
+
+    Returns:
+        CashFlowForecast: the forecast, with a row per user account ordered by id.
+    """
+    start = start or date.today()
+    days = forecast_days(start, months)
+    accounts = sorted(model.model_account.read_accounts_by_user(user_id=user_id), key=lambda account: account.id)
+    account_ids = np.fromiter((account.id for account in accounts), dtype=np.int64, count=len(accounts))
+    opening = np.fromiter((account.balance or 0 for account in accounts), dtype=np.float64, count=len(accounts))
+    flows = np.zeros((len(accounts), len(days)))
+
+    last_run = model.model_recurring_occurrence.read_last_run(user_id=user_id)
+    first_day = start if last_run is None else max(start, last_run.date() + timedelta(days=1))
+    # the flows of the days up to the last run are already in the opening balances
+    due_flows = flows[:, np.searchsorted(days, np.datetime64(first_day, "D")) :]
+
+    if len(accounts) and due_flows.shape[1]:
+        last_day = days[-1]
+
+        incomes = model.model_income.read_incomes_by_user(user_id=user_id)
+        income_rows, known = account_rows(account_ids, [income.account_id for income in incomes])
+        _, amounts = Recurrences.from_objects(
+            incomes, anchor_attribute="income_date", default_anchor=DEFAULT_ANCHOR
+        ).daily_amounts(first_day, last_day)
+        np.add.at(due_flows, income_rows[known], amounts[known])
+
+        subcategories = model.model_user_subcategory.read_user_subcategory_recurrences(user_id=user_id)
+        subcategory_accounts = model.model_monthly_rollup.read_subcategory_accounts(user_id=user_id)
+        expense_rows, known = account_rows(
+            account_ids, [subcategory_accounts.get(row[0], account_ids[0]) for row in subcategories]
+        )
+        _, amounts = Recurrences.from_records(
+            ((recurrent, recurrence, value, None) for *_, recurrent, recurrence, value in subcategories),
+            default_anchor=DEFAULT_ANCHOR,
+        ).daily_amounts(first_day, last_day)
+        np.subtract.at(due_flows, expense_rows[known], amounts[known])
+
+    return CashFlowForecast(
+        account_ids=account_ids,
+        account_names=[account.name for account in accounts],
+        days=days,
+        balances=opening[:, None] + np.cumsum(flows, axis=1),
+    )
+
+
+class ForecastCache:
+    """Keep the cash flow forecasts until the tables they are built from are written.
+
+    The cache compares the Model.revision of the tables, so the forecasts are rebuilt after any write to the accounts,
+    the transactions that move their balances, the incomes, the subcategories or the runs of the materializer, from
+    any session.
+    """
+
+    TABLES = ("accounts", "incomes", "subcategories", "usersubcategories", "transactions", "recurring_runs")
+
+    def __init__(self, model, max_size: int = 16) -> None:
+        self.model = model
+        self.max_size = max_size
+        self._forecasts = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, user_id: int, months: int = 12, start: date = None) -> CashFlowForecast:
+        """Return the forecast of build_cash_flow_forecast, from the cache when the tables weren't written since."""
+        key = (user_id, months, start or date.today())
+        # read before building, a write while the forecast is built leaves it outdated for the next call
+        revision = self.model.revision(*self.TABLES)
+        with self._lock:
+            cached = self._forecasts.get(key)
+            if cached is not None and cached[0] == revision:
+                self._forecasts.move_to_end(key)
+                return cached[1]
+
+        forecast = build_cash_flow_forecast(self.model, user_id, months=months, start=key[2])
+        with self._lock:
+            self._forecasts[key] = (revision, forecast)
+            self._forecasts.move_to_end(key)
+            while len(self._forecasts) > self.max_size:
+                self._forecasts.popitem(last=False)
+        return forecast
+
+    def clear(self) -> None:
+        with self._lock:
+            self._forecasts.clear()
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from ezbudget.model import RecurrenceEnum
+
+# the recurrence kinds as integer codes, so a list of recurrences becomes an array
+NONE, ONE, DAY, WEEK, MONTH, YEAR = range(6)
+RECURRENCE_CODES = {
+    None: NONE,
+    RecurrenceEnum.ONE: ONE,
+    RecurrenceEnum.DAY: DAY,
+    RecurrenceEnum.WEEK: WEEK,
+    RecurrenceEnum.MONTH: MONTH,
+    RecurrenceEnum.YEAR: YEAR,
+}
+
+# the anchor of the subcategories and incomes without a date, a Monday that is the first day of a month and a year, so
+# weekly expenses fall on Mondays, monthly ones on the 1st and yearly ones on January 1st. The materializer and the
+# forecast share it, so the forecast projects the occurrences on the days they are created.
+DEFAULT_ANCHOR = date(2001, 1, 1)
+
+# 1970-01-01, day 0 of datetime64[D], was a Thursday, the weekday 3 when Monday is 0 like in the calendar module
+EPOCH_WEEKDAY = 3
+
+
+def recurrence_codes(recurrences) -> np.ndarray:
+    """Return the RECURRENCE_CODES of a sequence of RecurrenceEnum, or None for no recurrence."""
+    return np.fromiter((RECURRENCE_CODES[recurrence] for recurrence in recurrences), dtype=np.int8)
+
+
+def month_lengths(months: np.ndarray) -> np.ndarray:
+    """Return the number of days of each datetime64[M] month."""
+    return ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+
+
+def month_calendar(months: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the number of days and of calendar weeks of each month.
+
+    The weeks are the rows of calendar.monthcalendar, the weeks from Monday to Sunday that have a day of the month.
+
+    Args:
+        months: a datetime64[M] array.
+
+    Returns:
+        tuple: the days and the weeks of each month, as integer arrays.
+    """
+    days = month_lengths(months)
+    first_weekdays = (months.astype("datetime64[D]").astype(np.int64) + EPOCH_WEEKDAY) % 7
+    weeks = (first_weekdays + days + 6) // 7
+    return days, weeks
+
+
+def monthly_amounts(codes: np.ndarray, values: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Return the amount each recurrence is budgeted in each month.
+
+    A daily recurrence counts every day of the month, a weekly one every calendar week, a monthly one once and a
+    yearly one a twelfth. One time recurrences aren't budgeted.
+
+    Args:
+        codes: the RECURRENCE_CODES of the recurrences.
+        values: the value in cents of each recurrence.
+        months: a datetime64[M] array with the months.
+
+    Returns:
+        np.ndarray: a (recurrences, months) float array with the amounts in cents.
+    """
+    days, weeks = month_calendar(months)
+    counts = np.zeros((len(RECURRENCE_CODES), len(months)))
+    counts[DAY] = days
+    counts[WEEK] = weeks
+    counts[MONTH] = 1
+    counts[YEAR] = 1 / 12
+    return np.asarray(values, dtype=np.float64)[:, None] * counts[codes]
+
+
+def yearly_amounts(codes: np.ndarray, values: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Return the amount each recurrence is budgeted in each year.
+
+    A daily recurrence counts every day of the year, a weekly one 52 weeks, a monthly one 12 months and a yearly one
+    once. One time recurrences aren't budgeted.
+
+    Args:
+        codes: the RECURRENCE_CODES of the recurrences.
+        values: the value in cents of each recurrence.
+        years: an integer array with the years.
+
+    Returns:
+        np.ndarray: a (recurrences, years) float array with the amounts in cents.
+    """
+    years = np.asarray(years)
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    counts = np.zeros((len(RECURRENCE_CODES), len(years)))
+    counts[DAY] = np.where(leap, 366, 365)
+    counts[WEEK] = 52
+    counts[MONTH] = 12
+    counts[YEAR] = 1
+    return np.asarray(values, dtype=np.float64)[:, None] * counts[codes]
+
+
+def occurrences_before(codes: np.ndarray, anchors: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Return how many times each recurrence occurred before each day.
+
+    A recurrence first occurs on its anchor date. A daily one then occurs every day, a weekly one every 7 days, a
+    monthly one on the anchor day of every month and a yearly one on the anchor day and month of every year, on the
+    last day of the month when the month is shorter. A one time recurrence only occurs on the anchor date.
+
+    Args:
+        codes: the RECURRENCE_CODES of the recurrences.
+        anchors: the datetime64[D] anchor date of each recurrence.
+        days: a datetime64[D] array with the days.
+
+    Returns:
+        np.ndarray: a (recurrences, days) integer array with the number of occurrences before each day, not included.
+    """
+    counts = np.zeros((len(codes), len(days)), dtype=np.int64)
+    days = np.asarray(days, dtype="datetime64[D]")[None, :]
+    for code in (ONE, DAY, WEEK, MONTH, YEAR):
+        rows = np.flatnonzero(codes == code)
+        if len(rows) == 0:
+            continue
+        anchor = np.asarray(anchors, dtype="datetime64[D]")[rows, None]
+        elapsed = (days - anchor).astype(np.int64)
+        if code == ONE:
+            counts[rows] = elapsed > 0
+        elif code == DAY:
+            counts[rows] = elapsed
+        elif code == WEEK:
+            counts[rows] = (elapsed + 6) // 7
+        elif code == MONTH:
+            anchor_month = anchor.astype("datetime64[M]")
+            day_of_month = (anchor - anchor_month.astype("datetime64[D]")).astype(np.int64)
+            month = days.astype("datetime64[M]")
+            occurrence = month.astype("datetime64[D]") + np.minimum(day_of_month, month_lengths(month) - 1)
+            counts[rows] = (month - anchor_month).astype(np.int64) + (occurrence < days)
+        else:
+            anchor_month = anchor.astype("datetime64[M]")
+            day_of_month = (anchor - anchor_month.astype("datetime64[D]")).astype(np.int64)
+            month_of_year = (anchor_month - anchor.astype("datetime64[Y]").astype("datetime64[M]")).astype(np.int64)
+            year = days.astype("datetime64[Y]")
+            month = year.astype("datetime64[M]") + month_of_year
+            occurrence = month.astype("datetime64[D]") + np.minimum(day_of_month, month_lengths(month) - 1)
+            counts[rows] = (year - anchor.astype("datetime64[Y]")).astype(np.int64) + (occurrence < days)
+    return np.maximum(counts, 0)
+
+
+def occurrence_dates(codes: np.ndarray, anchors: np.ndarray, indexes: np.ndarray) -> np.ndarray:
+    """Return the date of an occurrence of each recurrence, with the rules of occurrences_before.
+
+    Args:
+        codes: the RECURRENCE_CODES of the recurrences.
+        anchors: the datetime64[D] anchor date of each recurrence.
+        indexes: the number of the occurrence of each recurrence, 0 for the anchor date.
+
+    Returns:
+        np.ndarray: the datetime64[D] date of each occurrence.
+    """
+    anchors = np.asarray(anchors, dtype="datetime64[D]")
+    indexes = np.asarray(indexes, dtype=np.int64)
+    dates = anchors.copy()
+    anchor_months = anchors.astype("datetime64[M]")
+    days_of_month = (anchors - anchor_months.astype("datetime64[D]")).astype(np.int64)
+
+    rows = codes == DAY
+    dates[rows] = anchors[rows] + indexes[rows]
+    rows = codes == WEEK
+    dates[rows] = anchors[rows] + 7 * indexes[rows]
+    rows = (codes == MONTH) | (codes == YEAR)
+    months = anchor_months[rows] + np.where(codes[rows] == YEAR, 12, 1) * indexes[rows]
+    dates[rows] = months.astype("datetime64[D]") + np.minimum(days_of_month[rows], month_lengths(months) - 1)
+    return dates
+
+
+@dataclass(frozen=True)
+class Recurrences:
+    """A set of recurrences as arrays, so their amounts are computed for every recurrence and period at once.
+
+    Attributes:
+        codes: the RECURRENCE_CODES of each recurrence, NONE for the ones that aren't recurrent.
+        values: the value in cents of each recurrence.
+        anchors: the datetime64[D] date each recurrence first occurs.
+    """
+
+    codes: np.ndarray
+    values: np.ndarray
+    anchors: np.ndarray
+
+    @classmethod
+    def from_records(cls, records, default_anchor=None) -> Recurrences:
+        """Create the recurrences from (recurrent, recurrence, recurrence value, anchor date) records.
+
+        Args:
+            records: an iterable of records, the anchor date may be None.
+            default_anchor: the anchor date of the records without one.
+
+        Returns:
+            Recurrences: the recurrences, in the order of the records.
+        """
+        records = list(records)
+        codes = np.fromiter(
+            (RECURRENCE_CODES[recurrence] if recurrent else NONE for recurrent, recurrence, *_ in records),
+            dtype=np.int8,
+            count=len(records),
+        )
+        values = np.fromiter((value or 0 for _, _, value, _ in records), dtype=np.float64, count=len(records))
+        anchors = np.array([anchor or default_anchor for *_, anchor in records], dtype="datetime64[D]")
+        return cls(codes=codes, values=values, anchors=anchors)
+
+    @classmethod
+    def from_objects(cls, objects, anchor_attribute: str = None, default_anchor=None) -> Recurrences:
+        """Create the recurrences of objects with recurrent, recurrence and recurrence_value, like Income and SubCategory.
+
+        Args:
+            objects: an iterable of objects.
+            anchor_attribute: the name of the anchor date attribute, like "income_date".
+            default_anchor: the anchor date of the objects without one.
+
+        Returns:
+            Recurrences: the recurrences, in the order of the objects.
+        """
+        return cls.from_records(
+            (
+                (
+                    item.recurrent,
+                    item.recurrence,
+                    item.recurrence_value,
+                    getattr(item, anchor_attribute) if anchor_attribute else None,
+                )
+                for item in objects
+            ),
+            default_anchor=default_anchor,
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def monthly_budget(self, months: np.ndarray) -> np.ndarray:
+        """Return the (recurrences, months) amounts in cents budgeted in each datetime64[M] month."""
+        return monthly_amounts(self.codes, self.values, months)
+
+    def yearly_budget(self, years: np.ndarray) -> np.ndarray:
+        """Return the (recurrences, years) amounts in cents budgeted in each year."""
+        return yearly_amounts(self.codes, self.values, years)
+
+    def period_amounts(self, boundaries: np.ndarray) -> np.ndarray:
+        """Return the amount of the occurrences of each recurrence in each period.
+
+        Args:
+            boundaries: the sorted datetime64[D] days between the periods, the period i starts on boundaries[i]
+                and ends the day before boundaries[i + 1].
+
+        Returns:
+            np.ndarray: a (recurrences, len(boundaries) - 1) float array with the amounts in cents.
+        """
+        counts = np.diff(occurrences_before(self.codes, self.anchors, boundaries), axis=1)
+        return self.values[:, None] * counts
+
+    def daily_amounts(self, first_day, last_day) -> tuple[np.ndarray, np.ndarray]:
+        """Return the amount of the occurrences of each recurrence in each day from first_day to last_day, inclusive.
+
+        Returns:
+            tuple: the datetime64[D] days, and a (recurrences, days) float array with the amounts in cents.
+        """
+        boundaries = np.arange(np.datetime64(first_day, "D"), np.datetime64(last_day, "D") + 2)
+        return boundaries[:-1], self.period_amounts(boundaries)
+
+    def occurrences(self, first_day, last_day) -> tuple[np.ndarray, np.ndarray]:
+        """Return the occurrences from first_day to last_day, inclusive, without going through the days between them.
+
+        Returns:
+            tuple: the index of the recurrence and the datetime64[D] date of each occurrence, ordered by recurrence
+                and date.
+        """
+        boundaries = np.array([first_day, np.datetime64(last_day, "D") + 1], dtype="datetime64[D]")
+        counts = occurrences_before(self.codes, self.anchors, boundaries)
+        numbers = np.maximum(counts[:, 1] - counts[:, 0], 0)
+        rows = np.repeat(np.arange(len(self)), numbers)
+        # the occurrences of each recurrence are numbered from the ones before first_day
+        offsets = np.repeat(counts[:, 0] - (np.cumsum(numbers) - numbers), numbers)
+        indexes = np.arange(len(rows)) + offsets
+        return rows, occurrence_dates(self.codes[rows], self.anchors[rows], indexes)
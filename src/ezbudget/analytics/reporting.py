@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from ezbudget.analytics.recurrence import Recurrences
+
+
+@dataclass(frozen=True)
+class BudgetReport:
+    """Actual and budgeted values of the user subcategories over a range of months, as (subcategories, months) arrays.
+
+    Attributes:
+        months: the datetime64[M] months of the columns.
+        subcategory_ids: the subcategory id of each row.
+        labels: the "Category - Subcategory" name of each row.
+        actual: the total in cents of the transactions of each subcategory and month.
+        budget: the amount in cents the recurrence of each subcategory expects in each month, 0 if not recurrent.
+    """
+
+    months: np.ndarray
+    subcategory_ids: np.ndarray
+    labels: list
+    actual: np.ndarray
+    budget: np.ndarray
+
+    @property
+    def month_labels(self) -> list:
+        """Return the "YYYY-MM" label of each month."""
+        return list(np.datetime_as_string(self.months, unit="M"))
+
+    def difference(self) -> np.ndarray:
+        """Return the budget minus the actual value, positive when less was spent than budgeted."""
+        return self.budget - self.actual
+
+    def rolling_average(self, window: int = 3) -> np.ndarray:
+        """Return the average of the actual values over the last window months, NaN until there are window months.
+
+        Args:
+            window: the number of months of the average.
+
+        Returns:
+            np.ndarray: a (subcategories, months) float array.
+        """
+        averages = np.full(self.actual.shape, np.nan)
+        if window <= self.actual.shape[1]:
+            sums = np.cumsum(self.actual, axis=1, dtype=np.float64)
+            sums[:, window:] = sums[:, window:] - sums[:, :-window]
+            averages[:, window - 1 :] = sums[:, window - 1 :] / window
+        return averages
+
+    def year_over_year(self, relative: bool = False) -> np.ndarray:
+        """Return the change of the actual values from the same month of the previous year.
+
+        Args:
+            relative: if True, the change is a fraction of the previous year value, NaN when that value is 0.
+
+        Returns:
+            np.ndarray: a (subcategories, months) float array, NaN for the months without a previous year in the range.
+        """
+        changes = np.full(self.actual.shape, np.nan)
+        current, previous = self.actual[:, 12:], self.actual[:, :-12].astype(np.float64)
+        if relative:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                changes[:, 12:] = np.where(previous != 0, (current - previous) / previous, np.nan)
+        else:
+            changes[:, 12:] = current - previous
+        return changes
+
+    def yearly_totals(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the actual and budgeted totals of each calendar year in the range.
+
+        Returns:
+            tuple: the years, and the (subcategories, years) actual and budget arrays.
+        """
+        years = self.months.astype("datetime64[Y]").astype(np.int64) + 1970
+        starts = np.flatnonzero(np.r_[True, years[1:] != years[:-1]])
+        if len(starts) == 0:
+            empty = np.zeros((len(self.subcategory_ids), 0))
+            return years, empty, empty
+        return (
+            years[starts],
+            np.add.reduceat(self.actual, starts, axis=1),
+            np.add.reduceat(self.budget, starts, axis=1),
+        )
+
+
+def month_span(first_month: str, last_month: str) -> np.ndarray:
+    """Return the datetime64[M] months from first_month to last_month, both "YYYY-MM" and inclusive."""
+    return np.arange(np.datetime64(first_month, "M"), np.datetime64(last_month, "M") + 1)
+
+
+def build_budget_report(model, user_id: int, first_month: str, last_month: str) -> BudgetReport:
+    """Build the budget report of the user subcategories from the monthly rollups.
+
+    The actual values come in one grouped query on the rollups and are pivoted with array indexing, the budgets are
+    computed for all subcategories and months at once.
+
+    Args:
+        model: the application model.
+        user_id: the user id.
+        first_month: the "YYYY-MM" key of the first month, inclusive.
+        last_month: the "YYYY-MM" key of the last month, inclusive.
+
+    Returns:
+        BudgetReport: the report, with a row per user subcategory ordered by category and subcategory name.
+    """
+    months = month_span(first_month, last_month)
+    subcategories = model.model_user_subcategory.read_user_subcategory_recurrences(user_id=user_id)
+    subcategory_ids = np.fromiter((row[0] for row in subcategories), dtype=np.int64, count=len(subcategories))
+    labels = [f"{category_name} - {subcategory_name}" for _, category_name, subcategory_name, *_ in subcategories]
+
+    actual = np.zeros((len(subcategory_ids), len(months)), dtype=np.int64)
+    totals = model.model_monthly_rollup.read_subcategory_month_totals(
+        user_id=user_id, first_month=first_month, last_month=last_month
+    )
+    if totals and len(subcategory_ids):
+        ids, month_keys, values = (np.array(column) for column in zip(*totals))
+        columns = (month_keys.astype("datetime64[M]") - months[0]).astype(np.int64)
+        order = np.argsort(subcategory_ids)
+        positions = np.searchsorted(subcategory_ids, ids, sorter=order).clip(max=len(order) - 1)
+        rows = order[positions]
+        # the subcategories with transactions that are no longer user subcategories are left out
+        known = subcategory_ids[rows] == ids
+        np.add.at(actual, (rows[known], columns[known]), values[known].astype(np.int64))
+
+    recurrences = Recurrences.from_records(
+        (recurrent, recurrence, value, None) for *_, recurrent, recurrence, value in subcategories
+    )
+    budget = recurrences.monthly_budget(months)
+
+    return BudgetReport(months=months, subcategory_ids=subcategory_ids, labels=labels, actual=actual, budget=budget)
@@ -0,0 +1,6 @@
+from .csv_reader import CSV_COLUMNS, read_csv
+from .importer import READERS, LookupTables, StatementImporter
+from .ofx_reader import read_ofx
+from .parsing import parse_amount
+from .qif_reader import read_qif
+from .rates_reader import RATES_COLUMNS, import_exchange_rates, read_rates_csv
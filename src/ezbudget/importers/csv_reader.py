@@ -0,0 +1,57 @@
+import csv
+from os import PathLike
+from typing import IO, Iterator
+
+from ezbudget.importers.parsing import open_source, parse_amount, parse_date, row_error
+
+# Statement field and the CSV column it is read from, by default.
+CSV_COLUMNS = {
+    "date": "date",
+    "value": "value",
+    "description": "description",
+    "account_name": "account",
+    "category_name": "category",
+    "transaction_type": "type",
+    "target_account_name": "target account",
+}
+
+
+def read_csv(
+    source: str | PathLike | IO[str],
+    columns: dict = None,
+    date_format: str = "%Y-%m-%d",
+    delimiter: str = ",",
+    decimal_separator: str = None,
+) -> Iterator[dict]:
+    """Read the transactions of a CSV statement, one row at a time.
+
+    Args:
+        source: the path of the CSV file, or a text stream, with a header row.
+        columns: the CSV column of each statement field, to override the ones in CSV_COLUMNS. Only the date and
+            value columns are mandatory.
+        date_format: the strptime format of the dates.
+        delimiter: the column delimiter.
+        decimal_separator: the decimal separator of the values, guessed for each value if not given.
+
+    Returns:
+        Iterator: a dict for each row, with the record number, the date, the signed value in cents and the other
+            statement fields that have a non empty column, or the record number and the "error" of a row whose date
+            or value can't be parsed.
+    """
+    columns = CSV_COLUMNS | (columns or {})
+    with open_source(source) as stream:
+        for record, row in enumerate(csv.DictReader(stream, delimiter=delimiter), start=1):
+            try:
+                # the columns missing from a short row, like a footer, are None
+                transaction = {
+                    "record": record,
+                    "date": parse_date(row[columns["date"]] or "", date_format),
+                    "value": parse_amount(row[columns["value"]] or "", decimal_separator),
+                }
+            except ValueError as error:
+                yield row_error(record, error)
+                continue
+            for field, column in columns.items():
+                if field not in transaction and row.get(column):
+                    transaction[field] = row[column].strip()
+            yield transaction
@@ -0,0 +1,218 @@
+import time
+from os import PathLike
+from pathlib import Path
+from typing import IO, Callable, Iterable, Iterator
+
+from ezbudget.importers.csv_reader import read_csv
+from ezbudget.importers.ofx_reader import read_ofx
+from ezbudget.importers.qif_reader import read_qif
+from ezbudget.model import TransactionTypeEnum
+
+# Statement reader for each file extension.
+READERS = {
+    ".csv": read_csv,
+    ".ofx": read_ofx,
+    ".qfx": read_ofx,
+    ".qif": read_qif,
+}
+
+INCOME_PREFIX = "Income - "
+
+
+class LookupTables:
+    """Account, category, subcategory and income ids by name, loaded with one query per table.
+
+    The subcategories are keyed by (category name, subcategory name), as a category and a subcategory of another
+    category can have the same name.
+    """
+
+    def __init__(self, model, user_id: int) -> None:
+        self.accounts = {
+            account.name: (account.id, account.currency_id)
+            for account in model.model_account.read_accounts_by_user(user_id=user_id)
+        }
+        self.categories = {category.name: category.id for category in model.model_category.read_categories()}
+        self.incomes = {income.name: income.id for income in model.model_income.read_incomes_by_user(user_id=user_id)}
+        self.subcategories = {
+            (category_name, subcategory_name): subcategory_id
+            for category_name, subcategory_name, subcategory_id in model.model_subcategory.read_subcategory_names()
+        }
+
+    def account_id(self, account_name: str) -> int | None:
+        """Return the id of a user account."""
+        account = self.accounts.get(account_name)
+        return account[0] if account is not None else None
+
+    def category_id(self, category_name: str) -> int | None:
+        """Return the id of a category."""
+        return self.categories.get(category_name)
+
+    def income_id(self, category_name: str) -> int | None:
+        """Return the id of an income, named "Income - name" like in the transactions tab, or just by its name."""
+        if category_name is None:
+            return None
+        return self.incomes.get(category_name.removeprefix(INCOME_PREFIX))
+
+    def subcategory_id(self, category_name: str) -> int | None:
+        """Return the id of a subcategory, named "Category - Subcategory" like in the transactions tab."""
+        if category_name is None:
+            return None
+        category_name, _, subcategory_name = category_name.partition(" - ")
+        return self.subcategories.get((category_name, subcategory_name))
+
+
+class StatementImporter:
+    """Import bank statements into the transactions of a user, through ModelTransaction.create_transactions_bulk.
+
+    The statement rows are read, mapped and written as a stream, so only one chunk of rows is held in memory, and
+    the whole statement is written in a single database transaction. The rows that can't be parsed or mapped, like
+    the footer of a bank CSV, are skipped and reported without stopping the import.
+
+    Args:
+        model: the application model.
+        user_id: the user that owns the accounts of the statement.
+        chunk_size: the number of rows written to the database at a time.
+        progress: called with the number of rows read so far and the rows per second, after each chunk and at the end.
+    """
+
+    def __init__(self, model, user_id: int, chunk_size: int = 500, progress: Callable[[int, float], None] = None):
+        self.model = model
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    def import_file(self, source: str | PathLike | IO[str], file_format: str = None, **options) -> dict | str:
+        """Import a CSV, OFX, QFX or QIF statement file.
+
+        Args:
+            source: the path of the statement file, or a text stream.
+            file_format: the file extension that selects the reader from READERS, taken from the path if not given.
+            options: the import_rows arguments, and the reader arguments (like date_format) for the rest.
+
+        Returns:
+            dict: the import summary, see import_rows.
+            str: the error message, if the statement failed to be imported.
+        """
+        if file_format is None:
+            file_format = Path(source).suffix if isinstance(source, (str, PathLike)) else ""
+        reader = READERS.get(file_format.lower())
+        if reader is None:
+            return f"Unsupported statement format: {file_format}"
+
+        import_options = {key: options.pop(key) for key in ("account_name", "default_category") if key in options}
+        return self.import_rows(reader(source, **options), **import_options)
+
+    def import_rows(self, rows: Iterable[dict], account_name: str = None, default_category: str = None) -> dict | str:
+        """Import the rows read from a statement.
+
+        The transaction type is the row transaction type if given, a transfer if the row has a target account, and
+        otherwise an expense for negative values and an income for positive ones.
+
+        Args:
+            rows: the statement rows, as returned by the readers.
+            account_name: the account of the rows that don't have one.
+            default_category: the category, as named in the transactions tab, of the rows that don't have one. It
+                is only used for the transactions of the same kind, incomes for an "Income - name" category and
+                expenses and transfers for a "Category - Subcategory" one.
+
+        Returns:
+            dict: the number of transactions "imported", the (record, reason) list of the rows "skipped", the
+                "seconds" it took and the "rows_per_second".
+            str: the error message, if the transactions failed to be written. Nothing is written in that case.
+        """
+        lookup_tables = LookupTables(self.model, self.user_id)
+        skipped = []
+        start = time.perf_counter()
+        transaction_ids = self.model.model_transaction.create_transactions_bulk(
+            self._transactions(rows, lookup_tables, account_name, default_category, skipped, start),
+            chunk_size=self.chunk_size,
+        )
+        if isinstance(transaction_ids, str):
+            return transaction_ids
+
+        seconds = time.perf_counter() - start
+        rows_per_second = (len(transaction_ids) + len(skipped)) / seconds if seconds else 0.0
+        if self.progress is not None:
+            self.progress(len(transaction_ids) + len(skipped), rows_per_second)
+        return {
+            "imported": len(transaction_ids),
+            "skipped": skipped,
+            "seconds": seconds,
+            "rows_per_second": rows_per_second,
+        }
+
+    def _transactions(
+        self,
+        rows: Iterable[dict],
+        lookup_tables: LookupTables,
+        account_name: str,
+        default_category: str,
+        skipped: list,
+        start: float,
+    ) -> Iterator[tuple]:
+        """Map the statement rows to create_transactions_bulk tuples, skipping the ones that can't be parsed or
+        mapped."""
+        for number, row in enumerate(rows, start=1):
+            if self.progress is not None and number % self.chunk_size == 0:
+                self.progress(number, number / (time.perf_counter() - start))
+            if "error" in row:
+                skipped.append((row.get("record", number), row["error"]))
+                continue
+            try:
+                transaction = self._transaction(row, lookup_tables, account_name, default_category)
+            except (KeyError, TypeError, ValueError) as row_error:
+                transaction = f"A {type(row_error).__name__} occurred: {row_error}"
+            if isinstance(transaction, str):
+                skipped.append((row.get("record", number), transaction))
+            else:
+                yield transaction
+
+    @staticmethod
+    def _transaction(row: dict, lookup_tables: LookupTables, account_name: str, default_category: str) -> tuple | str:
+        account_name = row.get("account_name") or account_name
+        target_account_name = row.get("target_account_name")
+        value = row["value"]
+
+        if row.get("transaction_type"):
+            transaction_type = row["transaction_type"].capitalize()
+            if transaction_type not in TransactionTypeEnum.__members__:
+                return f"Unknown transaction type: {row['transaction_type']}"
+        elif target_account_name:
+            transaction_type = "Transfer"
+            # a positive transfer is money coming from the target account
+            if value > 0:
+                account_name, target_account_name = target_account_name, account_name
+        else:
+            transaction_type = "Expense" if value < 0 else "Income"
+
+        if account_name not in lookup_tables.accounts:
+            return f"Unknown account: {account_name}"
+        account_id, currency_id = lookup_tables.accounts[account_name]
+        target_account_id = None
+        if transaction_type == "Transfer":
+            if target_account_name not in lookup_tables.accounts:
+                return f"Unknown target account: {target_account_name}"
+            target_account_id = lookup_tables.accounts[target_account_name][0]
+
+        category_name = row.get("category_name") or default_category
+        subcategory_id = income_id = None
+        if transaction_type == "Income":
+            income_id = lookup_tables.income_id(category_name)
+            if income_id is None:
+                return f"Unknown income: {category_name}"
+        else:
+            subcategory_id = lookup_tables.subcategory_id(category_name)
+            if subcategory_id is None:
+                return f"Unknown category: {category_name}"
+
+        return (
+            account_id,
+            row["date"],
+            transaction_type,
+            abs(value),
+            currency_id,
+            subcategory_id,
+            income_id,
+            row.get("description"),
+            target_account_id,
+        )
@@ -0,0 +1,70 @@
+from os import PathLike
+from typing import IO, Iterator
+
+from ezbudget.importers.parsing import open_source, parse_amount, parse_date, row_error
+
+CHUNK_SIZE = 65536
+
+
+def read_ofx_tags(stream: IO[str]) -> Iterator[tuple[str, str]]:
+    """Read the tags of an OFX document, chunk by chunk.
+
+    Both the SGML (OFX 1.x, where closing tags are optional) and the XML (OFX 2.x) documents are supported, in one
+    or many lines.
+
+    Args:
+        stream: the text stream of the OFX document.
+
+    Returns:
+        Iterator: a (tag, text) tuple for each tag, where closing tags start with "/".
+    """
+    buffer = ""
+    while chunk := stream.read(CHUNK_SIZE):
+        tokens = (buffer + chunk).split("<")
+        buffer = tokens.pop()
+        yield from _tags(tokens)
+    yield from _tags([buffer])
+
+
+def _tags(tokens: list) -> Iterator[tuple[str, str]]:
+    for token in tokens:
+        tag, separator, text = token.partition(">")
+        # the header before the first tag, and the <?xml?> and <?OFX?> processing instructions
+        if separator and not tag.startswith("?"):
+            yield tag.strip().upper(), text.strip()
+
+
+def read_ofx(source: str | PathLike | IO[str], decimal_separator: str = None) -> Iterator[dict]:
+    """Read the transactions of an OFX (or QFX) statement, one <STMTTRN> at a time.
+
+    Args:
+        source: the path of the OFX file, or a text stream.
+        decimal_separator: the decimal separator of the amounts, guessed for each amount if not given.
+
+    Returns:
+        Iterator: a dict for each transaction, with the record number, the date, the signed value in cents and
+            the description, from the NAME tag or the MEMO tag, or the record number and the "error" of a
+            transaction whose date or amount is missing or can't be parsed.
+    """
+    with open_source(source) as stream:
+        record = 0
+        transaction = None
+        for tag, text in read_ofx_tags(stream):
+            if tag == "STMTTRN":
+                transaction = {}
+            elif transaction is None:
+                continue
+            elif tag == "/STMTTRN":
+                record += 1
+                try:
+                    yield {
+                        "record": record,
+                        "date": parse_date(transaction["DTPOSTED"][:8], "%Y%m%d"),
+                        "value": parse_amount(transaction["TRNAMT"], decimal_separator),
+                        "description": transaction.get("NAME") or transaction.get("MEMO"),
+                    }
+                except (KeyError, ValueError) as error:
+                    yield row_error(record, error)
+                transaction = None
+            elif text:
+                transaction[tag] = text
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from os import PathLike
+from typing import IO, Iterator
+
+
+@contextmanager
+def open_source(source: str | PathLike | IO[str]) -> Iterator[IO[str]]:
+    """Open a statement file for reading, or use an already open text stream as it is.
+
+    Args:
+        source: the path of the statement file, or a text stream.
+
+    Returns:
+        IO: the text stream, which is only closed on exit if it was opened here.
+    """
+    if isinstance(source, (str, PathLike)):
+        with open(source, mode="r", encoding="utf-8-sig", newline="") as stream:
+            yield stream
+    else:
+        yield source
+
+
+def parse_amount(text: str, decimal_separator: str = None) -> int:
+    """Return the value in cents of an amount written in a statement.
+
+    Args:
+        text: the amount, like "-1,234.56", "1.234,56" or "(12.30)" for a negative amount.
+        decimal_separator: "." or ",". If not given, the last separator is the decimal one when both are used,
+            and a single separator is the decimal one when it is followed by one or two digits.
+
+    Returns:
+        int: the signed value in cents.
+    """
+    amount = text.strip().replace(" ", "").replace("\u00a0", "")
+    negative = amount.startswith("(") and amount.endswith(")")
+    amount = amount.strip("()")
+
+    if decimal_separator is None:
+        last_separator = max(amount.rfind("."), amount.rfind(","))
+        if "." in amount and "," in amount:
+            decimal_separator = amount[last_separator]
+        elif last_separator >= 0 and amount.count(amount[last_separator]) == 1:
+            digits_after = len(amount) - last_separator - 1
+            decimal_separator = amount[last_separator] if digits_after in (1, 2) else None
+    thousands_separators = {".", ","} - {decimal_separator}
+    for separator in thousands_separators:
+        amount = amount.replace(separator, "")
+    if decimal_separator is not None:
+        amount = amount.replace(decimal_separator, ".")
+
+    try:
+        cents = int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {text!r}") from None
+    return -cents if negative else cents
+
+
+def row_error(record: int, error: Exception) -> dict:
+    """Return the row a reader yields for a record that can't be parsed, with the reason in its "error" field.
+
+    Args:
+        record: the record number.
+        error: the KeyError of a missing field, or the ValueError of a field that can't be parsed.
+
+    Returns:
+        dict: the record number and the error message.
+    """
+    if isinstance(error, KeyError):
+        return {"record": record, "error": f"Missing field: {error.args[0]}"}
+    return {"record": record, "error": str(error)}
+
+
+def parse_date(text: str, date_format: str) -> datetime:
+    """Return the date written in a statement.
+
+    Args:
+        text: the date.
+        date_format: the strptime format of the date.
+
+    Returns:
+        datetime: the date, at midnight.
+    """
+    return datetime.strptime(text.strip(), date_format)
@@ -0,0 +1,75 @@
+from os import PathLike
+from typing import IO, Iterator
+
+from ezbudget.importers.parsing import open_source, parse_amount, parse_date, row_error
+
+
+def read_qif(
+    source: str | PathLike | IO[str], date_format: str = "%m/%d/%Y", decimal_separator: str = None
+) -> Iterator[dict]:
+    """Read the transactions of a QIF statement, one record at a time.
+
+    Categories are written as "Category:Subcategory" in QIF and are returned as "Category - Subcategory", like in
+    the transactions tab, and a "[Account]" category is a transfer to that account. Split lines are ignored.
+
+    Args:
+        source: the path of the QIF file, or a text stream.
+        date_format: the strptime format of the dates, after the "'" before the year is replaced by "/". Two digit
+            years are also accepted.
+        decimal_separator: the decimal separator of the amounts, guessed for each amount if not given.
+
+    Returns:
+        Iterator: a dict for each record, with the record number, the date, the signed value in cents and the
+            description, category, account or target account when they are given, or the record number and the
+            "error" of a record whose date or amount is missing or can't be parsed.
+    """
+    with open_source(source) as stream:
+        record = 0
+        account_name = None
+        in_account_list = False
+        fields = {}
+        for line in stream:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            if line.startswith("!"):
+                in_account_list = line.lower().startswith("!account")
+                continue
+
+            code, text = line[0], line[1:].strip()
+            if code != "^":
+                fields.setdefault(code, text)
+            elif in_account_list:
+                account_name = fields.get("N", account_name)
+                fields = {}
+            elif fields:
+                record += 1
+                try:
+                    transaction = _qif_transaction(record, fields, account_name, date_format, decimal_separator)
+                except (KeyError, ValueError) as error:
+                    transaction = row_error(record, error)
+                yield transaction
+                fields = {}
+
+
+def _qif_transaction(record: int, fields: dict, account_name: str, date_format: str, decimal_separator: str) -> dict:
+    date = fields["D"].replace("'", "/").replace(" ", "0")
+    if len(date.rsplit("/", 1)[-1]) == 2:
+        date_format = date_format.replace("%Y", "%y")
+    transaction = {
+        "record": record,
+        "date": parse_date(date, date_format),
+        "value": parse_amount(fields.get("T") or fields["U"], decimal_separator),
+    }
+    if fields.get("P") or fields.get("M"):
+        transaction["description"] = fields.get("P") or fields.get("M")
+    if account_name:
+        transaction["account_name"] = account_name
+
+    # the class after the "/" is not used
+    category = fields.get("L", "").split("/")[0]
+    if category.startswith("[") and category.endswith("]"):
+        transaction["target_account_name"] = category[1:-1]
+    elif category:
+        transaction["category_name"] = " - ".join(category.split(":", 1))
+    return transaction
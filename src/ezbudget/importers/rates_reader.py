@@ -0,0 +1,118 @@
+import csv
+from os import PathLike
+from typing import IO, Iterator
+
+from ezbudget.importers.parsing import open_source, parse_date
+
+# Exchange rate field and the CSV column it is read from, by default, in the long format.
+RATES_COLUMNS = {
+    "date": "date",
+    "base": "base",
+    "quote": "quote",
+    "rate": "rate",
+}
+
+
+def parse_rate(text: str) -> float:
+    """Return the exchange rate written in a rates file, with a "." or "," decimal separator."""
+    try:
+        return float(text.strip().replace(",", "."))
+    except ValueError:
+        raise ValueError(f"Invalid rate: {text!r}") from None
+
+
+def read_rates_csv(
+    source: str | PathLike | IO[str],
+    columns: dict = None,
+    date_format: str = "%Y-%m-%d",
+    delimiter: str = ",",
+    base: str = None,
+) -> Iterator[dict]:
+    """Read the exchange rates of a CSV file, one rate at a time.
+
+    The file has a row for each rate, with its date, base and quote currency codes and rate. If the base currency is
+    given, the file has a row for each date instead, with the rate of each quote currency in the column named by its
+    code, like the reference rates published by the central banks. The empty and "N/A" rates of that format are
+    skipped.
+
+    Args:
+        source: the path of the CSV file, or a text stream, with a header row.
+        columns: the CSV column of each exchange rate field, to override the ones in RATES_COLUMNS. Only the date
+            column is used if the base currency is given.
+        date_format: the strptime format of the dates.
+        delimiter: the column delimiter.
+        base: the base currency code of all the rates.
+
+    Returns:
+        Iterator: a dict for each rate, with the record number, the rate date, the base and quote currency codes and
+            the rate.
+    """
+    columns = RATES_COLUMNS | (columns or {})
+    with open_source(source) as stream:
+        for record, row in enumerate(csv.DictReader(stream, delimiter=delimiter), start=1):
+            rate_date = parse_date(row[columns["date"]], date_format)
+            if base is None:
+                yield {
+                    "record": record,
+                    "rate_date": rate_date,
+                    "base": row[columns["base"]].strip().upper(),
+                    "quote": row[columns["quote"]].strip().upper(),
+                    "rate": parse_rate(row[columns["rate"]]),
+                }
+                continue
+            for quote, text in row.items():
+                if quote is None or quote == columns["date"] or not quote.strip():
+                    continue
+                if not text or text.strip().upper() in ("", "N/A"):
+                    continue
+                yield {
+                    "record": record,
+                    "rate_date": rate_date,
+                    "base": base.strip().upper(),
+                    "quote": quote.strip().upper(),
+                    "rate": parse_rate(text),
+                }
+
+
+def import_exchange_rates(model, source: str | PathLike | IO[str], **options) -> dict | str:
+    """Import the exchange rates of a CSV file, in a single database transaction, through
+    ModelExchangeRate.create_exchange_rates.
+
+    Args:
+        model: the application model.
+        source: the path of the CSV file, or a text stream.
+        options: the read_rates_csv arguments, like base and date_format.
+
+    Returns:
+        dict: the number of rates "imported" and the (record, reason) list of the rates "skipped", the ones of an
+            unknown currency or not positive.
+        str: the error message, if the file can't be read or the rates failed to be written. Nothing is written in
+            that case.
+    """
+    currency_ids = {record.code: record.id for record in model.model_currency.read_currency_records().values()}
+    rates = []
+    skipped = []
+    try:
+        for row in read_rates_csv(source, **options):
+            if row["base"] not in currency_ids:
+                skipped.append((row["record"], f"Unknown currency: {row['base']}"))
+            elif row["quote"] not in currency_ids:
+                skipped.append((row["record"], f"Unknown currency: {row['quote']}"))
+            elif row["rate"] <= 0:
+                skipped.append((row["record"], f"The rate must be positive: {row['rate']}"))
+            else:
+                rates.append(
+                    {
+                        "rate_date": row["rate_date"],
+                        "base_currency_id": currency_ids[row["base"]],
+                        "quote_currency_id": currency_ids[row["quote"]],
+                        "rate": row["rate"],
+                    }
+                )
+    except (KeyError, ValueError) as error:
+        return f"Failed to read the exchange rates: {error}"
+
+    imported = model.model_exchange_rate.create_exchange_rates(rates)
+    if isinstance(imported, str):
+        return imported
+    return {"imported": imported, "skipped": skipped}
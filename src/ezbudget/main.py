@@ -6,7 +6,8 @@ import qdarkstyle
 from PySide6.QtWidgets import QApplication
 
 from ezbudget.model import Model
-from ezbudget.presenter import Presenter
+from ezbudget.presenter import Presenter, QueryTracer
+from ezbudget.utils.logging import configure_logging
 from ezbudget.view import MainWindow
 
 BASEDIR = os.path.dirname(__file__)
@@ -19,17 +20,30 @@ def main() -> None:
     with open(f"{BASEDIR}/currencies.toml", mode="rb") as doc:
         currency_data = tomllib.load(doc)
 
+    with open(f"{BASEDIR}/database.toml", mode="rb") as doc:
+        database_config = tomllib.load(doc)
+
     app = QApplication(sys.argv)
     # setup stylesheet
     app.setStyleSheet(qdarkstyle.load_stylesheet_pyside6())
-    model = Model(category_data, currency_data)
-    presenter = Presenter(model)
+    model = Model(category_data, currency_data, profile=database_config)
+    presenter = Presenter(model, settings_dir=BASEDIR)
+    tracer = None
+    if os.environ.get("EZBUDGET_TRACE"):
+        # the log.ini setup, before the tracer gets its logger
+        configure_logging()
+        tracer = QueryTracer(model)
+        tracer.enable()
+        # before the view connects the presenter methods to its signals
+        tracer.instrument(presenter)
     view = MainWindow(presenter, BASEDIR)
     presenter.view = view
 
     view.show()
 
     app.exec()
+    if tracer is not None:
+        tracer.log_summary()
 
 
 if __name__ == "__main__":
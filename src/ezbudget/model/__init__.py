@@ -5,8 +5,12 @@ from .base_models import (
     Category,
     CategoryTypeEnum,
     Currency,
+    ExchangeRate,
     Income,
+    MonthlyRollup,
     RecurrenceEnum,
+    RecurringOccurrence,
+    RecurringRun,
     SubCategory,
     Transaction,
     TransactionTypeEnum,
@@ -14,3 +18,11 @@ from .base_models import (
     UserSubCategory,
 )
 from .model import Model
+from .model_currency import CurrencyRecord
+from .model_transaction import (
+    TRANSACTION_ORDERS,
+    TransactionFilters,
+    search_terms,
+    transaction_cursor,
+)
+from .sqlite_profile import PROFILES, SQLiteProfile, get_profile
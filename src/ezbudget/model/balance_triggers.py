@@ -0,0 +1,33 @@
+# Account balances are kept by SQLite triggers on the transactions table, so every transaction write changes the
+# balances in the same statement, whatever the code path that wrote it.
+#
+# The signed value of a transaction for its account is +value for an income and -value for an expense, inverted
+# for credit cards as their balance is what is owed, and -value for a transfer, whatever the account type. The
+# target account of a transfer gets +value. ModelAccount.recompute_balances uses the same rules.
+
+
+def _balance_updates(row: str, sign: str) -> str:
+    return f"""
+    UPDATE accounts
+    SET balance = balance {sign} (CASE {row}.transaction_type WHEN 'Income' THEN {row}.value ELSE -{row}.value END)
+        * (CASE WHEN account_type = 'CARD' AND {row}.transaction_type != 'Transfer' THEN -1 ELSE 1 END)
+    WHERE id = {row}.account_id;
+    UPDATE accounts SET balance = balance {sign} {row}.value
+    WHERE id = {row}.target_account_id AND {row}.transaction_type = 'Transfer';"""
+
+
+BALANCE_TRIGGERS = {
+    "trg_transactions_balance_insert": f"""
+CREATE TRIGGER trg_transactions_balance_insert AFTER INSERT ON transactions
+BEGIN{_balance_updates("NEW", "+")}
+END""",
+    "trg_transactions_balance_update": f"""
+CREATE TRIGGER trg_transactions_balance_update
+AFTER UPDATE OF account_id, target_account_id, transaction_type, value ON transactions
+BEGIN{_balance_updates("OLD", "-")}{_balance_updates("NEW", "+")}
+END""",
+    "trg_transactions_balance_delete": f"""
+CREATE TRIGGER trg_transactions_balance_delete AFTER DELETE ON transactions
+BEGIN{_balance_updates("OLD", "-")}
+END""",
+}
@@ -2,9 +2,25 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, ForeignKey, Index, UniqueConstraint, func
+from sqlalchemy import (
+    DDL,
+    CheckConstraint,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    event,
+    func,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from ezbudget.model.balance_triggers import BALANCE_TRIGGERS
+from ezbudget.model.rollup_triggers import ROLLUP_TRIGGERS
+from ezbudget.model.search_triggers import (
+    CREATE_TRANSACTIONS_FTS,
+    DROP_TRANSACTIONS_FTS,
+    SEARCH_TRIGGERS,
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -73,7 +89,8 @@ class Account(Base):
     name: Mapped[str] = mapped_column(nullable=False)
     account_type: Mapped[AccountTypeEnum] = mapped_column(nullable=False)
     currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id", name="currency"), nullable=False)
-    balance: Mapped[int] = mapped_column(default=0)  # In cents
+    balance: Mapped[int] = mapped_column(default=0)  # In cents, kept by the transactions balance triggers
+    opening_balance: Mapped[int] = mapped_column(default=0)  # In cents, the balance before any transaction
 
     # optional
     credit_limit: Mapped[Optional[int]]  # In cents
@@ -85,7 +102,10 @@ class Account(Base):
     user: Mapped["User"] = relationship("User")
     currency: Mapped["Currency"] = relationship("Currency")
 
-    __table_args__ = (Index("ix_accounts_name", func.lower(name), unique=True),)
+    __table_args__ = (
+        Index("ix_accounts_name", func.lower(name), unique=True),
+        Index("ix_accounts_user_id", user_id),
+    )
 
 
 class Income(Base):
@@ -143,6 +163,120 @@ class Transaction(Base):
             "(subcategory_id IS NOT NULL AND income_id IS NULL) OR (subcategory_id IS NULL AND income_id IS NOT NULL)",
             name="check_subcategory_or_income",
         ),
+        Index("ix_transactions_account_id_date", "account_id", "date"),
+        Index("ix_transactions_subcategory_id_date", "subcategory_id", "date"),
+        Index("ix_transactions_income_id_date", "income_id", "date"),
+        Index("ix_transactions_date", "date"),
+        Index("ix_transactions_value", "value"),
+    )
+
+
+for balance_trigger in BALANCE_TRIGGERS.values():
+    event.listen(Transaction.__table__, "after_create", DDL(balance_trigger))
+for rollup_trigger in ROLLUP_TRIGGERS.values():
+    event.listen(Transaction.__table__, "after_create", DDL(rollup_trigger))
+event.listen(Transaction.__table__, "after_create", DDL(CREATE_TRANSACTIONS_FTS))
+for search_trigger in SEARCH_TRIGGERS.values():
+    event.listen(Transaction.__table__, "after_create", DDL(search_trigger))
+# the index isn't a mapped table, it is dropped with the transactions so it never outlives its content
+event.listen(Transaction.__table__, "before_drop", DDL(DROP_TRANSACTIONS_FTS))
+
+
+class MonthlyRollup(Base):
+    """Total and number of the transactions of a user in a month, for one account, subcategory or income, transaction
+    type and currency. The rows are kept by the triggers in rollup_triggers, never written by the application."""
+
+    __tablename__ = "monthly_rollups"
+
+    # mandatory
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", name="user"), nullable=False)
+    month: Mapped[str] = mapped_column(nullable=False)  # YYYY-MM
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id", name="account"), nullable=False)
+    transaction_type: Mapped[TransactionTypeEnum] = mapped_column(nullable=False)
+    currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id", name="currency"), nullable=False)
+    total: Mapped[int] = mapped_column(default=0)  # In cents
+    count: Mapped[int] = mapped_column(default=0)
+
+    # optional
+    subcategory_id: Mapped[int] = mapped_column(ForeignKey("subcategories.id", name="subcategory"), nullable=True)
+    income_id: Mapped[int] = mapped_column(ForeignKey("incomes.id", name="income"), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ux_monthly_rollups_key",
+            user_id,
+            month,
+            account_id,
+            transaction_type,
+            currency_id,
+            func.ifnull(subcategory_id, 0),
+            func.ifnull(income_id, 0),
+            unique=True,
+        ),
+    )
+
+
+class RecurringOccurrence(Base):
+    """An occurrence of a recurrent income or user subcategory that was turned into a transaction, so it is never
+    created twice. The row stays when the user deletes the transaction."""
+
+    __tablename__ = "recurring_occurrences"
+
+    # mandatory
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", name="user"), nullable=False)
+    occurrence_date: Mapped[datetime] = mapped_column(nullable=False)
+
+    # optional
+    income_id: Mapped[int] = mapped_column(ForeignKey("incomes.id", name="income"), nullable=True)
+    subcategory_id: Mapped[int] = mapped_column(ForeignKey("subcategories.id", name="subcategory"), nullable=True)
+    transaction_id: Mapped[int] = mapped_column(
+        ForeignKey("transactions.id", name="occurrence_transaction", ondelete="SET NULL"), nullable=True
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "(subcategory_id IS NOT NULL AND income_id IS NULL) OR (subcategory_id IS NULL AND income_id IS NOT NULL)",
+            name="check_subcategory_or_income",
+        ),
+        Index(
+            "ux_recurring_occurrences_key",
+            user_id,
+            occurrence_date,
+            func.ifnull(income_id, 0),
+            func.ifnull(subcategory_id, 0),
+            unique=True,
+        ),
+    )
+
+
+class RecurringRun(Base):
+    """The last day the recurring transactions of a user were created up to."""
+
+    __tablename__ = "recurring_runs"
+
+    # mandatory
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", name="user"), primary_key=True)
+    last_run: Mapped[datetime] = mapped_column(nullable=False)
+
+
+class ExchangeRate(Base):
+    """The value of one unit of the base currency in the quote currency, from the rate date until the next rate of
+    the same pair."""
+
+    __tablename__ = "exchange_rates"
+
+    # mandatory
+    id: Mapped[int] = mapped_column(primary_key=True)
+    rate_date: Mapped[datetime] = mapped_column(nullable=False)
+    base_currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id", name="base_currency"), nullable=False)
+    quote_currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id", name="quote_currency"), nullable=False)
+    rate: Mapped[float] = mapped_column(nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("rate > 0", name="check_positive_rate"),
+        Index("ux_exchange_rates_key", base_currency_id, quote_currency_id, rate_date, unique=True),
     )
 
 
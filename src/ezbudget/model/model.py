@@ -1,7 +1,11 @@
-from typing import Optional
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain
+from threading import Lock
+from typing import Iterable, Iterator, Optional
 
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 from sqlalchemy.orm.query import Query
 from sqlalchemy.sql.expression import ScalarSelect
 
@@ -9,22 +13,37 @@ from ezbudget.model import Base
 from ezbudget.model.model_account import ModelAccount
 from ezbudget.model.model_category import ModelCategory
 from ezbudget.model.model_currency import ModelCurrency
+from ezbudget.model.model_exchange_rate import ModelExchangeRate
 from ezbudget.model.model_income import ModelIncome
+from ezbudget.model.model_monthly_rollup import ModelMonthlyRollup
+from ezbudget.model.model_recurring_occurrence import ModelRecurringOccurrence
 from ezbudget.model.model_subcategory import ModelSubCategory
 from ezbudget.model.model_transaction import ModelTransaction
 from ezbudget.model.model_user import ModelUser
 from ezbudget.model.model_user_subcategory import ModelUserSubCategory
+from ezbudget.model.sqlite_profile import SQLiteProfile, get_profile
 from ezbudget.presenter import ModelProtocol
 
 
 class Model(ModelProtocol):
-    def __init__(self, category_data, currency_data, database_name: str = "of") -> None:
+    # number of objects a unit of work session keeps in its identity map before it is trimmed on the next commit
+    IDENTITY_MAP_LIMIT = 10000
+    # tables the database triggers write when a table is written
+    TRIGGERED_WRITES = {"transactions": ("accounts", "monthly_rollups")}
+
+    def __init__(
+        self, category_data, currency_data, database_name: str = "of", profile: str | dict | SQLiteProfile = None
+    ) -> None:
         self.engine = create_engine(f"sqlite:///{database_name}.db")
+        self.profile = get_profile(profile)
         # Composition
         self.model_account = ModelAccount(self)
         self.model_category = ModelCategory(self)
         self.model_currency = ModelCurrency(self)
+        self.model_exchange_rate = ModelExchangeRate(self)
         self.model_income = ModelIncome(self)
+        self.model_monthly_rollup = ModelMonthlyRollup(self)
+        self.model_recurring_occurrence = ModelRecurringOccurrence(self)
         self.model_subcategory = ModelSubCategory(self)
         self.model_transaction = ModelTransaction(self)
         self.model_user_subcategory = ModelUserSubCategory(self)
@@ -37,12 +56,28 @@ class Model(ModelProtocol):
             _ = connection_record
             cursor = dbapi_connection.cursor()
             cursor.execute("PRAGMA foreign_keys=ON;")
+            for pragma in self.profile.pragmas():
+                cursor.execute(pragma)
             cursor.close()
 
-        session_local = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.session_local = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # the objects of a unit of work stay readable after its session is closed
+        self.unit_of_work_factory = sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine
+        )
+        event.listen(self.unit_of_work_factory, "before_commit", trim_identity_map)
+        # how many times each table was written, so the caches built from a table know when to rebuild
+        self.revisions = Counter()
+        # the same without the writes of the triggers, for the caches that only depend on what the sessions write
+        self.direct_revisions = Counter()
+        self._revisions_lock = Lock()
+        for factory in (self.session_local, self.unit_of_work_factory):
+            event.listen(factory, "after_flush", self.count_flushed_writes)
+            event.listen(factory, "do_orm_execute", self.count_executed_writes)
 
         Base.metadata.create_all(self.engine)
-        self.session = session_local()
+        # every thread gets its own session, a unit of work replaces it while it runs
+        self.session = scoped_session(self.session_local)
 
         if database_name == "of":
             self.populate_categories()
@@ -67,6 +102,68 @@ class Model(ModelProtocol):
         self.session.close()
         Base.metadata.drop_all(self.engine)
 
+    @contextmanager
+    def unit_of_work(self, identity_map_limit: int = None) -> Iterator[Session]:
+        """Run the model methods called inside the block, in the calling thread, with a new short lived session.
+
+        The session is committed when the block ends, rolled back if it raises, and closed. The objects it loaded are
+        detached but keep their loaded attributes, as the session doesn't expire them on commit. The session the
+        thread used before is restored after the block.
+
+        Args:
+            identity_map_limit: the number of objects kept in the identity map, on every commit above it the objects
+                without pending changes are expunged. None uses IDENTITY_MAP_LIMIT.
+
+        Returns:
+            Session: the session of the unit of work.
+        """
+        session = self.unit_of_work_factory(info={"identity_map_limit": identity_map_limit or self.IDENTITY_MAP_LIMIT})
+        registry = self.session.registry
+        previous_session = registry() if registry.has() else None
+        registry.set(session)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+            if previous_session is None:
+                registry.clear()
+            else:
+                registry.set(previous_session)
+
+    def revision(self, *tables: str, triggered: bool = True) -> tuple:
+        """Return the revision of each table, a number that changes every time the table is written by a session.
+
+        Args:
+            tables: the table names.
+            triggered: count the writes of the triggers, like the account balances written with every transaction.
+                Without them a revision only changes when a session writes the table itself.
+
+        Returns:
+            tuple: the revisions, in the order of the tables.
+        """
+        revisions = self.revisions if triggered else self.direct_revisions
+        return tuple(revisions[table] for table in tables)
+
+    def bump_revisions(self, tables: Iterable[str]) -> None:
+        tables = set(tables)
+        triggered = tables.union(*(self.TRIGGERED_WRITES.get(table, ()) for table in tables))
+        with self._revisions_lock:
+            self.direct_revisions.update(tables)
+            self.revisions.update(triggered)
+
+    def count_flushed_writes(self, session: Session, flush_context) -> None:
+        _ = flush_context
+        # after a flush the session still lists the objects it wrote
+        self.bump_revisions(instance.__table__.name for instance in chain(session.new, session.dirty, session.deleted))
+
+    def count_executed_writes(self, orm_execute_state) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            self.bump_revisions([orm_execute_state.statement.table.name])
+
     # GENERIC METHODS
     def read_first_basequery(self, query: Query) -> Optional[ScalarSelect]:
         """Return a SQLAlchemy query selection that matches the given query.
@@ -90,3 +187,25 @@ class Model(ModelProtocol):
 
         """
         return self.session.scalars(query).all()
+
+    def read_rows_basequery(self, query: Query) -> list:
+        """Return the rows of a SQLAlchemy query that selects more than one column.
+
+        Args:
+            query: SQLAlchemy query object
+
+        Returns:
+            list: the list of row tuples of the selection
+        """
+        return self.session.execute(query).all()
+
+
+def trim_identity_map(session: Session) -> None:
+    """Expunge the objects without pending changes when the session holds more than its identity_map_limit."""
+    limit = session.info.get("identity_map_limit")
+    if limit is None or len(session.identity_map) <= limit:
+        return
+    changed = session.dirty | session.deleted
+    for instance in list(session.identity_map.values()):
+        if instance not in changed and instance in session:
+            session.expunge(instance)
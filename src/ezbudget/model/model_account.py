@@ -1,8 +1,8 @@
-from sqlalchemy import select
+from sqlalchemy import and_, case, func, select, union_all
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.exc import NoResultFound
 
-from ezbudget.model import Account, AccountTypeEnum
+from ezbudget.model import Account, AccountTypeEnum, Transaction, TransactionTypeEnum
 
 
 class ModelAccount:
@@ -26,7 +26,7 @@ class ModelAccount:
         Args:
             user_id: user id that own the account, which must exist in the users table.
             name: the name of the account, that must be unique.
-            balance: the balance of the account, it's zero by default
+            balance: the balance of the account before any transaction, it's zero by default
             account_type: the type of the account, it's DEBIT by default
             currency_id: the currency id of the account
 
@@ -41,6 +41,7 @@ class ModelAccount:
                 account_type=account_type,
                 currency_id=currency_id,
                 balance=balance,
+                opening_balance=balance,
                 credit_limit=credit_limit,
                 payment_day=payment_day,
                 interest_rate=interest_rate,
@@ -132,6 +133,57 @@ class ModelAccount:
         except NoResultFound:
             return False
 
+    def recompute_balances(self, fix: bool = False) -> dict:
+        """Rebuild the account balances from the opening balances and the transactions, to verify the ones kept by
+        the transactions balance triggers.
+
+        The signed values of all transactions are summed per account in a single grouped query.
+
+        Args:
+            fix: if True, the accounts with a wrong balance are updated with the rebuilt one.
+
+        Returns:
+            dict: the (stored balance, rebuilt balance) tuple of each account id where they differ.
+        """
+        card_sign = case(
+            (
+                and_(
+                    Account.account_type == AccountTypeEnum.CARD,
+                    Transaction.transaction_type != TransactionTypeEnum.Transfer,
+                ),
+                -1,
+            ),
+            else_=1,
+        )
+        signed_value = case(
+            (Transaction.transaction_type == TransactionTypeEnum.Income, Transaction.value), else_=-Transaction.value
+        )
+        deltas = union_all(
+            select(Transaction.account_id.label("account_id"), (signed_value * card_sign).label("delta")).join(
+                Account, Transaction.account_id == Account.id
+            ),
+            select(Transaction.target_account_id, Transaction.value).where(
+                Transaction.transaction_type == TransactionTypeEnum.Transfer
+            ),
+        ).subquery()
+        totals = select(deltas.c.account_id, func.sum(deltas.c.delta).label("total")).group_by(deltas.c.account_id)
+        totals = totals.subquery()
+
+        rows = self.parent.read_rows_basequery(
+            select(Account, Account.opening_balance + func.coalesce(totals.c.total, 0)).outerjoin(
+                totals, totals.c.account_id == Account.id
+            )
+        )
+        differences = {
+            account.id: (account.balance, balance) for account, balance in rows if account.balance != balance
+        }
+        if fix and differences:
+            for account, balance in rows:
+                if account.id in differences:
+                    account.balance = balance
+            self.parent.session.commit()
+        return differences
+
     def delete_account(self, id: int) -> int:
         """Delete an account in the database.
 
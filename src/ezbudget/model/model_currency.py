@@ -1,12 +1,29 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 from ezbudget.model.base_models import Currency
 
 
+@dataclass(frozen=True, slots=True)
+class CurrencyRecord:
+    """A currency as an immutable value, that the views and the worker threads share without a session."""
+
+    id: int
+    name: str
+    symbol: str
+    code: str
+    symbol_position: str
+
+
 class ModelCurrency:
     def __init__(self, parent_model):
         self.parent = parent_model
+        # the (currencies revision, records) of the last read_currency_records
+        self._records = None
 
     def create_currency(self, name: str, symbol: str, code: str, symbol_position: str) -> Currency | str:
         """Create a new currency in the database and return a Category.
@@ -52,3 +69,38 @@ class ModelCurrency:
             [Currency]: list of all currencies.
         """
         return self.parent.read_all_basequery(select(Currency))
+
+    def read_currency_records(self) -> Mapping[int, CurrencyRecord]:
+        """Return the CurrencyRecord of every currency by id, in id order.
+
+        The records are read once and kept until the currencies table is written (see Model.revision), so the
+        views can ask for them every time they are built without querying the database.
+
+        Returns:
+            Mapping: a read only mapping of the currency ids to their records.
+        """
+        revision = self.parent.revision("currencies")
+        cached = self._records
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+
+        rows = self.parent.read_rows_basequery(
+            select(Currency.id, Currency.name, Currency.symbol, Currency.code, Currency.symbol_position).order_by(
+                Currency.id
+            )
+        )
+        records = MappingProxyType({row[0]: CurrencyRecord(*row) for row in rows})
+        self._records = (revision, records)
+        return records
+
+    def read_currency_record(self, currency_id: int) -> CurrencyRecord | None:
+        """Return the CurrencyRecord of a currency id, from read_currency_records.
+
+        Args:
+            currency_id: the currency id.
+
+        Returns:
+            CurrencyRecord: if the currency exist.
+            None: if the currency does not exist.
+        """
+        return self.read_currency_records().get(currency_id)
@@ -0,0 +1,56 @@
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from ezbudget.model import ExchangeRate
+
+
+class ModelExchangeRate:
+    def __init__(self, parent_model):
+        self.parent = parent_model
+
+    def create_exchange_rates(self, rates: Iterable[dict]) -> int | str:
+        """Create the exchange rates, or replace the rate of a pair on a date that already has one, in a single
+        database transaction.
+
+        Args:
+            rates: dicts with the rate_date, base_currency_id, quote_currency_id and rate of each exchange rate.
+
+        Returns:
+            int: the number of exchange rates written.
+            str: the error message, if the exchange rates failed to be written. Nothing is written in that case.
+        """
+        rates = list(rates)
+        statement = sqlite_insert(ExchangeRate)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ExchangeRate.base_currency_id, ExchangeRate.quote_currency_id, ExchangeRate.rate_date],
+            set_={"rate": statement.excluded.rate},
+        )
+        try:
+            if rates:
+                self.parent.session.execute(statement, rates)
+            self.parent.session.commit()
+            return len(rates)
+        except IntegrityError as integrity_error:
+            self.parent.session.rollback()
+            if "foreign key constraint" in str(integrity_error.orig).lower():
+                return "Either the base or the quote currency does not exist"
+            elif "check constraint" in str(integrity_error.orig).lower():
+                return "The exchange rates must be positive"
+            else:
+                return f"An IntegrityError occurred: {integrity_error}"
+
+    def read_exchange_rates(self) -> list:
+        """Return all the exchange rates as plain rows, in a single query.
+
+        Returns:
+            list: a (base currency id, quote currency id, rate date, rate) row for each exchange rate, ordered by
+                pair and date.
+        """
+        return self.parent.read_rows_basequery(
+            select(
+                ExchangeRate.base_currency_id, ExchangeRate.quote_currency_id, ExchangeRate.rate_date, ExchangeRate.rate
+            ).order_by(ExchangeRate.base_currency_id, ExchangeRate.quote_currency_id, ExchangeRate.rate_date)
+        )
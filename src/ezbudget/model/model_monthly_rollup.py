@@ -0,0 +1,122 @@
+from sqlalchemy import delete, func, insert, select
+
+from ezbudget.model import Account, MonthlyRollup, Transaction
+
+# The columns read_currency_totals can group the totals by.
+ROLLUP_GROUPS = {
+    "account_id": MonthlyRollup.account_id,
+    "income_id": MonthlyRollup.income_id,
+    "subcategory_id": MonthlyRollup.subcategory_id,
+    "transaction_type": MonthlyRollup.transaction_type,
+}
+
+
+class ModelMonthlyRollup:
+    def __init__(self, parent_model):
+        self.parent = parent_model
+
+    def read_subcategory_month_totals(self, user_id: int, first_month: str, last_month: str) -> list:
+        """Return the total of the user transactions per subcategory and month, over a range of months.
+
+        Args:
+            user_id: the user id.
+            first_month: the "YYYY-MM" key of the first month, inclusive.
+            last_month: the "YYYY-MM" key of the last month, inclusive.
+
+        Returns:
+            list: a (subcategory id, month, total in cents) row for each subcategory and month with transactions.
+        """
+        return self.parent.read_rows_basequery(
+            select(MonthlyRollup.subcategory_id, MonthlyRollup.month, func.sum(MonthlyRollup.total))
+            .where(
+                MonthlyRollup.user_id == user_id,
+                MonthlyRollup.month >= first_month,
+                MonthlyRollup.month <= last_month,
+                MonthlyRollup.subcategory_id.is_not(None),
+            )
+            .group_by(MonthlyRollup.subcategory_id, MonthlyRollup.month)
+        )
+
+    def read_currency_totals(self, user_id: int, first_month: str, last_month: str, group_by: str) -> list:
+        """Return the total of the user transactions per group, month and currency, over a range of months, so the
+        totals can be converted from each currency before they are added.
+
+        Args:
+            user_id: the user id.
+            first_month: the "YYYY-MM" key of the first month, inclusive.
+            last_month: the "YYYY-MM" key of the last month, inclusive.
+            group_by: a ROLLUP_GROUPS key, the column of the groups.
+
+        Returns:
+            list: a (group, month, currency id, total in cents) row for each group, month and currency with
+                transactions.
+            str: the error message, if the group is not valid.
+        """
+        if group_by not in ROLLUP_GROUPS:
+            return f"Unknown rollup group: {group_by}"
+        group = ROLLUP_GROUPS[group_by]
+        return self.parent.read_rows_basequery(
+            select(group, MonthlyRollup.month, MonthlyRollup.currency_id, func.sum(MonthlyRollup.total))
+            .where(
+                MonthlyRollup.user_id == user_id,
+                MonthlyRollup.month >= first_month,
+                MonthlyRollup.month <= last_month,
+            )
+            .group_by(group, MonthlyRollup.month, MonthlyRollup.currency_id)
+        )
+
+    def read_subcategory_accounts(self, user_id: int) -> dict:
+        """Return the account most of the user transactions of each subcategory were made from.
+
+        Args:
+            user_id: the user id.
+
+        Returns:
+            dict: the account id of each subcategory with transactions, the lowest account id on a tie.
+        """
+        count = func.sum(MonthlyRollup.count)
+        rows = self.parent.read_rows_basequery(
+            select(MonthlyRollup.subcategory_id, MonthlyRollup.account_id)
+            .where(MonthlyRollup.user_id == user_id, MonthlyRollup.subcategory_id.is_not(None))
+            .group_by(MonthlyRollup.subcategory_id, MonthlyRollup.account_id)
+            .order_by(MonthlyRollup.subcategory_id, count, MonthlyRollup.account_id.desc())
+        )
+        # the rows of each subcategory go up to its most used account, so it is the one left in the dict
+        return {subcategory_id: account_id for subcategory_id, account_id in rows}
+
+    def rebuild_rollups(self) -> int:
+        """Rebuild the monthly rollups from the transactions, to recover from rollups that went out of sync.
+
+        Returns:
+            int: the number of rollup rows.
+        """
+        key = (
+            Account.user_id,
+            func.substr(Transaction.date, 1, 7),
+            Transaction.account_id,
+            Transaction.transaction_type,
+            Transaction.currency_id,
+            Transaction.subcategory_id,
+            Transaction.income_id,
+        )
+        self.parent.session.execute(delete(MonthlyRollup))
+        self.parent.session.execute(
+            insert(MonthlyRollup).from_select(
+                [
+                    "user_id",
+                    "month",
+                    "account_id",
+                    "transaction_type",
+                    "currency_id",
+                    "subcategory_id",
+                    "income_id",
+                    "total",
+                    "count",
+                ],
+                select(*key, func.sum(Transaction.value), func.count())
+                .join(Account, Transaction.account_id == Account.id)
+                .group_by(*key),
+            )
+        )
+        self.parent.session.commit()
+        return self.parent.session.scalar(select(func.count()).select_from(MonthlyRollup))
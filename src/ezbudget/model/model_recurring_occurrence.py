@@ -0,0 +1,95 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from ezbudget.model import RecurringOccurrence, RecurringRun, Transaction
+
+
+class ModelRecurringOccurrence:
+    def __init__(self, parent_model):
+        self.parent = parent_model
+
+    def read_last_run(self, user_id: int) -> datetime | None:
+        """Return the last day the recurring transactions of the user were created up to.
+
+        Args:
+            user_id: the user id.
+
+        Returns:
+            datetime: the day of the last run.
+            None: if they were never created.
+        """
+        return self.parent.session.scalar(select(RecurringRun.last_run).where(RecurringRun.user_id == user_id))
+
+    def read_occurrence_keys(self, user_id: int, start: datetime, end: datetime) -> set:
+        """Return the keys of the occurrences of the user already created in a date range.
+
+        Args:
+            user_id: the user id.
+            start: the first day, inclusive.
+            end: the last day, inclusive.
+
+        Returns:
+            set: an (income id, subcategory id, occurrence date) tuple for each occurrence.
+        """
+        rows = self.parent.read_rows_basequery(
+            select(
+                RecurringOccurrence.income_id,
+                RecurringOccurrence.subcategory_id,
+                RecurringOccurrence.occurrence_date,
+            ).where(
+                RecurringOccurrence.user_id == user_id,
+                RecurringOccurrence.occurrence_date >= start,
+                RecurringOccurrence.occurrence_date <= end,
+            )
+        )
+        return {tuple(row) for row in rows}
+
+    def create_occurrences(self, user_id: int, transactions: list[dict], last_run: datetime) -> list[int] | str:
+        """Create the transactions of recurrence occurrences and record the run, in a single database transaction.
+
+        Each transaction is recorded as an occurrence of its income or subcategory on its date, so a transaction
+        that was already created makes the whole batch fail instead of being created twice.
+
+        Args:
+            user_id: the user id.
+            transactions: the transactions, as dicts with the create_transaction arguments as keys.
+            last_run: the last day the occurrences were created up to.
+
+        Returns:
+            list: the ids of the new transactions, in the order of the transactions.
+            str: the error message, if the transactions failed to be created.
+        """
+        try:
+            transaction_ids = []
+            if transactions:
+                transaction_ids = self.parent.session.scalars(
+                    insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True), transactions
+                ).all()
+                self.parent.session.execute(
+                    insert(RecurringOccurrence),
+                    [
+                        {
+                            "user_id": user_id,
+                            "occurrence_date": transaction["date"],
+                            "income_id": transaction.get("income_id"),
+                            "subcategory_id": transaction.get("subcategory_id"),
+                            "transaction_id": transaction_id,
+                        }
+                        for transaction, transaction_id in zip(transactions, transaction_ids)
+                    ],
+                )
+            self.parent.session.execute(
+                sqlite_insert(RecurringRun)
+                .values(user_id=user_id, last_run=last_run)
+                .on_conflict_do_update(index_elements=[RecurringRun.user_id], set_={"last_run": last_run})
+            )
+            self.parent.session.commit()
+            return transaction_ids
+        except IntegrityError as integrity_error:
+            self.parent.session.rollback()
+            if "unique constraint" in str(integrity_error.orig).lower():
+                return "Some of the recurring transactions were already created"
+            return f"An IntegrityError occurred: {integrity_error}"
@@ -2,7 +2,7 @@ from sqlalchemy import and_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.exc import NoResultFound
 
-from ezbudget.model import RecurrenceEnum, SubCategory
+from ezbudget.model import Category, RecurrenceEnum, SubCategory
 
 
 class ModelSubCategory:
@@ -109,6 +109,18 @@ class ModelSubCategory:
         """
         return self.parent.read_all_basequery(select(SubCategory))
 
+    def read_subcategory_names(self) -> list:
+        """Return the category name, subcategory name and subcategory id of all subcategories, in a single query.
+
+        Returns:
+            list: a (category name, subcategory name, subcategory id) row for each subcategory.
+        """
+        return self.parent.read_rows_basequery(
+            select(Category.name, SubCategory.name, SubCategory.id).join(
+                Category, SubCategory.category_id == Category.id
+            )
+        )
+
     def update_subcategory(self, subcategory: SubCategory) -> SubCategory | None:
         """Update a subcategory in the database, and return the subcategory.
 
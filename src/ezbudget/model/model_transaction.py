@@ -1,11 +1,92 @@
+import re
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
+from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import column, insert, or_, select, table, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.exc import NoResultFound
 
-from ezbudget.model import Transaction, TransactionTypeEnum
+from ezbudget.model import Account, SubCategory, Transaction, TransactionTypeEnum
+from ezbudget.model.search_triggers import TRANSACTIONS_FTS
+
+# Field order of the tuples accepted by create_transactions_bulk, the same as the create_transaction arguments.
+BULK_TRANSACTION_FIELDS = (
+    "account_id",
+    "date",
+    "transaction_type",
+    "value",
+    "currency_id",
+    "subcategory_id",
+    "income_id",
+    "description",
+    "target_account_id",
+)
+
+
+# Column and direction of each query_transactions order, True for descending. The ties are ordered by id.
+TRANSACTION_ORDERS = {
+    "date_desc": (Transaction.date, True),
+    "date_asc": (Transaction.date, False),
+    "value_desc": (Transaction.value, True),
+    "value_asc": (Transaction.value, False),
+}
+
+
+@dataclass(frozen=True)
+class TransactionFilters:
+    """Filters of ModelTransaction.query_transactions, the fields left as None or empty don't filter.
+
+    Attributes:
+        start: the first date, inclusive.
+        end: the last date, exclusive.
+        account_ids: the accounts of the transactions.
+        subcategory_ids: the subcategories of the transactions, together with the incomes in income_ids.
+        income_ids: the incomes of the transactions, together with the subcategories in subcategory_ids.
+        transaction_types: the TransactionTypeEnum of the transactions.
+        min_value: the minimum value in cents, inclusive.
+        max_value: the maximum value in cents, inclusive.
+        description: a text the description contains, ignoring the case.
+        transaction_ids: the ids of the transactions.
+    """
+
+    start: datetime = None
+    end: datetime = None
+    account_ids: tuple = ()
+    subcategory_ids: tuple = ()
+    income_ids: tuple = ()
+    transaction_types: tuple = ()
+    min_value: int = None
+    max_value: int = None
+    description: str = None
+    transaction_ids: tuple = ()
+
+
+# The FTS5 index of the transaction descriptions, kept in sync by the search triggers. It isn't a mapped table, the
+# column with the table name is the FTS5 hidden column that takes the MATCH queries and the index commands.
+transactions_fts = table(TRANSACTIONS_FTS, column("rowid"), column("rank"), column(TRANSACTIONS_FTS))
+
+
+def search_terms(text: str) -> str:
+    """Return the FTS5 query that matches the descriptions with words starting with each word of a text.
+
+    The words are quoted, so the FTS5 operators and punctuation in the text are searched as plain text.
+
+    Args:
+        text: the text typed by the user.
+
+    Returns:
+        str: the FTS5 query, empty if the text has no words.
+    """
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+
+def transaction_cursor(transaction: Transaction, order: str = "date_desc") -> tuple:
+    """Return the cursor of a transaction, to read the query_transactions page that comes after it."""
+    column, _ = TRANSACTION_ORDERS[order]
+    return getattr(transaction, column.key), transaction.id
 
 
 class ModelTransaction:
@@ -65,6 +146,47 @@ class ModelTransaction:
             self.parent.session.rollback()
             return f"A LookupError occurred: {lookup_error}"
 
+    def create_transactions_bulk(self, rows: Iterable[dict | tuple], chunk_size: int = 500) -> list[int] | str:
+        """Create many transactions in a single database transaction, and return the new transaction ids.
+
+        The rows are inserted chunk_size at a time with executemany, and the account balances are adjusted by the
+        transactions balance triggers in the same database transaction. Nothing is written if any row fails.
+
+        Args:
+            rows: the transactions, as dicts with the create_transaction arguments as keys, or as tuples with the
+                values in BULK_TRANSACTION_FIELDS order, where the trailing optional fields can be left out.
+            chunk_size: the number of rows sent to the database in each executemany.
+
+        Returns:
+            list: the ids of the new transactions, in the order of the rows.
+            str: the error message, if the transactions failed to be created.
+        """
+        rows = iter(rows)
+        statement = insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True)
+        transaction_ids = []
+        try:
+            while chunk := [self._bulk_row(row) for row in islice(rows, chunk_size)]:
+                transaction_ids.extend(self.parent.session.scalars(statement, chunk).all())
+            self.parent.session.commit()
+            return transaction_ids
+        except IntegrityError as integrity_error:
+            self.parent.session.rollback()
+            if "foreign key constraint" in str(integrity_error.orig).lower():
+                return "Either Account ID or SubCategory ID does not exist"
+            else:
+                return f"An IntegrityError occurred: {integrity_error}"
+        except (LookupError, TypeError, ValueError) as row_error:
+            self.parent.session.rollback()
+            return f"A {type(row_error).__name__} occurred: {row_error}"
+
+    @staticmethod
+    def _bulk_row(row: dict | tuple) -> dict:
+        if isinstance(row, dict):
+            return {field: row.get(field) for field in BULK_TRANSACTION_FIELDS} | row
+        if len(row) > len(BULK_TRANSACTION_FIELDS):
+            raise TypeError(f"expected at most {len(BULK_TRANSACTION_FIELDS)} fields, got {len(row)}")
+        return dict(zip(BULK_TRANSACTION_FIELDS, row)) | {field: None for field in BULK_TRANSACTION_FIELDS[len(row) :]}
+
     def read_transaction_by_id(self, transaction_id: int) -> Transaction | None:
         """Return a transaction object that has the given id.
 
@@ -95,6 +217,146 @@ class ModelTransaction:
         except NoResultFound:
             return None
 
+    def read_transaction_page(self, user_id: int, after: tuple[datetime, int] = None, limit: int = 200) -> list:
+        """Return a page of the user transactions, from the most recent, with the relationships shown in the
+        transactions table already loaded.
+
+        Args:
+            user_id: the user id.
+            after: the (date, id) of the last transaction of the previous page, None for the first page.
+            limit: the maximum number of transactions in the page.
+
+        Returns:
+            list: the transactions of the page, empty after the last page.
+        """
+        return self.query_transactions(user_id=user_id, order="date_desc", after_cursor=after, limit=limit)
+
+    def query_transactions(
+        self,
+        user_id: int,
+        filters: TransactionFilters | dict = None,
+        order: str = "date_desc",
+        after_cursor: tuple = None,
+        limit: int = 200,
+    ) -> list | str:
+        """Return a page of the user transactions that match the filters, with the relationships shown in the
+        transactions table already loaded.
+
+        The pages use keyset pagination on the order column and the id, so reading a page doesn't depend on how many
+        transactions come before it. The user accounts are matched without their index ("+ 0"), so SQLite reads the
+        transactions from the index of the most selective filter, or in order from the date or value index and stops
+        after limit rows.
+
+        Args:
+            user_id: the user id.
+            filters: the TransactionFilters, or a dict with its fields.
+            order: a TRANSACTION_ORDERS key.
+            after_cursor: the transaction_cursor of the last transaction of the previous page, None for the first page.
+            limit: the maximum number of transactions in the page.
+
+        Returns:
+            list: the transactions of the page, empty after the last page.
+            str: the error message, if the order or the filters are not valid.
+        """
+        if order not in TRANSACTION_ORDERS:
+            return f"Unknown transaction order: {order}"
+        try:
+            if isinstance(filters, dict):
+                filters = TransactionFilters(**filters)
+        except TypeError as filters_error:
+            return f"Invalid transaction filters: {filters_error}"
+        column, descending = TRANSACTION_ORDERS[order]
+
+        query = (
+            select(Transaction)
+            .options(
+                joinedload(Transaction.account),
+                joinedload(Transaction.subcategory).joinedload(SubCategory.category),
+                joinedload(Transaction.income),
+            )
+            .where((Transaction.account_id + 0).in_(select(Account.id).where(Account.user_id == user_id)))
+            .order_by(*((column.desc(), Transaction.id.desc()) if descending else (column, Transaction.id)))
+            .limit(limit)
+        )
+        if filters is not None:
+            query = query.where(*self._filter_conditions(filters))
+        if after_cursor is not None:
+            key = tuple_(column, Transaction.id)
+            query = query.where(key < tuple_(*after_cursor) if descending else key > tuple_(*after_cursor))
+        return self.parent.read_all_basequery(query)
+
+    @staticmethod
+    def _filter_conditions(filters: TransactionFilters) -> list:
+        conditions = []
+        if filters.start is not None:
+            conditions.append(Transaction.date >= filters.start)
+        if filters.end is not None:
+            conditions.append(Transaction.date < filters.end)
+        if filters.account_ids:
+            conditions.append(Transaction.account_id.in_(filters.account_ids))
+        if filters.subcategory_ids and filters.income_ids:
+            conditions.append(
+                or_(
+                    Transaction.subcategory_id.in_(filters.subcategory_ids),
+                    Transaction.income_id.in_(filters.income_ids),
+                )
+            )
+        elif filters.subcategory_ids:
+            conditions.append(Transaction.subcategory_id.in_(filters.subcategory_ids))
+        elif filters.income_ids:
+            conditions.append(Transaction.income_id.in_(filters.income_ids))
+        if filters.transaction_types:
+            conditions.append(Transaction.transaction_type.in_(filters.transaction_types))
+        if filters.min_value is not None:
+            conditions.append(Transaction.value >= filters.min_value)
+        if filters.max_value is not None:
+            conditions.append(Transaction.value <= filters.max_value)
+        if filters.description:
+            conditions.append(Transaction.description.icontains(filters.description, autoescape=True))
+        if filters.transaction_ids:
+            conditions.append(Transaction.id.in_(filters.transaction_ids))
+        return conditions
+
+    def search(self, user_id: int, query: str, limit: int = 50, candidates: int = 1000) -> list[int]:
+        """Return the ids of the user transactions whose description matches a text, the best matches first.
+
+        Every word of the text must start a word of the description, ignoring the case and the accents. The matches
+        come from the FTS5 index of the descriptions, which reads them from the most recent without sorting, and only
+        the most recent candidates are ranked by bm25. Ranking every match of a common word would cost hundreds of
+        milliseconds on a million transactions, while the newest matches are the ones the user looks for.
+
+        Args:
+            user_id: the user id.
+            query: the text to search, see search_terms.
+            limit: the maximum number of ids.
+            candidates: the number of most recent matches that are ranked.
+
+        Returns:
+            list: the ids of the matching transactions, empty if the text has no words.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+        matches = (
+            select(transactions_fts.c.rowid, transactions_fts.c.rank)
+            .join(Transaction, Transaction.id == transactions_fts.c.rowid)
+            .where(
+                transactions_fts.c[TRANSACTIONS_FTS].op("MATCH")(terms),
+                (Transaction.account_id + 0).in_(select(Account.id).where(Account.user_id == user_id)),
+            )
+            .order_by(transactions_fts.c.rowid.desc())
+            .limit(candidates)
+            .subquery()
+        )
+        return self.parent.read_all_basequery(
+            select(matches.c.rowid).order_by(matches.c.rank, matches.c.rowid.desc()).limit(limit)
+        )
+
+    def rebuild_search_index(self) -> None:
+        """Rebuild the search index from the transaction descriptions, to recover from an index out of sync."""
+        self.parent.session.execute(insert(transactions_fts).values({TRANSACTIONS_FTS: "rebuild"}))
+        self.parent.session.commit()
+
     def read_transaction_list_by_account(self, account_id: int) -> list:
         """Return a list of transactions objects that has the given account_id.
 
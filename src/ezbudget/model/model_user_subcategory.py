@@ -1,8 +1,9 @@
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.exc import NoResultFound
 
-from ezbudget.model import UserSubCategory
+from ezbudget.model import Category, MonthlyRollup, SubCategory, UserSubCategory
 
 
 class ModelUserSubCategory:
@@ -90,6 +91,57 @@ class ModelUserSubCategory:
         """
         return self.parent.read_all_basequery(select(UserSubCategory).where(UserSubCategory.user_id == user_id))
 
+    def read_user_subcategories_with_month_totals(self, user_id: int, month: str) -> list:
+        """Return the user subcategories together with the total of the user transactions in a month.
+
+        The totals come from the monthly rollups of the month, so they are read with an index lookup whatever the
+        number of transactions.
+
+        Args:
+            user_id: the user to filter the list
+            month: the "YYYY-MM" key of the month.
+
+        Returns:
+            list: a list of (UserSubCategory, total in cents) rows for the given user id.
+        """
+        totals = (
+            select(MonthlyRollup.subcategory_id, func.sum(MonthlyRollup.total).label("total"))
+            .where(MonthlyRollup.user_id == user_id, MonthlyRollup.month == month)
+            .group_by(MonthlyRollup.subcategory_id)
+            .subquery()
+        )
+        return self.parent.read_rows_basequery(
+            select(UserSubCategory, func.coalesce(totals.c.total, 0))
+            .outerjoin(totals, totals.c.subcategory_id == UserSubCategory.subcategory_id)
+            .options(joinedload(UserSubCategory.subcategory).joinedload(SubCategory.category))
+            .where(UserSubCategory.user_id == user_id)
+        )
+
+    def read_user_subcategory_recurrences(self, user_id: int) -> list:
+        """Return the names and recurrences of the user subcategories as plain rows, in a single query.
+
+        Args:
+            user_id: the user to filter the list
+
+        Returns:
+            list: a (subcategory id, category name, subcategory name, recurrent, recurrence, recurrence value) row
+                for each user subcategory, ordered by category and subcategory name.
+        """
+        return self.parent.read_rows_basequery(
+            select(
+                SubCategory.id,
+                Category.name,
+                SubCategory.name,
+                SubCategory.recurrent,
+                SubCategory.recurrence,
+                SubCategory.recurrence_value,
+            )
+            .join(UserSubCategory, UserSubCategory.subcategory_id == SubCategory.id)
+            .join(Category, SubCategory.category_id == Category.id)
+            .where(UserSubCategory.user_id == user_id)
+            .order_by(Category.name, SubCategory.name)
+        )
+
     def delete_user_subcategory(self, user_id: int, subcategory_id: int) -> int:
         """Removes a user subcategory relationship for a given id.
 
@@ -0,0 +1,54 @@
+# The monthly rollups are kept by SQLite triggers on the transactions table, in the same statement as every
+# transaction write, like the account balances.
+#
+# A rollup row is the total and the number of the transactions of a user in a month, for one account, subcategory
+# or income, transaction type and currency. The month is "YYYY-MM", the start of the stored transaction date. The row is
+# created by the first transaction of its key and deleted with the last one. ModelMonthlyRollup.rebuild_rollups
+# uses the same key.
+
+
+def _rollup_key(row: str) -> str:
+    # the same expressions as the ux_monthly_rollups_key index, so the row is found with a single index lookup
+    return f"""user_id = (SELECT user_id FROM accounts WHERE id = {row}.account_id)
+        AND month = substr({row}.date, 1, 7)
+        AND account_id = {row}.account_id
+        AND transaction_type = {row}.transaction_type
+        AND currency_id = {row}.currency_id
+        AND ifnull(subcategory_id, 0) = ifnull({row}.subcategory_id, 0)
+        AND ifnull(income_id, 0) = ifnull({row}.income_id, 0)"""
+
+
+def _rollup_add(row: str) -> str:
+    return f"""
+    INSERT OR IGNORE INTO monthly_rollups
+        (user_id, month, account_id, transaction_type, currency_id, subcategory_id, income_id, total, count)
+    SELECT user_id, substr({row}.date, 1, 7), {row}.account_id, {row}.transaction_type, {row}.currency_id,
+        {row}.subcategory_id, {row}.income_id, 0, 0
+    FROM accounts WHERE id = {row}.account_id;
+    UPDATE monthly_rollups SET total = total + {row}.value, count = count + 1
+    WHERE {_rollup_key(row)};"""
+
+
+def _rollup_remove(row: str) -> str:
+    return f"""
+    UPDATE monthly_rollups SET total = total - {row}.value, count = count - 1
+    WHERE {_rollup_key(row)};
+    DELETE FROM monthly_rollups
+    WHERE count = 0 AND {_rollup_key(row)};"""
+
+
+ROLLUP_TRIGGERS = {
+    "trg_transactions_rollup_insert": f"""
+CREATE TRIGGER trg_transactions_rollup_insert AFTER INSERT ON transactions
+BEGIN{_rollup_add("NEW")}
+END""",
+    "trg_transactions_rollup_update": f"""
+CREATE TRIGGER trg_transactions_rollup_update
+AFTER UPDATE OF account_id, date, transaction_type, currency_id, value, subcategory_id, income_id ON transactions
+BEGIN{_rollup_remove("OLD")}{_rollup_add("NEW")}
+END""",
+    "trg_transactions_rollup_delete": f"""
+CREATE TRIGGER trg_transactions_rollup_delete AFTER DELETE ON transactions
+BEGIN{_rollup_remove("OLD")}
+END""",
+}
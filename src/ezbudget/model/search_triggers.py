@@ -0,0 +1,39 @@
+# The transaction descriptions are indexed by an FTS5 table with the transactions as external content, so the text
+# is stored once. SQLite triggers on the transactions table keep the index in sync with every transaction write, in
+# the same statement, like the account balances and the monthly rollups. The index row of a transaction has the
+# transaction id as rowid. ModelTransaction.rebuild_search_index rebuilds it from the transactions.
+
+TRANSACTIONS_FTS = "transactions_fts"
+
+CREATE_TRANSACTIONS_FTS = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {TRANSACTIONS_FTS} USING fts5(
+    description, content='transactions', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+)"""
+
+DROP_TRANSACTIONS_FTS = f"DROP TABLE IF EXISTS {TRANSACTIONS_FTS}"
+
+
+def _search_add(row: str) -> str:
+    return f"""
+    INSERT INTO {TRANSACTIONS_FTS} (rowid, description) VALUES ({row}.id, {row}.description);"""
+
+
+def _search_remove(row: str) -> str:
+    return f"""
+    INSERT INTO {TRANSACTIONS_FTS} ({TRANSACTIONS_FTS}, rowid, description) VALUES ('delete', {row}.id, {row}.description);"""
+
+
+SEARCH_TRIGGERS = {
+    "trg_transactions_search_insert": f"""
+CREATE TRIGGER trg_transactions_search_insert AFTER INSERT ON transactions
+BEGIN{_search_add("NEW")}
+END""",
+    "trg_transactions_search_update": f"""
+CREATE TRIGGER trg_transactions_search_update AFTER UPDATE OF description ON transactions
+BEGIN{_search_remove("OLD")}{_search_add("NEW")}
+END""",
+    "trg_transactions_search_delete": f"""
+CREATE TRIGGER trg_transactions_search_delete AFTER DELETE ON transactions
+BEGIN{_search_remove("OLD")}
+END""",
+}
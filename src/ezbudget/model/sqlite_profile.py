@@ -0,0 +1,69 @@
+from dataclasses import dataclass, replace
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """PRAGMA settings applied to every new SQLite connection of the model engine.
+
+    Attributes:
+        journal_mode: DELETE keeps a rollback journal, WAL appends to a write-ahead log and lets readers run
+            while a write is in progress.
+        synchronous: FULL syncs on every commit, NORMAL only syncs on WAL checkpoints, OFF never syncs.
+        cache_size: page cache size, in pages if positive or in KiB if negative.
+        mmap_size: bytes of the database file read through memory mapping, 0 to disable it.
+        temp_store: DEFAULT, FILE or MEMORY, where temporary tables and indexes are kept.
+    """
+
+    journal_mode: str
+    synchronous: str
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+
+    def pragmas(self) -> list[str]:
+        """Return the PRAGMA statements that apply the profile."""
+        return [
+            f"PRAGMA journal_mode={self.journal_mode};",
+            f"PRAGMA synchronous={self.synchronous};",
+            f"PRAGMA cache_size={self.cache_size};",
+            f"PRAGMA mmap_size={self.mmap_size};",
+            f"PRAGMA temp_store={self.temp_store};",
+        ]
+
+
+# durable: the SQLite defaults, every commit is synced to disk before it returns.
+# balanced: WAL journal synced at checkpoints, a committed transaction can only be lost on a power failure,
+#   never on an application crash, and the database is never corrupted. Used by the application.
+# bulk_load: no syncs at all, for imports and benchmarks that can be re-run if the machine goes down.
+PROFILES = {
+    "durable": SQLiteProfile(
+        journal_mode="DELETE", synchronous="FULL", cache_size=-2000, mmap_size=0, temp_store="DEFAULT"
+    ),
+    "balanced": SQLiteProfile(
+        journal_mode="WAL", synchronous="NORMAL", cache_size=-64000, mmap_size=268435456, temp_store="MEMORY"
+    ),
+    "bulk_load": SQLiteProfile(
+        journal_mode="WAL", synchronous="OFF", cache_size=-256000, mmap_size=1073741824, temp_store="MEMORY"
+    ),
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def get_profile(profile: str | dict | SQLiteProfile | None = None) -> SQLiteProfile:
+    """Return the SQLite profile for a preset name, a configuration table or a profile.
+
+    Args:
+        profile: a preset name from PROFILES, a dict like the database.toml file, with an optional "profile" preset
+            name and any pragma to override, or a SQLiteProfile. None returns the default profile.
+
+    Returns:
+        SQLiteProfile: the profile to apply.
+    """
+    if isinstance(profile, SQLiteProfile):
+        return profile
+    if profile is None or isinstance(profile, str):
+        return PROFILES[profile or DEFAULT_PROFILE]
+
+    overrides = {key: value for key, value in profile.items() if key != "profile"}
+    return replace(PROFILES[profile.get("profile", DEFAULT_PROFILE)], **overrides)
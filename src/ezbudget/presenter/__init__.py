@@ -1 +1,2 @@
+from .instrumentation import CallTrace, QueryTracer
 from .presenter import ModelProtocol, Presenter, ViewProtocol
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+from itertools import count
+from typing import Callable, ContextManager
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+logger = logging.getLogger(__name__)
+
+
+class RequestSignals(QObject):
+    """Signals of a request, emitted from the worker thread and delivered in the thread of the dispatcher."""
+
+    done = Signal(int, object, object)
+
+
+class Request(QRunnable):
+    """A function call run by a worker thread of the dispatcher pool.
+
+    Args:
+        request_id: the id given by the dispatcher.
+        function: the function to call, it must not touch ORM objects loaded by another thread.
+        args: positional arguments of the function.
+        kwargs: keyword arguments of the function.
+        unit_of_work: returns the context manager the function runs in, giving it its own database session.
+    """
+
+    def __init__(self, request_id: int, function: Callable, args: tuple, kwargs: dict, unit_of_work: Callable):
+        super().__init__()
+        # the dispatcher keeps the request alive until its result is delivered, so it can be taken back from the pool
+        self.setAutoDelete(False)
+        self.request_id = request_id
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.unit_of_work = unit_of_work
+        self.channel = None
+        self.on_result = None
+        self.on_error = None
+        self.cancelled = False
+        self.signals = RequestSignals()
+
+    def run(self) -> None:
+        result, error = None, None
+        if not self.cancelled:
+            try:
+                with self.unit_of_work():
+                    result = self.function(*self.args, **self.kwargs)
+            except Exception as exception:
+                # logged here, where the traceback is still available
+                logger.exception("The request %d failed", self.request_id)
+                error = f"A {type(exception).__name__} occurred: {exception}"
+        self.signals.done.emit(self.request_id, result, error)
+
+
+class Dispatcher(QObject):
+    """Run functions on a pool of worker threads and deliver their results back in the thread of the dispatcher.
+
+    Every request belongs to a channel, like "monthly_budget.summary". A channel only has one live request, submitting
+    a new one cancels the previous, as its result would be stale. Channels are grouped by the dots of their names, so
+    cancelling "monthly_budget" also cancels "monthly_budget.summary".
+
+    Args:
+        unit_of_work: returns the context manager every request runs in, like Model.unit_of_work.
+        max_threads: number of worker threads.
+    """
+
+    def __init__(self, unit_of_work: Callable[[], ContextManager], max_threads: int = 2):
+        super().__init__()
+        self.unit_of_work = unit_of_work
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._request_ids = count(1)
+        self._requests: dict[int, Request] = {}
+        self._channels: dict[str, Request] = {}
+
+    def submit(
+        self,
+        channel: str,
+        function: Callable,
+        *args,
+        on_result: Callable = None,
+        on_error: Callable[[str], None] = None,
+        **kwargs,
+    ) -> int:
+        """Run a function on a worker thread.
+
+        Args:
+            channel: the channel of the request, a pending request on the same channel is cancelled.
+            function: the function to call with args and kwargs.
+            on_result: called with the return value of the function, in the thread of the dispatcher.
+            on_error: called with the error message if the function raised. The error is logged either way.
+
+        Returns:
+            int: the id of the request.
+        """
+        self.cancel(channel)
+        request = Request(next(self._request_ids), function, args, kwargs, self.unit_of_work)
+        request.channel = channel
+        request.on_result = on_result
+        request.on_error = on_error
+        request.signals.done.connect(self._on_done)
+        self._requests[request.request_id] = request
+        self._channels[channel] = request
+        self.pool.start(request)
+        return request.request_id
+
+    def cancel(self, channel: str = "") -> int:
+        """Cancel the requests of a channel and of its sub channels.
+
+        A request that didn't start is taken out of the pool, one that is running finishes but its result is dropped.
+
+        Args:
+            channel: the channel to cancel, all the channels if empty.
+
+        Returns:
+            int: the number of requests cancelled.
+        """
+        channels = [name for name in self._channels if not channel or name == channel or name.startswith(f"{channel}.")]
+        for name in channels:
+            request = self._channels.pop(name)
+            request.cancelled = True
+            if self.pool.tryTake(request):
+                del self._requests[request.request_id]
+        return len(channels)
+
+    def is_pending(self, channel: str) -> bool:
+        """Return True if the channel has a request whose result wasn't delivered yet."""
+        return channel in self._channels
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until every worker thread is idle, the results are delivered by the next event loop iteration.
+
+        Args:
+            msecs: maximum time to wait, -1 to wait without a limit.
+
+        Returns:
+            bool: True if the pool is idle.
+        """
+        return self.pool.waitForDone(msecs)
+
+    @Slot(int, object, object)
+    def _on_done(self, request_id: int, result, error) -> None:
+        request = self._requests.pop(request_id, None)
+        if request is None or request.cancelled:
+            return
+        del self._channels[request.channel]
+        if error is not None:
+            if request.on_error is not None:
+                request.on_error(error)
+        elif request.on_result is not None:
+            request.on_result(result)
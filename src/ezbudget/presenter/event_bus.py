@@ -0,0 +1,26 @@
+from PySide6.QtCore import QObject, Signal
+
+
+class EventBus(QObject):
+    """Notifications shared by the homepage tabs, so a tab doesn't need the tabs it listens to to exist.
+
+    The tabs are built the first time they are shown. A tab publishes the changes of its own data, and a tab built later
+    subscribes when it is created, after loading the current data, so it never misses a change that matters to it.
+
+    Signals:
+        accounts_changed: an account was added.
+        balances_changed: the account balances were changed by transactions.
+        incomes_changed: an income source was added.
+        subcategories_changed: a subcategory was added or removed.
+        subcategories_reset: the categories and subcategories were loaded again.
+        user_subcategories_changed: a subcategory was added to or removed from the user categories.
+        transactions_changed: transactions were added, updated or removed.
+    """
+
+    accounts_changed = Signal()
+    balances_changed = Signal()
+    incomes_changed = Signal()
+    subcategories_changed = Signal()
+    subcategories_reset = Signal()
+    user_subcategories_changed = Signal()
+    transactions_changed = Signal()
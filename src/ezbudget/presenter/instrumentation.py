@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+
+
+@dataclass
+class CallTrace:
+    """The statements run by one traced call.
+
+    Attributes:
+        name: the name of the call, like "Presenter.get_month_summary".
+        thread: the name of the thread the call ran in.
+        statements: the number of statements run.
+        db_ms: the time spent executing the statements, in milliseconds.
+        call_ms: the duration of the call, in milliseconds.
+        rows: the number of rows returned by the ORM selects, lazy loads included.
+        slowest_sql: the statement that took the longest to execute.
+        slowest_ms: the time the slowest statement took, in milliseconds.
+        n_plus_one: the (statement, times) of the statements run at least n_plus_one times, the pattern of a query
+            per object of a list.
+    """
+
+    name: str
+    thread: str
+    statements: int = 0
+    db_ms: float = 0.0
+    call_ms: float = 0.0
+    rows: int = 0
+    slowest_sql: str = None
+    slowest_ms: float = 0.0
+    n_plus_one: list = field(default_factory=list)
+    sql_counts: Counter = field(default_factory=Counter, repr=False)
+
+    def to_dict(self) -> dict:
+        record = asdict(self)
+        del record["sql_counts"]
+        return record
+
+
+class QueryTracer:
+    """Trace the SQL statements each presenter call runs on the database of the model.
+
+    The tracer listens to the before_cursor_execute and after_cursor_execute events of the engine while it is enabled,
+    and to the do_orm_execute event of the session factories of the model to count the rows of the selects.
+    A statement is counted in the call traced in its thread, nested calls are counted in the outermost one, and the
+    statements run outside of a traced call are ignored. Each call is logged as a JSON line on the
+    "ezbudget.instrumentation" logger, at the WARNING level when a statement was repeated like in an N+1 pattern.
+
+    Args:
+        model: the application model.
+        n_plus_one: the number of times the same statement must run in a call to be reported as an N+1 pattern.
+        max_traces: the number of traces kept for the summary, the oldest are dropped.
+        logger: the logger the traces are written to, "ezbudget.instrumentation" if not given.
+    """
+
+    def __init__(self, model, n_plus_one: int = 5, max_traces: int = 10000, logger: logging.Logger = None) -> None:
+        self.engine = model.engine
+        self.session_factories = (model.session_local, model.unit_of_work_factory)
+        self.n_plus_one = n_plus_one
+        self.logger = logger or logging.getLogger("ezbudget.instrumentation")
+        self.traces = deque(maxlen=max_traces)
+        self.enabled = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        if not self.enabled:
+            event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(self.engine, "after_cursor_execute", self._after_cursor_execute)
+            for factory in self.session_factories:
+                event.listen(factory, "do_orm_execute", self._do_orm_execute)
+            self.enabled = True
+
+    def disable(self) -> None:
+        if self.enabled:
+            event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(self.engine, "after_cursor_execute", self._after_cursor_execute)
+            for factory in self.session_factories:
+                event.remove(factory, "do_orm_execute", self._do_orm_execute)
+            self.enabled = False
+
+    def _current(self) -> CallTrace | None:
+        return getattr(self._local, "trace", None)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        _ = conn, cursor, statement, parameters, context, executemany
+        # the statements of a thread run one at a time, so the start is kept for the thread
+        self._local.start = time.perf_counter() if self._current() is not None else None
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        _ = conn, cursor, parameters, context, executemany
+        trace = self._current()
+        start = getattr(self._local, "start", None)
+        if trace is None or start is None:
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        trace.statements += 1
+        trace.db_ms += elapsed
+        trace.sql_counts[statement] += 1
+        if elapsed >= trace.slowest_ms:
+            trace.slowest_sql, trace.slowest_ms = statement, elapsed
+
+    def _do_orm_execute(self, orm_execute_state):
+        trace = self._current()
+        if trace is None or not orm_execute_state.is_select:
+            return None
+        # the rows are fetched here to be counted, the caller gets a new result of the same rows
+        frozen = orm_execute_state.invoke_statement().freeze()
+        trace.rows += len(frozen.data)
+        return frozen()
+
+    @contextmanager
+    def trace(self, name: str) -> Iterator[CallTrace | None]:
+        """Trace the statements run in the block, in this thread.
+
+        Args:
+            name: the name of the traced call.
+
+        Returns:
+            CallTrace: the trace, filled when the block exits, or None in a nested block or while disabled.
+        """
+        if not self.enabled or self._current() is not None:
+            yield None
+            return
+        trace = CallTrace(name=name, thread=threading.current_thread().name)
+        self._local.trace = trace
+        start = time.perf_counter()
+        try:
+            yield trace
+        finally:
+            self._local.trace = None
+            trace.call_ms = (time.perf_counter() - start) * 1000
+            self._finish(trace)
+
+    def _finish(self, trace: CallTrace) -> None:
+        trace.n_plus_one = [
+            (statement, times) for statement, times in trace.sql_counts.most_common() if times >= self.n_plus_one
+        ]
+        with self._lock:
+            self.traces.append(trace)
+        record = json.dumps(trace.to_dict(), default=str)
+        if trace.n_plus_one:
+            self.logger.warning("N+1 queries in %s: %s", trace.name, record)
+        else:
+            self.logger.info("%s", record)
+
+    def instrument(self, target, prefix: str = None) -> None:
+        """Trace every call of the public methods of an object, like the presenter, by wrapping them on the instance.
+
+        The methods must be instrumented before they are connected to signals, a connection keeps the method it was
+        given.
+
+        Args:
+            target: the object to instrument.
+            prefix: the prefix of the trace names, the class name of the object if not given.
+        """
+        prefix = prefix or type(target).__name__
+        for name in dir(type(target)):
+            if name.startswith("_") or not callable(getattr(type(target), name)):
+                continue
+            setattr(target, name, self._wrap(getattr(target, name), f"{prefix}.{name}"))
+
+    def _wrap(self, method, name: str):
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            with self.trace(name):
+                return method(*args, **kwargs)
+
+        return traced
+
+    def summary(self) -> list[dict]:
+        """Return the totals of the traces of each call name, the calls with the most database time first."""
+        totals = {}
+        with self._lock:
+            traces = list(self.traces)
+        for trace in traces:
+            total = totals.setdefault(
+                trace.name,
+                {"name": trace.name, "calls": 0, "statements": 0, "db_ms": 0.0, "rows": 0, "n_plus_one": 0},
+            )
+            total["calls"] += 1
+            total["statements"] += trace.statements
+            total["db_ms"] += trace.db_ms
+            total["rows"] += trace.rows
+            total["n_plus_one"] += bool(trace.n_plus_one)
+        return sorted(totals.values(), key=lambda total: total["db_ms"], reverse=True)
+
+    def log_summary(self) -> None:
+        """Log the summary as a JSON line, on the logger of the traces."""
+        self.logger.info("%s", json.dumps({"summary": self.summary()}))
+
+    def format_summary(self) -> str:
+        """Return the summary as a text table, to dump on the console."""
+        lines = [f"{'call':48} {'calls':>6} {'statements':>10} {'db ms':>10} {'rows':>10} {'N+1':>5}"]
+        for total in self.summary():
+            lines.append(
+                f"{total['name']:48} {total['calls']:6} {total['statements']:10} {total['db_ms']:10.1f}"
+                f" {total['rows']:10} {total['n_plus_one']:5}"
+            )
+        return "\n".join(lines)
@@ -1,42 +1,74 @@
 from __future__ import annotations
 
-from calendar import isleap, monthcalendar, monthrange
-from datetime import datetime
+from datetime import date, datetime
 from typing import Protocol
 
+import numpy as np
 from cryptography.fernet import Fernet
 
+from ezbudget.analytics import (
+    BudgetReport,
+    CashFlowForecast,
+    ExchangeRateCache,
+    ForecastCache,
+    Recurrences,
+    build_budget_report,
+    month_span,
+)
+from ezbudget.importers import StatementImporter, import_exchange_rates
 from ezbudget.model import (
-    AccountTypeEnum,
     CategoryTypeEnum,
     RecurrenceEnum,
     TransactionTypeEnum,
 )
-from ezbudget.utils import get_hashed_password, verify_password
+from ezbudget.model.model_transaction import TransactionFilters
+from ezbudget.presenter.dispatcher import Dispatcher
+from ezbudget.presenter.event_bus import EventBus
+from ezbudget.presenter.reference_cache import ReferenceCache
+from ezbudget.scheduler import RecurringMaterializer
+from ezbudget.utils import (
+    get_hashed_password,
+    month_key,
+    read_user_settings,
+    verify_password,
+)
 
 
 class ModelProtocol(Protocol):
-    ...
+    """The application model the presenter reads and writes through."""
 
 
 class ViewProtocol(Protocol):
-    ...
+    """The main window the presenter shows its results in."""
 
 
 class Presenter:
-    def __init__(self, model: ModelProtocol) -> None:
+    def __init__(self, model: ModelProtocol, settings_dir: str = None) -> None:
         self.model = model
         self.view = None
+        # the folder of the user settings files, None to leave the settings out
+        self.settings_dir = settings_dir
 
         self.model_account = model.model_account
         self.model_category = model.model_category
         self.model_currency = model.model_currency
+        self.model_exchange_rate = model.model_exchange_rate
         self.model_income = model.model_income
+        self.model_monthly_rollup = model.model_monthly_rollup
+        self.model_recurring_occurrence = model.model_recurring_occurrence
         self.model_subcategory = model.model_subcategory
         self.model_transaction = model.model_transaction
         self.model_user_subcategory = model.model_user_subcategory
         self.model_user = model.model_user
 
+        self.dispatcher = Dispatcher(unit_of_work=model.unit_of_work)
+        self.event_bus = EventBus()
+        self.forecasts = ForecastCache(model)
+        self.references = ReferenceCache(model)
+        self.exchange_rates = ExchangeRateCache(model)
+        # the currency the totals are shown in, set from the user settings, None to add the values as they are
+        self.default_currency_id = None
+
     # user login and register
     def register(self, user_data) -> None:
         hashed_password = get_hashed_password(user_data["password"])
@@ -49,7 +81,8 @@ class Presenter:
             self.view.login_view.set_error(response)
             print(response)  # TODO replace this with the log
         else:
-            self.model.user = response
+            self.set_user(response)
+            self.materialize_recurring()
             self.view.show_homepage(response)
 
     def login(self, user_data) -> None:
@@ -62,9 +95,35 @@ class Presenter:
             if isinstance(check_password, str):
                 self.view.login_view.set_error(check_password)
             else:
-                self.model.user = response
+                self.set_user(response)
+                self.materialize_recurring()
                 self.view.show_homepage(response)
 
+    def set_user(self, user) -> None:
+        # detached, so the worker threads can read its columns without going through the main thread session
+        self.model.session.expunge(user)
+        self.model.user = user
+        self.load_user_settings()
+
+    def load_user_settings(self) -> None:
+        """Apply the saved settings of the user, so the totals use its default currency from the login on."""
+        if self.settings_dir is None:
+            return
+        self.set_default_currency(read_user_settings(self.settings_dir, self.model.user)["default_currency"])
+
+    # background requests
+    def run_async(self, channel: str, function, *args, on_result=None, on_error=None, **kwargs) -> int:
+        """Run a presenter read on a worker thread, on_result is called with its return value in the UI thread.
+
+        The function gets its own database session, so it must return plain values and not ORM objects that the view
+        would lazy load from. A pending request on the same channel is cancelled.
+        """
+        return self.dispatcher.submit(channel, function, *args, on_result=on_result, on_error=on_error, **kwargs)
+
+    def cancel_requests(self, channel: str = "") -> int:
+        """Cancel the pending requests of a channel and its sub channels, all of them if empty."""
+        return self.dispatcher.cancel(channel)
+
     # account related
     def create_account(self, account_data):
         account_data["name"] = self.check_mandatory_fields(account_data["name"])
@@ -86,7 +145,7 @@ class Presenter:
         return return_list
 
     def get_account_id_by_name(self, account_name):
-        return self.model_account.read_account_by_name(name=account_name).id
+        return self.references.get(self.model.user.id).account_id(account_name)
 
     def get_account_by_id(self, account_id):
         return self.model_account.read_account_by_id(id=account_id)
@@ -97,17 +156,19 @@ class Presenter:
                 self.model_account.read_accounts_by_user(user_id=self.model.user.id, account_type="DEBIT") or []
             )
             if len(user_accounts) > 0:
-                balance = 0
-                for account in user_accounts:
-                    balance += account.balance
-                return {"balance": balance, "user_accounts": user_accounts}
+                balances = self.to_default_currency(
+                    [account.balance for account in user_accounts],
+                    [account.currency_id for account in user_accounts],
+                    date.today(),
+                )
+                return {"balance": float(balances.sum()), "user_accounts": user_accounts}
             return {"balance": 0, "user_accounts": []}
 
     def get_accounts(self):
         return [account.name for account in self.model_account.read_accounts_by_user(user_id=self.model.user.id)]
 
     def update_accounts_from_transaction(self):
-        self.view.homepage_view.accounts.account_list_model.updateAccounts()
+        self.event_bus.balances_changed.emit()
         # TODO should we be updating the income since it is meant to be a prediction?
         # self.view.homepage_view.accounts.incoming_list_model.updateAccounts()
 
@@ -115,17 +176,16 @@ class Presenter:
         if self.model.user is not None:
             user_cards = self.model_account.read_accounts_by_user(user_id=self.model.user.id, account_type="CARD") or []
             if len(user_cards) > 0:
-                balance = 0
-                for card in user_cards:
-                    balance += card.balance
-                return {"balance": balance, "user_cards": user_cards}
+                balances = self.to_default_currency(
+                    [card.balance for card in user_cards], [card.currency_id for card in user_cards], date.today()
+                )
+                return {"balance": float(balances.sum()), "user_cards": user_cards}
             return {"balance": 0, "user_cards": []}
 
     # incoming related
     def create_income(self, income_data):
         income_data["name"] = self.check_mandatory_fields(income_data["name"])
-        account = self.model_account.read_account_by_name(name=income_data["account_name"])
-        income_data["account_id"] = account.id
+        income_data["account_id"] = self.get_account_id_by_name(income_data["account_name"])
         del income_data["account_name"]
         income_data["user_id"] = self.model.user.id
         income_data["income_date"] = datetime.strptime(income_data["income_date"], "%Y/%m/%d").date()
@@ -149,8 +209,7 @@ class Presenter:
     def create_subcategory(self, subcategory_data):
         category_name = subcategory_data["category_name"]
         subcategory_data["name"] = self.check_mandatory_fields(subcategory_data["name"])
-        category_id = self.model_category.read_category_by_name(category_name).id
-        subcategory_data["category_id"] = category_id
+        subcategory_data["category_id"] = self.get_category_id_by_name(category_name)
         del subcategory_data["category_name"]
         for recurrence in RecurrenceEnum:
             if recurrence.value == subcategory_data["recurrence"]:
@@ -179,7 +238,7 @@ class Presenter:
         return self.model_subcategory.read_subcategory_by_name(name=subcategory_name, category_id=category_id).id
 
     def get_category_id_by_name(self, category_name):
-        return self.model_category.read_category_by_name(category_name).id
+        return self.references.get(self.model.user.id).category_id(category_name)
 
     def update_category(self, category_id: int, category_data):
         category_to_update = self.model_category.read_category_by_id(category_id)
@@ -189,8 +248,7 @@ class Presenter:
 
     def update_subcategory(self, subcategory_id: int, subcategory_data):
         subcategory_to_update = self.model_subcategory.read_subcategory_by_id(subcategory_id)
-        category_id = self.model_category.read_category_by_name(subcategory_data["category_name"]).id
-        subcategory_to_update.category_id = category_id
+        subcategory_to_update.category_id = self.get_category_id_by_name(subcategory_data["category_name"])
         subcategory_to_update.name = subcategory_data["name"]
         subcategory_to_update.recurrent = subcategory_data["recurrent"]
         subcategory_to_update.recurrence = subcategory_data["recurrence"]
@@ -221,72 +279,53 @@ class Presenter:
         return self.model_user_subcategory.read_user_subcategories_by_user(user_id=self.model.user.id)
 
     def get_total_budgeted(self):
+        now = datetime.now()
+        months = month_span(month_key(now.year, now.month), month_key(now.year, now.month))
         user_subcategory_list = self.model_user_subcategory.read_user_subcategories_by_user(user_id=self.model.user.id)
         income_sources_list = self.model_income.read_incomes_by_user(user_id=self.model.user.id)
-        budgeted_income = 0
-        budgeted_expenses = 0
-        current_year = datetime.now().year
-        current_month = datetime.now().month
-        number_of_weeks = len(monthcalendar(current_year, current_month))
-        number_of_days = monthrange(current_year, current_month)[1]
-        for expense in user_subcategory_list:
-            if expense.subcategory.recurrent:
-                budgeted_expenses += self.monthly_recurrence_balance(
-                    expense.subcategory, number_of_days, number_of_weeks
-                )
-        for income in income_sources_list:
-            if income.recurrent:
-                budgeted_income += self.monthly_recurrence_balance(income, number_of_days, number_of_weeks)
+        expenses = Recurrences.from_objects(user_subcategory.subcategory for user_subcategory in user_subcategory_list)
+        incomes = Recurrences.from_objects(income_sources_list, anchor_attribute="income_date")
+        rate_day = self.rate_days(months)[0]
+        budgeted_income = self.to_default_currency(
+            incomes.monthly_budget(months)[:, 0], [income.currency_id for income in income_sources_list], rate_day
+        )
+        budgeted_expenses = self.to_default_currency(
+            expenses.monthly_budget(months)[:, 0],
+            [user_subcategory.subcategory.currency_id for user_subcategory in user_subcategory_list],
+            rate_day,
+        )
 
-        return {"budgeted_income": budgeted_income, "budgeted_expenses": budgeted_expenses}
+        return {
+            "budgeted_income": float(budgeted_income.sum()),
+            "budgeted_expenses": float(budgeted_expenses.sum()),
+        }
 
     def get_total_real(self):
-        transaction_list = self.model_transaction.read_transaction_list_by_user(user_id=self.model.user.id)
-        total_income = 0
-        total_expenses = 0
-        current_year = datetime.now().year
-        current_month = datetime.now().month
-        for x in transaction_list:
-            transaction_date: datetime = x.date
-            if transaction_date.year == current_year and transaction_date.month == current_month:
-                if x.transaction_type == TransactionTypeEnum.Income:
-                    total_income += x.value
-                if x.transaction_type == TransactionTypeEnum.Expense:
-                    total_expenses += x.value
-
-        return {"total_income": total_income, "total_expenses": total_expenses}
+        now = datetime.now()
+        month = month_key(now.year, now.month)
+        rows = self.model_monthly_rollup.read_currency_totals(
+            user_id=self.model.user.id, first_month=month, last_month=month, group_by="transaction_type"
+        )
+        transaction_types = [transaction_type for transaction_type, *_ in rows]
+        totals = self.to_default_currency(
+            [total for *_, total in rows], [currency_id for _, _, currency_id, _ in rows], now.date()
+        )
+
+        return {
+            "total_income": float(totals[[t == TransactionTypeEnum.Income for t in transaction_types]].sum()),
+            "total_expenses": float(totals[[t == TransactionTypeEnum.Expense for t in transaction_types]].sum()),
+        }
+
+    def get_month_totals(self) -> dict:
+        return {**self.get_total_budgeted(), **self.get_total_real()}
 
     # transaction related
     def create_transaction(self, transaction_data) -> None:
         """Create a transaction in Model, when activated in View."""
         updated_transaction = self.format_transaction_data(transaction_data)
 
-        # Create the transaction in the model
-        new_transaction = self.model_transaction.create_transaction(**updated_transaction)
-
-        if not isinstance(new_transaction, str):
-            account = self.model_account.read_account_by_id(new_transaction.account_id)
-            if new_transaction.transaction_type == TransactionTypeEnum.Income:
-                if account.account_type == AccountTypeEnum.CARD:
-                    if account.balance >= 0:
-                        account.balance -= new_transaction.value
-                    else:
-                        account.balance += new_transaction.value
-                elif account.account_type == AccountTypeEnum.DEBIT:
-                    account.balance += new_transaction.value
-            elif new_transaction.transaction_type == TransactionTypeEnum.Expense:
-                if account.account_type == AccountTypeEnum.CARD:
-                    account.balance += new_transaction.value
-                elif account.account_type == AccountTypeEnum.DEBIT:
-                    account.balance -= new_transaction.value
-            elif new_transaction.transaction_type == TransactionTypeEnum.Transfer:
-                transfer_account = self.model_account.read_account_by_id(new_transaction.target_account_id)
-                account.balance -= new_transaction.value
-                transfer_account.balance += new_transaction.value
-                self.model_account.update_account(transfer_account)
-            self.model_account.update_account(account)
-
-        return new_transaction
+        # Create the transaction in the model, the account balances are updated by the database
+        return self.model_transaction.create_transaction(**updated_transaction)
 
     def update_transaction(
         self,
@@ -297,140 +336,13 @@ class Presenter:
 
         # update the transaction from the model with the new values
         transaction_to_update = self.model_transaction.read_transaction_by_id(transaction_item.id())
-        previous_value: int = transaction_item._value
-        previous_account_id: int = transaction_item.account_id
-        previous_transaction_type: TransactionTypeEnum = transaction_item.transaction_type
         formatted_transaction_data = self.format_transaction_data(transaction_data)
 
         # we update the values on the transaction to update with the transaction data value
         for key, value in formatted_transaction_data.items():
             setattr(transaction_to_update, key, value)
 
-        # update the value in the accounts
-        previous_account = self.model_account.read_account_by_id(previous_account_id)
-        new_account = self.model_account.read_account_by_id(formatted_transaction_data["account_id"])
-
-        # accounting for a changed account on update
-        if previous_account.name != new_account.name:
-            # also updating the transaction type
-            if transaction_to_update.transaction_type != previous_transaction_type.name:
-                # changes to value based on transaction type
-                if transaction_to_update.transaction_type == "Income":
-                    if (
-                        previous_account.account_type == AccountTypeEnum.DEBIT
-                        and new_account.account_type == AccountTypeEnum.DEBIT
-                    ):
-                        previous_account.balance += previous_value
-                        new_account.balance += transaction_to_update.value
-                elif transaction_to_update.transaction_type == "Expense":
-                    if (
-                        previous_account.account_type == AccountTypeEnum.DEBIT
-                        and new_account.account_type == AccountTypeEnum.DEBIT
-                    ):
-                        previous_account.balance -= previous_value
-                        new_account.balance -= transaction_to_update.value
-            # just updating the values between accounts
-            else:
-                if transaction_to_update.transaction_type == "Income":
-                    if (
-                        previous_account.account_type == AccountTypeEnum.DEBIT
-                        and new_account.account_type == AccountTypeEnum.DEBIT
-                    ):
-                        previous_account.balance -= transaction_to_update.value
-                        new_account.balance += transaction_to_update.value
-                    elif (
-                        previous_account.account_type == AccountTypeEnum.CARD
-                        and new_account.account_type == AccountTypeEnum.DEBIT
-                    ):
-                        previous_account.balance += transaction_to_update.value
-                        new_account.balance += transaction_to_update.value
-                    elif (
-                        previous_account.account_type == AccountTypeEnum.DEBIT
-                        and new_account.account_type == AccountTypeEnum.CARD
-                    ):
-                        previous_account.balance -= transaction_to_update.value
-                        new_account.balance -= transaction_to_update.value
-                    elif (
-                        previous_account.account_type == AccountTypeEnum.CARD
-                        and new_account.account_type == AccountTypeEnum.CARD
-                    ):
-                        previous_account.balance += transaction_to_update.value
-                        new_account.balance -= transaction_to_update.value
-                elif transaction_to_update.transaction_type == "Expense":
-                    if (
-                        previous_account.account_type == AccountTypeEnum.DEBIT
-                        and new_account.account_type == AccountTypeEnum.DEBIT
-                    ):
-                        previous_account.balance += transaction_to_update.value
-                        new_account.balance -= transaction_to_update.value
-                    elif (
-                        previous_account.account_type == AccountTypeEnum.CARD
-                        and new_account.account_type == AccountTypeEnum.DEBIT
-                    ):
-                        previous_account.balance -= transaction_to_update.value
-                        new_account.balance -= transaction_to_update.value
-                    elif (
-                        previous_account.account_type == AccountTypeEnum.DEBIT
-                        and new_account.account_type == AccountTypeEnum.CARD
-                    ):
-                        previous_account.balance += transaction_to_update.value
-                        new_account.balance += transaction_to_update.value
-                    elif (
-                        previous_account.account_type == AccountTypeEnum.CARD
-                        and new_account.account_type == AccountTypeEnum.CARD
-                    ):
-                        previous_account.balance -= transaction_to_update.value
-                        new_account.balance += transaction_to_update.value
-        # same account
-        else:
-            difference = transaction_to_update.value - previous_value
-            # change in transaction type
-            if transaction_to_update.transaction_type != previous_transaction_type.name:
-                # changes to value based on transaction type
-                if transaction_to_update.transaction_type == "Income":
-                    if previous_account.account_type == AccountTypeEnum.DEBIT:
-                        previous_account.balance += previous_value
-                        previous_account.balance += transaction_to_update.value
-                    elif previous_account.account_type == AccountTypeEnum.CARD:
-                        previous_account.balance -= previous_value
-                        previous_account.balance -= transaction_to_update.value
-                elif transaction_to_update.transaction_type == "Expense":
-                    if previous_account.account_type == AccountTypeEnum.DEBIT:
-                        previous_account.balance -= previous_value
-                        previous_account.balance -= transaction_to_update.value
-                    elif previous_account.account_type == AccountTypeEnum.CARD:
-                        previous_account.balance += previous_value
-                        previous_account.balance += transaction_to_update.value
-            # same transaction type, only changing value
-            else:
-                if transaction_to_update.transaction_type == "Transfer":
-                    target_account = self.model_account.read_account_by_id(
-                        formatted_transaction_data["target_account_id"]
-                    )
-                    target_account.balance = (
-                        target_account.balance - abs(difference)
-                        if difference < 0
-                        else target_account.balance + abs(difference)
-                    )
-                    self.model_account.update_account(target_account)
-
-                if previous_account.account_type == AccountTypeEnum.DEBIT:
-                    previous_account.balance = (
-                        previous_account.balance + abs(difference)
-                        if difference < 0
-                        else previous_account.balance - abs(difference)
-                    )
-                elif previous_account.account_type == AccountTypeEnum.CARD:
-                    previous_account.balance = (
-                        previous_account.balance - abs(difference)
-                        if difference < 0
-                        else previous_account.balance + abs(difference)
-                    )
-
-        self.model_account.update_account(previous_account)
-        self.model_account.update_account(new_account)
-
-        # Send data to model process
+        # Send data to model process, the account balances are updated by the database
         self.model_transaction.update_transaction(transaction_to_update)
 
         # update views and their models
@@ -438,67 +350,163 @@ class Presenter:
 
         return transaction_to_update
 
+    def import_statement(self, file_path: str, account_name: str, default_category: str = None, progress=None):
+        """Import a bank statement file into the user transactions, when activated in View."""
+        importer = StatementImporter(self.model, self.model.user.id, progress=progress)
+        with self.model.unit_of_work():
+            return importer.import_file(file_path, account_name=account_name, default_category=default_category)
+
+    def materialize_recurring(self, until=None) -> dict | str:
+        """Create the transactions of the recurrent incomes and subcategories due since the last run, at login."""
+        materializer = RecurringMaterializer(self.model, self.model.user.id)
+        with self.model.unit_of_work():
+            return materializer.run(until=until)
+
     def get_transactions_list(self) -> None:
         # TODO Account type
         return self.model_transaction.read_transaction_list_by_user(user_id=self.model.user.id)
 
+    def get_transactions_page(self, after=None, limit: int = 200) -> list:
+        # the pages are read by a unit of work, so the main session doesn't keep every page the user scrolled through
+        with self.model.unit_of_work():
+            return self.model_transaction.read_transaction_page(user_id=self.model.user.id, after=after, limit=limit)
+
+    def search_transactions(self, text: str, limit: int = 200) -> list:
+        """Return the user transactions whose description matches a text, the best matches first, with the
+        relationships shown in the transactions table already loaded."""
+        with self.model.unit_of_work():
+            transaction_ids = self.model_transaction.search(user_id=self.model.user.id, query=text, limit=limit)
+            if not transaction_ids:
+                return []
+            transactions = self.model_transaction.query_transactions(
+                user_id=self.model.user.id,
+                filters=TransactionFilters(transaction_ids=tuple(transaction_ids)),
+                limit=limit,
+            )
+        ranks = {transaction_id: rank for rank, transaction_id in enumerate(transaction_ids)}
+        return sorted(transactions, key=lambda transaction: ranks[transaction.id])
+
     def remove_transaction(self, transaction_item) -> None:
         """Presenter method that call model to delete transaction."""
-        account = self.model_account.read_account_by_id(transaction_item.accountId())
-        if transaction_item.transactionTypeName() == "Income":
-            if account.account_type == AccountTypeEnum.DEBIT:
-                account.balance -= transaction_item._value
-            elif account.account_type == AccountTypeEnum.CARD:
-                account.balance += transaction_item._value
-        elif transaction_item.transactionTypeName() == "Expense":
-            if account.account_type == AccountTypeEnum.DEBIT:
-                account.balance += transaction_item._value
-            elif account.account_type == AccountTypeEnum.CARD:
-                account.balance -= transaction_item._value
-        elif transaction_item.transactionTypeName() == "Transfer":
-            target_account = self.model_account.read_account_by_id(transaction_item.targetAccountId())
-            account.balance += transaction_item._value
-            target_account.balance -= transaction_item._value
-            self.model_account.update_account(target_account)
-
-        self.model_account.update_account(account)
-
+        # the account balances are updated by the database
         self.model_transaction.delete_transaction(transaction_item.id())
 
-    def get_month_summary(self):
-        user_categories_list = self.model_user_subcategory.read_user_subcategories_by_user(user_id=self.model.user.id)
+    def get_month_summary(self, year: int = None, month: int = None):
+        now = datetime.now()
+        year = year or now.year
+        month = month or now.month
+        months = month_span(month_key(year, month), month_key(year, month))
+        user_categories_totals = [
+            (x, month_total)
+            for x, month_total in self.model_user_subcategory.read_user_subcategories_with_month_totals(
+                user_id=self.model.user.id, month=month_key(year, month)
+            )
+            if x.subcategory.recurrent
+        ]
+        if self.default_currency_id is not None:
+            # the month totals of the rollups add every currency, they are read again per currency to convert them
+            month_totals = self.get_subcategory_month_totals(months)
+            user_categories_totals = [(x, month_totals.get(x.subcategory_id, 0)) for x, _ in user_categories_totals]
+        # the budgets of every subcategory are computed at once, in cents
+        recurrences = Recurrences.from_objects(x.subcategory for x, _ in user_categories_totals)
+        currency_ids = [x.subcategory.currency_id for x, _ in user_categories_totals]
+        rate_day = self.rate_days(months)[0]
+        monthly_budgets = self.to_default_currency(recurrences.monthly_budget(months)[:, 0], currency_ids, rate_day)
+        yearly_budgets = self.to_default_currency(recurrences.yearly_budget([year])[:, 0], currency_ids, rate_day)
         month_summary = []
-        current_year = datetime.now().year
-        current_month = datetime.now().month
-        number_of_weeks = len(monthcalendar(current_year, current_month))
-        number_of_days = monthrange(current_year, current_month)[1]
-        for x in user_categories_list:
-            transaction_summary = []
-            if x.subcategory.recurrent:
-                category_subcategory_name = f"{x.subcategory.category.name} - {x.subcategory.name}"
-                transaction_summary.append(category_subcategory_name)
-                anual_budget = self.yearly_recurrence_balance(x.subcategory) / 100
-                transaction_summary.append(anual_budget)
-                recurrent_value = self.monthly_recurrence_balance(x.subcategory, number_of_days, number_of_weeks) / 100
-                transaction_summary.append(recurrent_value)
-                transaction_summary.append(x.subcategory.recurrence.value)
-                subcategory_transactions = self.model_transaction.read_transaction_list_by_subcategory(
-                    subcategory_id=x.subcategory_id
-                )
-                current_month_transactions_value = 0
-                for y in subcategory_transactions:
-                    transaction_date: datetime = y.date
-                    if transaction_date.year == current_year and transaction_date.month == current_month:
-                        current_month_transactions_value += y.value / 100
-                transaction_summary.append(current_month_transactions_value)
-                transaction_summary.append(recurrent_value - current_month_transactions_value)
-
-                month_summary.append(transaction_summary)
+        for (x, month_total), monthly_budget, yearly_budget in zip(
+            user_categories_totals, monthly_budgets.tolist(), yearly_budgets.tolist()
+        ):
+            category_subcategory_name = f"{x.subcategory.category.name} - {x.subcategory.name}"
+            recurrent_value = monthly_budget / 100
+            current_month_transactions_value = month_total / 100
+            month_summary.append(
+                [
+                    category_subcategory_name,
+                    yearly_budget / 100,
+                    recurrent_value,
+                    x.subcategory.recurrence.value,
+                    current_month_transactions_value,
+                    recurrent_value - current_month_transactions_value,
+                ]
+            )
         return month_summary
 
+    def get_subcategory_month_totals(self, months: np.ndarray) -> dict:
+        """Return the total of the user transactions of each subcategory in the months, in the default currency."""
+        rows = self.model_monthly_rollup.read_currency_totals(
+            user_id=self.model.user.id,
+            first_month=str(months[0]),
+            last_month=str(months[-1]),
+            group_by="subcategory_id",
+        )
+        totals = self.to_default_currency(
+            [total for *_, total in rows],
+            [currency_id for _, _, currency_id, _ in rows],
+            self.rate_days(np.array([row_month for _, row_month, _, _ in rows], dtype="datetime64[M]")),
+        )
+        month_totals = {}
+        for (subcategory_id, *_), total in zip(rows, totals.tolist()):
+            month_totals[subcategory_id] = month_totals.get(subcategory_id, 0) + total
+        return month_totals
+
+    def get_budget_report(self, first_month: str, last_month: str) -> BudgetReport:
+        """Return the budget report of the user subcategories from first_month to last_month, both "YYYY-MM"."""
+        return build_budget_report(self.model, self.model.user.id, first_month, last_month)
+
+    def get_cash_flow_forecast(self, months: int = 12) -> CashFlowForecast:
+        """Return the projected balances of the user accounts for the next months, cached until their data changes."""
+        return self.forecasts.get(self.model.user.id, months=months)
+
+    # currency conversion
+    def set_default_currency(self, currency_name: str) -> None:
+        """Set the currency the totals are shown in, by its name like in the settings, or None to add the values as
+        they are."""
+        currency = next(
+            (record for record in self.model_currency.read_currency_records().values() if record.name == currency_name),
+            None,
+        )
+        self.default_currency_id = currency.id if currency is not None else None
+
+    def load_exchange_rates(self, file_path: str, **options) -> dict | str:
+        """Import the exchange rates of a CSV file, see import_exchange_rates for the options."""
+        with self.model.unit_of_work():
+            return import_exchange_rates(self.model, file_path, **options)
+
+    @staticmethod
+    def rate_days(months: np.ndarray) -> np.ndarray:
+        """Return the day of the rates of the totals of each datetime64[M] month, its last day or today."""
+        last_days = (np.asarray(months, dtype="datetime64[M]") + 1).astype("datetime64[D]") - 1
+        return np.minimum(last_days, np.datetime64(date.today(), "D"))
+
+    def to_default_currency(self, values, currency_ids, days) -> np.ndarray:
+        """Return the values converted to the default currency with the exchange rates of their days.
+
+        Args:
+            values: the values in cents.
+            currency_ids: the currency id of each value, None for the default currency.
+            days: the date of each value rate, or a date for all of them.
+
+        Returns:
+            np.ndarray: a float array with the values in cents, as they are if there's no default currency. The
+                values in a currency without a rate on their day are left as they are too.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if self.default_currency_id is None or len(values) == 0:
+            return values
+        currency_ids = [
+            self.default_currency_id if currency_id is None else currency_id for currency_id in currency_ids
+        ]
+        converted = self.exchange_rates.get().convert(values, currency_ids, self.default_currency_id, days)
+        return np.where(np.isnan(converted), values, converted)
+
     # utils
     def get_currency(self):
-        return self.model_currency.read_currencies()
+        # the records are cached by the model until a currency is written, so the views can ask for them every time
+        return tuple(self.model_currency.read_currency_records().values())
+
+    def get_currency_record(self, currency_id: int):
+        return self.model_currency.read_currency_record(currency_id)
 
     def get_transaction_types(self):
         return TransactionTypeEnum
@@ -512,26 +520,23 @@ class Presenter:
     def format_transaction_data(self, transaction_data):
         keys_to_remove = ["account_name", "category_name", "target_account_name"]
         formatted_transaction_data = {**transaction_data}
+        # the ids come from the cached lookup tables, without a query for each name
+        lookup_tables = self.references.get(self.model.user.id)
 
         # get account id using account name
-        account_id = self.model_account.read_account_by_name(transaction_data["account_name"]).id
-        formatted_transaction_data["account_id"] = account_id
+        formatted_transaction_data["account_id"] = lookup_tables.account_id(transaction_data["account_name"])
 
         # get targret account id using account name
         if transaction_data["target_account_name"]:
-            target_account_id = self.model_account.read_account_by_name(transaction_data["target_account_name"]).id
+            target_account_id = lookup_tables.account_id(transaction_data["target_account_name"])
             formatted_transaction_data["target_account_id"] = target_account_id
 
-        # split the category to get category and subcatebory id
+        # the category is named "Category - Subcategory", or "Income - name" for the incomes
         if transaction_data["transaction_type"] == "Expense" or transaction_data["transaction_type"] == "Transfer":
-            subcategory_split = transaction_data["category_name"].split(" - ")
-            category_id = self.get_category_id_by_name(subcategory_split[0])
-            subcategory_id = self.model_subcategory.read_subcategory_by_name(subcategory_split[1], category_id).id
+            subcategory_id = lookup_tables.subcategory_id(transaction_data["category_name"])
             formatted_transaction_data["subcategory_id"] = subcategory_id
         elif transaction_data["transaction_type"] == "Income":
-            income_name = transaction_data["category_name"].split(" - ")[1]
-            income_id = self.model_income.read_income_by_name(income_name).id
-            formatted_transaction_data["income_id"] = income_id
+            formatted_transaction_data["income_id"] = lookup_tables.income_id(transaction_data["category_name"])
 
         # update date string to string format
         formatted_transaction_data["date"] = datetime.strptime(transaction_data["date"], "%Y/%m/%d").date()
@@ -545,38 +550,8 @@ class Presenter:
 
         return formatted_transaction_data
 
-    def monthly_recurrence_balance(self, recurrence, number_of_days: int, number_of_weeks: int) -> int:
-        monthly_balance = 0
-        if recurrence.recurrence == RecurrenceEnum.DAY:
-            monthly_balance += recurrence.recurrence_value * number_of_days
-        if recurrence.recurrence == RecurrenceEnum.WEEK:
-            monthly_balance += recurrence.recurrence_value * number_of_weeks
-        if recurrence.recurrence == RecurrenceEnum.MONTH:
-            monthly_balance += recurrence.recurrence_value
-        if recurrence.recurrence == RecurrenceEnum.YEAR:
-            monthly_balance += recurrence.recurrence_value / 12
-        return monthly_balance
-
-    def yearly_recurrence_balance(self, recurrence) -> int:
-        yearly_balance = 0
-        current_year = datetime.now().year
-        number_of_days = 366 if isleap(current_year) else 365
-        number_of_weeks = 52
-        number_of_months = 12
-        if recurrence.recurrence == RecurrenceEnum.DAY:
-            yearly_balance += recurrence.recurrence_value * number_of_days
-        if recurrence.recurrence == RecurrenceEnum.WEEK:
-            yearly_balance += recurrence.recurrence_value * number_of_weeks
-        if recurrence.recurrence == RecurrenceEnum.MONTH:
-            yearly_balance += recurrence.recurrence_value * number_of_months
-        if recurrence.recurrence == RecurrenceEnum.YEAR:
-            yearly_balance += recurrence.recurrence_value
-
-        return yearly_balance
-
     def update_view_models(self):
-        self.view.homepage_view.monthly_budget.set_table_selection()
-        self.view.homepage_view.monthly_budget.total_budgeted()
+        self.event_bus.transactions_changed.emit()
 
     def check_mandatory_fields(self, field: str):
         self.checked_field = None
@@ -0,0 +1,38 @@
+from threading import Lock
+
+from ezbudget.importers import LookupTables
+
+
+class ReferenceCache:
+    """Keep the LookupTables of each user until the tables they are built from are written.
+
+    The cache compares the Model.revision of the tables, so the ids are loaded again after any create, update or
+    delete of the accounts, categories, subcategories or incomes, from any session, and the forms that turn names into
+    ids don't query the database in between. The balances the triggers write with every transaction are left out of
+    the revision, they don't change the names.
+    """
+
+    TABLES = ("accounts", "categories", "subcategories", "incomes")
+
+    def __init__(self, model) -> None:
+        self.model = model
+        self._lookup_tables = {}
+        self._lock = Lock()
+
+    def get(self, user_id: int) -> LookupTables:
+        """Return the LookupTables of a user, from the cache when the tables weren't written since."""
+        # read before building, a write while the tables are loaded leaves them outdated for the next call
+        revision = self.model.revision(*self.TABLES, triggered=False)
+        with self._lock:
+            cached = self._lookup_tables.get(user_id)
+            if cached is not None and cached[0] == revision:
+                return cached[1]
+
+        lookup_tables = LookupTables(self.model, user_id)
+        with self._lock:
+            self._lookup_tables[user_id] = (revision, lookup_tables)
+        return lookup_tables
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lookup_tables.clear()
@@ -0,0 +1 @@
+from .materializer import DEFAULT_ANCHOR, RecurringMaterializer
@@ -0,0 +1,126 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from ezbudget.analytics import DEFAULT_ANCHOR, Recurrences
+from ezbudget.model import TransactionTypeEnum
+
+
+class RecurringMaterializer:
+    """Create the transactions of the recurrent incomes and user subcategories of a user, as they become due.
+
+    Each run creates the occurrences from the day after the last run up to a day, in a single database transaction
+    with ModelRecurringOccurrence.create_occurrences. The occurrences are worked out as arrays from the recurrences,
+    so a run costs the number of due occurrences and not the number of days since the last run. The first run only
+    creates the occurrences of its own day, and the recurrences without a value don't create any.
+
+    Args:
+        model: the application model.
+        user_id: the user that owns the incomes and subcategories.
+    """
+
+    def __init__(self, model, user_id: int) -> None:
+        self.model = model
+        self.user_id = user_id
+
+    def due_transactions(self, first_day: date, last_day: date) -> list[dict]:
+        """Return the transactions of the occurrences from first_day to last_day, inclusive.
+
+        An income goes to its account. The expense of a subcategory comes from the account most of its transactions
+        were made from, or the first user account, in the currency of the account.
+
+        Returns:
+            list: the transactions, as dicts with the create_transaction arguments as keys, ordered by date.
+        """
+        accounts = sorted(self.model.model_account.read_accounts_by_user(user_id=self.user_id), key=lambda a: a.id)
+        if not accounts:
+            return []
+        currencies = {account.id: account.currency_id for account in accounts}
+
+        incomes = self.model.model_income.read_incomes_by_user(user_id=self.user_id)
+        sources = [
+            (income.account_id, income.currency_id, TransactionTypeEnum.Income, income.id, None, income.name)
+            for income in incomes
+        ]
+        records = [
+            (income.recurrent, income.recurrence, income.recurrence_value, income.income_date) for income in incomes
+        ]
+        subcategory_accounts = self.model.model_monthly_rollup.read_subcategory_accounts(user_id=self.user_id)
+        for (
+            subcategory_id,
+            category_name,
+            subcategory_name,
+            recurrent,
+            recurrence,
+            value,
+        ) in self.model.model_user_subcategory.read_user_subcategory_recurrences(user_id=self.user_id):
+            account_id = subcategory_accounts.get(subcategory_id, accounts[0].id)
+            sources.append(
+                (
+                    account_id,
+                    currencies[account_id],
+                    TransactionTypeEnum.Expense,
+                    None,
+                    subcategory_id,
+                    f"{category_name} - {subcategory_name}",
+                )
+            )
+            records.append((recurrent, recurrence, value, None))
+
+        recurrences = Recurrences.from_records(records, default_anchor=DEFAULT_ANCHOR)
+        rows, dates = recurrences.occurrences(first_day, last_day)
+        # a recurrent subcategory without a value has nothing to book
+        valued = recurrences.values[rows] != 0
+        rows, dates = rows[valued], dates[valued]
+        order = np.argsort(dates, kind="stable")
+        transactions = []
+        for row, day in zip(rows[order].tolist(), dates[order].tolist()):
+            account_id, currency_id, transaction_type, income_id, subcategory_id, description = sources[row]
+            transactions.append(
+                {
+                    "account_id": account_id,
+                    "date": datetime(day.year, day.month, day.day),
+                    "transaction_type": transaction_type,
+                    "value": int(recurrences.values[row]),
+                    "currency_id": currency_id,
+                    "subcategory_id": subcategory_id,
+                    "income_id": income_id,
+                    "description": description,
+                }
+            )
+        return transactions
+
+    def run(self, until: date = None) -> dict | str:
+        """Create the transactions due since the last run, up to a day.
+
+        Args:
+            until: the last day to create the transactions of, today by default.
+
+        Returns:
+            dict: the run summary, with the first_day and last_day of the run and the created transaction_ids.
+            str: the error message, if the transactions failed to be created.
+        """
+        until = until or date.today()
+        last_run = self.model.model_recurring_occurrence.read_last_run(user_id=self.user_id)
+        first_day = until if last_run is None else last_run.date() + timedelta(days=1)
+        if first_day > until:
+            return {"first_day": first_day, "last_day": until, "transaction_ids": []}
+
+        transactions = self.due_transactions(first_day, until)
+        # the run starts after the last one, the occurrences already created only matter when two runs overlap
+        created = self.model.model_recurring_occurrence.read_occurrence_keys(
+            user_id=self.user_id,
+            start=datetime.combine(first_day, datetime.min.time()),
+            end=datetime.combine(until, datetime.min.time()),
+        )
+        transactions = [
+            transaction
+            for transaction in transactions
+            if (transaction["income_id"], transaction["subcategory_id"], transaction["date"]) not in created
+        ]
+        transaction_ids = self.model.model_recurring_occurrence.create_occurrences(
+            user_id=self.user_id, transactions=transactions, last_run=datetime.combine(until, datetime.min.time())
+        )
+        if isinstance(transaction_ids, str):
+            return transaction_ids
+        return {"first_day": first_day, "last_day": until, "transaction_ids": transaction_ids}
@@ -1 +1,3 @@
+from .dates import month_key
 from .hash import get_hashed_password, verify_password
+from .settings import read_user_settings, save_user_settings
@@ -0,0 +1,11 @@
+def month_key(year: int, month: int) -> str:
+    """Return the "YYYY-MM" key of a month, as stored in the monthly rollups.
+
+    Args:
+        year: the year of the month.
+        month: the month number, from 1 to 12.
+
+    Returns:
+        str: the month key.
+    """
+    return f"{year:04d}-{month:02d}"
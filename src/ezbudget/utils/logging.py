@@ -1,7 +1,10 @@
 import logging
 import logging.config
 
-logging.config.fileConfig("log.ini")
-
 # Create the logger
 logger = logging.getLogger(__name__)
+
+
+def configure_logging(config_file: str = "log.ini") -> None:
+    """Set up the loggers, handlers and formatters of a logging config file."""
+    logging.config.fileConfig(config_file, disable_existing_loggers=False)
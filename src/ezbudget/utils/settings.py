@@ -0,0 +1,31 @@
+import toml
+from cryptography.fernet import Fernet
+
+USER_SETTINGS_FILETYPE = "toml"
+
+
+def default_user_settings() -> dict:
+    return {"default_currency": None, "user_currencies": []}
+
+
+def user_settings_path(basedir: str, user) -> str:
+    return f"{basedir}/{user.username}_settings.{USER_SETTINGS_FILETYPE}"
+
+
+def read_user_settings(basedir: str, user) -> dict:
+    """Return the saved settings of a user, decrypted with its personal key, or the defaults if none were saved."""
+    try:
+        with open(user_settings_path(basedir, user), "rb") as file:
+            encrypted_settings = file.read()
+    except FileNotFoundError:
+        return default_user_settings()
+    if not encrypted_settings:
+        return default_user_settings()
+    return default_user_settings() | toml.loads(Fernet(user.personal_key).decrypt(encrypted_settings).decode())
+
+
+def save_user_settings(basedir: str, user, settings: dict) -> None:
+    """Save the settings of a user, encrypted with its personal key."""
+    encrypted_settings = Fernet(user.personal_key).encrypt(toml.dumps(settings).encode())
+    with open(user_settings_path(basedir, user), "wb") as file:
+        file.write(encrypted_settings)
@@ -24,25 +24,29 @@ class HomePageView(QWidget):
         # setup the layout
         vbl_homepage = QVBoxLayout()
 
-        # setup table view for accounts
-        self.summary = Summary(self.presenter)
-        self.accounts = Accounts(self, self.presenter)
-        self.income_sources = IncomeSources(self, self.presenter)
-        self.categories = Categories(self.presenter)
-        self.user_categories = UserCategories(self, self.presenter)
-        self.transactions = Transactions(self, self.presenter)
-        self.monthly_budget = MonthlyBudget(self.presenter)
+        # the tabs are built, and load their data, the first time they are selected
+        self.tabs = [
+            ("summary", "Home", lambda: Summary(self.presenter)),
+            ("accounts", "Accounts", lambda: Accounts(self, self.presenter)),
+            ("income_sources", "Income Sources", lambda: IncomeSources(self, self.presenter)),
+            ("categories", "Manage Categories", lambda: Categories(self.presenter)),
+            ("user_categories", "User Categories", lambda: UserCategories(self, self.presenter)),
+            ("transactions", "Transactions", lambda: Transactions(self, self.presenter)),
+            ("monthly_budget", "Monthly Budget", lambda: MonthlyBudget(self.presenter)),
+        ]
 
         # setup the stacked layout
         tbl_homepage = QTabWidget()
         tbl_homepage.setTabPosition(QTabWidget.South)
-        tbl_homepage.addTab(self.summary, "Home")
-        tbl_homepage.addTab(self.accounts, "Accounts")
-        tbl_homepage.addTab(self.income_sources, "Income Sources")
-        tbl_homepage.addTab(self.categories, "Manage Categories")
-        tbl_homepage.addTab(self.user_categories, "User Categories")
-        tbl_homepage.addTab(self.transactions, "Transactions")
-        tbl_homepage.addTab(self.monthly_budget, "Monthly Budget")
+        for name, title, _ in self.tabs:
+            setattr(self, name, None)
+            page = QWidget()
+            vbl_page = QVBoxLayout(page)
+            vbl_page.setContentsMargins(0, 0, 0, 0)
+            tbl_homepage.addTab(page, title)
+        self.tbl_homepage = tbl_homepage
+        self.current_tab = self.build_tab(tbl_homepage.currentIndex())
+        tbl_homepage.currentChanged.connect(self.on_tab_changed)
 
         # place the widgets
         vbl_homepage.addWidget(self.header, 1)
@@ -50,3 +54,26 @@ class HomePageView(QWidget):
 
         # set the base layout
         self.setLayout(vbl_homepage)
+
+    def build_tab(self, index: int) -> QWidget:
+        """Return the tab at the index, it is built the first time.
+
+        Args:
+            index: the index of the tab in the tab widget.
+
+        Returns:
+            QWidget: the tab.
+        """
+        name, _, create_tab = self.tabs[index]
+        tab = getattr(self, name)
+        if tab is None:
+            tab = create_tab()
+            setattr(self, name, tab)
+            self.tbl_homepage.widget(index).layout().addWidget(tab)
+        return tab
+
+    def on_tab_changed(self, index):
+        # the requests of the tab that was left would only deliver results nobody is looking at
+        if hasattr(self.current_tab, "cancel_requests"):
+            self.current_tab.cancel_requests()
+        self.current_tab = self.build_tab(index)
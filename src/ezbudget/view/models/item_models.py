@@ -1,6 +1,3 @@
-from PySide6.QtCore import QDateTime
-
-
 class UserCategoryItem:
     def __init__(self, data):
         self.name = data.name
@@ -43,7 +40,25 @@ class SubCategoryItem:
 
 
 class TransactionItem:
-    def __init__(self, transaction):
+    # the table shows thousands of these, so they are kept small and their display strings are built only once, the
+    # currency is kept as its id and its symbol comes from the shared CurrencyRecord
+    __slots__ = (
+        "_id",
+        "account_id",
+        "account_name",
+        "category_name",
+        "subcategory_name",
+        "income_name",
+        "_date",
+        "transaction_type",
+        "currency_id",
+        "_value",
+        "description",
+        "target_account_id",
+        "display",
+    )
+
+    def __init__(self, transaction, currency):
         self._id = transaction.id
         self.account_id = transaction.account_id
         self.account_name = transaction.account.name
@@ -52,10 +67,19 @@ class TransactionItem:
         self.income_name = transaction.income.name if transaction.income is not None else None
         self._date = transaction.date
         self.transaction_type = transaction.transaction_type
-        self.currency = transaction.currency
+        self.currency_id = transaction.currency_id
         self._value = transaction.value
         self.description = transaction.description
         self.target_account_id = transaction.target_account_id
+        # the text of each column of the transactions table
+        self.display = (
+            self.account_name,
+            self.category(),
+            self.date(),
+            self.transactionTypeName(),
+            self.valueWithCurrency(currency),
+            self.description,
+        )
 
     def category(self):
         if self.transaction_type.name == "Expense" or self.transaction_type.name == "Transfer":
@@ -64,20 +88,16 @@ class TransactionItem:
             return f"Income - {self.income_name}"
 
     def date(self):
-        date_time = QDateTime.fromString(str(self._date), "yyyy-MM-dd hh:mm:ss")
-        return date_time.toString("dd/MM/yyyy")
+        return self._date.strftime("%d/%m/%Y")
 
-    def valueWithCurrency(self):
-        return f"{self.currencySymbol()} {self.value()}"
+    def valueWithCurrency(self, currency):
+        return f"{currency.symbol} {self.value()}"
 
     def value(self):
         return self._value / 100
 
-    def currencySymbol(self):
-        return self.currency.symbol
-
-    def currencyName(self):
-        return self.currency.name
+    def currencyId(self):
+        return self.currency_id
 
     def transactionTypeValue(self):
         return self.transaction_type.value
@@ -1,3 +1,5 @@
+from operator import attrgetter
+
 from PySide6.QtCore import (
     QAbstractItemModel,
     QAbstractListModel,
@@ -7,6 +9,10 @@ from PySide6.QtCore import (
     Signal,
 )
 
+# looking up Qt.DisplayRole costs more than the rest of TableModel.data, so the roles it checks are looked up once
+DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+USER_ROLE = Qt.ItemDataRole.UserRole
+
 
 class AbstractListModel(QAbstractListModel):
     def __init__(self, item_list=None):
@@ -150,10 +156,85 @@ class CategoryModel(QAbstractItemModel):
 
 
 class TableModel(QAbstractTableModel):
-    def __init__(self, transactions):
+    """Table of transaction items, from the most recent.
+
+    With a fetch_page function the transactions are loaded one page at a time, when the view scrolls to the end
+    of the rows already loaded (canFetchMore/fetchMore). fetch_page is called with the (date, id) of the last
+    loaded transaction, or None for the first page, and the page size, and returns the transaction items of the
+    next page.
+
+    The row of each transaction id is kept in an index, so rows are found without scanning the table, and the
+    batched updateTransactions/removeTransactions emit one signal per run of contiguous rows.
+    """
+
+    def __init__(self, transactions=None, fetch_page=None, page_size: int = 200):
         super().__init__()
-        self.transactions = transactions
+        self.transactions = transactions or []
+        self.rows_by_id = {}
+        self.reindexRows()
         self.headers = ["Account", "Category", "Date", "Type", "Value", "Description"]
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.all_fetched = fetch_page is None
+        if not self.all_fetched:
+            self.fetchMore()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.all_fetched
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        last_item = self.transactions[-1] if self.transactions else None
+        page = self.fetch_page(self.sortKey(last_item) if last_item else None, self.page_size)
+        self.all_fetched = len(page) < self.page_size
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.transactions), len(self.transactions) + len(page) - 1)
+            self.transactions.extend(page)
+            self.reindexRows(len(self.transactions) - len(page))
+            self.endInsertRows()
+
+    def refresh(self):
+        """Reload the transactions from the first page."""
+        self.beginResetModel()
+        self.transactions = []
+        self.rows_by_id = {}
+        self.all_fetched = self.fetch_page is None
+        self.endResetModel()
+        self.fetchMore()
+
+    def showTransactions(self, transactions):
+        """Show a fixed list of transaction items, like search results, until the next refresh."""
+        self.beginResetModel()
+        self.transactions = list(transactions)
+        self.rows_by_id = {}
+        self.reindexRows()
+        self.all_fetched = True
+        self.endResetModel()
+
+    @staticmethod
+    def sortKey(item):
+        return (item._date, item.id())
+
+    def reindexRows(self, first_row: int = 0):
+        """Update the row of the transactions from first_row to the end, after rows are inserted or removed."""
+        transaction_ids = map(attrgetter("_id"), self.transactions[first_row:])
+        self.rows_by_id.update(zip(transaction_ids, range(first_row, len(self.transactions))))
+
+    def rowForTransactionId(self, transaction_id: int) -> int:
+        return self.rows_by_id.get(transaction_id, -1)
+
+    @staticmethod
+    def contiguousRuns(rows):
+        """Return the (first, last) row of each run of contiguous rows, in ascending order."""
+        runs = []
+        for row in sorted(rows):
+            if runs and row == runs[-1][1] + 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return [tuple(run) for run in runs]
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.transactions)
@@ -161,23 +242,12 @@ class TableModel(QAbstractTableModel):
     def columnCount(self, parent=QModelIndex()):
         return len(self.headers)
 
-    def data(self, index, role=Qt.DisplayRole):
-        row_data = self.transactions[index.row()]
-        if role == Qt.DisplayRole:
-            if index.column() == 0:  # Account column
-                return row_data.account_name
-            elif index.column() == 1:  # Category column
-                return row_data.category()
-            elif index.column() == 2:  # Date column
-                return row_data.date()
-            elif index.column() == 3:  # Transaction type column
-                return row_data.transactionTypeName()
-            elif index.column() == 4:  # Value column
-                return row_data.valueWithCurrency()
-            elif index.column() == 5:  # Description column
-                return row_data.description
-        elif role == Qt.UserRole:  # Storing transaction ID in UserRole
-            return row_data.id
+    def data(self, index, role=DISPLAY_ROLE):
+        if role == DISPLAY_ROLE:
+            # Account, Category, Date, Type, Value and Description columns
+            return self.transactions[index.row()].display[index.column()]
+        elif role == USER_ROLE:  # Storing transaction ID in UserRole
+            return self.transactions[index.row()].id()
 
     def index(self, row, column, parent=QModelIndex()):
         if not self.hasIndex(row, column, parent):
@@ -196,34 +266,60 @@ class TableModel(QAbstractTableModel):
         return QModelIndex()
 
     def addTransaction(self, transaction_data):
-        self.beginInsertRows(QModelIndex(), len(self.transactions), len(self.transactions))
-        self.transactions.append(transaction_data)
+        # the rows are sorted from the most recent, find the first row older than the new one
+        key = self.sortKey(transaction_data)
+        low, high = 0, len(self.transactions)
+        while low < high:
+            middle = (low + high) // 2
+            if self.sortKey(self.transactions[middle]) > key:
+                low = middle + 1
+            else:
+                high = middle
+        # older than every loaded row, it will be in one of the pages still to fetch
+        if low == len(self.transactions) and not self.all_fetched:
+            return
+
+        self.beginInsertRows(QModelIndex(), low, low)
+        self.transactions.insert(low, transaction_data)
+        self.reindexRows(low)
         self.endInsertRows()
 
     def findItemRow(self, item):
-        for row, data_item in enumerate(self.transactions):
-            if data_item == item:
-                return row
-        return -1  # Item not found
+        return self.rowForTransactionId(item.id())
 
     def updateTransaction(self, item, updated_item):
-        row = self.findItemRow(item)
-        if row < 0 or row >= len(self.transactions):
-            return
+        if self.findItemRow(item) >= 0:
+            self.updateTransactions([updated_item])
 
-        transaction_index = self.index(row, 0)
-        self.transactions[row] = updated_item
+    def updateTransactions(self, updated_items):
+        """Replace the rows of the transactions with the same id as the updated items."""
+        updated_rows = []
+        for updated_item in updated_items:
+            row = self.rowForTransactionId(updated_item.id())
+            if row >= 0:
+                self.transactions[row] = updated_item
+                updated_rows.append(row)
 
-        self.dataChanged.emit(transaction_index, transaction_index)
+        for first_row, last_row in self.contiguousRuns(updated_rows):
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, self.columnCount() - 1))
 
     def removeTransaction(self, item):
-        row = self.findItemRow(item)
-        if row < 0 or row >= len(self.transactions):
-            return
-
-        self.beginRemoveRows(QModelIndex(), row, row)
-        del self.transactions[row]
-        self.endRemoveRows()
+        self.removeTransactions([item.id()])
+
+    def removeTransactions(self, transaction_ids):
+        """Remove the rows of the given transaction ids, from the last run of rows to the first."""
+        rows = [
+            self.rows_by_id.pop(transaction_id)
+            for transaction_id in transaction_ids
+            if transaction_id in self.rows_by_id
+        ]
+        runs = self.contiguousRuns(rows)
+        for first_row, last_row in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first_row, last_row)
+            del self.transactions[first_row : last_row + 1]
+            self.endRemoveRows()
+        if runs:
+            self.reindexRows(runs[0][0])
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
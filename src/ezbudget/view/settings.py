@@ -1,5 +1,3 @@
-import toml
-from cryptography.fernet import Fernet
 from PySide6.QtWidgets import (
     QCheckBox,
     QComboBox,
@@ -12,20 +10,18 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from ezbudget.utils import read_user_settings, save_user_settings
 from ezbudget.view.styles import MainTitle
 
-USER_SETTINGS_FILETYPE = "toml"
-
 
 class SettingsView(QWidget):
     def __init__(self, presenter, basedir, user):
         super().__init__()
         self.presenter = presenter
         self.basedir = basedir
+        self.user = user
         self.checkboxes = {}
         self.user_settings = {"default_currency": None, "user_currencies": []}
-        self.settings_filename = f"{user.username}_settings"
-        self.cipher_suite = Fernet(user.personal_key)
 
         # layout widgets
         vbl_main_layout = QVBoxLayout()
@@ -84,10 +80,9 @@ class SettingsView(QWidget):
         return self.user_settings
 
     def save_settings(self):
-        encrypted_settings = self.cipher_suite.encrypt(toml.dumps(self.user_settings).encode())
-        with open(f"{self.basedir}/{self.settings_filename}.{USER_SETTINGS_FILETYPE}", "wb") as file:
-            file.write(encrypted_settings)
+        save_user_settings(self.basedir, self.user, self.user_settings)
 
+        self.presenter.set_default_currency(self.user_settings["default_currency"])
         self.presenter.close_settings_view()
 
     def populate_currencies(self):
@@ -105,15 +100,10 @@ class SettingsView(QWidget):
             checkbox.stateChanged.connect(self.get_user_settings)
 
     def read_saved_setting(self):
-        try:
-            with open(f"{self.basedir}/{self.settings_filename}.{USER_SETTINGS_FILETYPE}", "rb") as file:
-                encrypted_settings = file.read()
-            if encrypted_settings is not None:
-                decrypted_settings = toml.loads(self.cipher_suite.decrypt(encrypted_settings).decode())
-                self.cbx_currencies.setCurrentText(decrypted_settings["default_currency"])
-                for currency_name, checkbox in self.checkboxes.items():
-                    if currency_name in decrypted_settings["user_currencies"]:
-                        checkbox.setChecked(True)
-        except FileNotFoundError:
-            with open(f"{self.basedir}/{self.settings_filename}.{USER_SETTINGS_FILETYPE}", "wb") as file:
-                pass
+        # the presenter already uses the saved default currency, it is loaded at login
+        saved_settings = read_user_settings(self.basedir, self.user)
+        if saved_settings["default_currency"] is not None:
+            self.cbx_currencies.setCurrentText(saved_settings["default_currency"])
+        for currency_name, checkbox in self.checkboxes.items():
+            if currency_name in saved_settings["user_currencies"]:
+                checkbox.setChecked(True)
@@ -137,6 +137,8 @@ class Accounts(QWidget):
 
         # signals from the models to update other elements
         self.account_list_model.rowsInserted.connect(self.on_model_row_inserted)
+        self.account_list_model.rowsInserted.connect(self.presenter.event_bus.accounts_changed)
+        self.presenter.event_bus.balances_changed.connect(self.account_list_model.updateAccounts)
 
         # setup the vertical layouts
         grb_accounts_controls.setLayout(vbl_accounts)
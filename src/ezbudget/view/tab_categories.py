@@ -118,6 +118,9 @@ class Categories(QWidget):
         self.btn_save_subcategory.clicked.connect(self.update_subcategory)
         self.lvw_user_categories.clicked.connect(self.on_table_view_selection)
         self.subcategories_model.modelReset.connect(self.on_data_change)
+        self.subcategories_model.rowsInserted.connect(self.presenter.event_bus.subcategories_changed)
+        self.subcategories_model.rowsRemoved.connect(self.presenter.event_bus.subcategories_changed)
+        self.subcategories_model.modelReset.connect(self.presenter.event_bus.subcategories_reset)
 
         # initial setup
         self.starting_setup()
@@ -148,6 +148,7 @@ class IncomeSources(QWidget):
 
         # signals from the models to update other elements
         self.incoming_list_model.rowsInserted.connect(self.on_model_row_inserted)
+        self.incoming_list_model.rowsInserted.connect(self.presenter.event_bus.incomes_changed)
 
         # setup the vertical layouts
         grb_incomings_controls.setLayout(vbl_income_sources)
@@ -171,7 +172,7 @@ class IncomeSources(QWidget):
         self.setLayout(vbl_main_layout)
 
         # listen for an accounts signal
-        self._parent.accounts.account_list_model.rowsInserted.connect(self.populate_target_accounts)
+        self.presenter.event_bus.accounts_changed.connect(self.populate_target_accounts)
 
     def starting_setup(self):
         self.populate_currencies()
@@ -43,9 +43,12 @@ class SummaryModel(QAbstractTableModel):
 
 
 class MonthlyBudget(QWidget):
+    request_channel = "monthly_budget"
+
     def __init__(self, presenter):
         super().__init__()
         self.presenter = presenter
+        self.outdated = False
 
         # setup layouts
         vbl_summary_layout = QVBoxLayout()
@@ -95,26 +98,46 @@ class MonthlyBudget(QWidget):
         hbl_bottom_layout.addWidget(self.tbl_summary, 1)
 
         self.starting_setup()
+        self.presenter.event_bus.transactions_changed.connect(self.starting_setup)
 
         # set main layout
         self.setLayout(vbl_summary_layout)
 
     def starting_setup(self):
         # load methods to populate
+        self.outdated = False
         self.total_budgeted()
         self.set_table_selection()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.outdated:
+            self.starting_setup()
+
+    def cancel_requests(self):
+        # the totals and summary are loaded again the next time the tab is shown
+        if self.presenter.cancel_requests(self.request_channel):
+            self.outdated = True
+
     def total_budgeted(self):
-        total_budgeted = self.presenter.get_total_budgeted()
-        total = self.presenter.get_total_real()
-        self.lne_budgeted_income.setText(f'{total_budgeted["budgeted_income"] / 100}')
-        self.lne_budgeted_expenses.setText(f'{total_budgeted["budgeted_expenses"] / 100}')
-        self.lne_month_income.setText(f'{total["total_income"] / 100}')
-        self.lne_month_expenses.setText(f'{total["total_expenses"] / 100}')
+        self.presenter.run_async(
+            f"{self.request_channel}.totals", self.presenter.get_month_totals, on_result=self.set_totals
+        )
+
+    def set_totals(self, totals):
+        self.lne_budgeted_income.setText(f'{totals["budgeted_income"] / 100}')
+        self.lne_budgeted_expenses.setText(f'{totals["budgeted_expenses"] / 100}')
+        self.lne_month_income.setText(f'{totals["total_income"] / 100}')
+        self.lne_month_expenses.setText(f'{totals["total_expenses"] / 100}')
 
     def on_table_selection(self): ...
 
     def set_table_selection(self):
-        self.summary = self.presenter.get_month_summary()
+        self.presenter.run_async(
+            f"{self.request_channel}.summary", self.presenter.get_month_summary, on_result=self.set_summary
+        )
+
+    def set_summary(self, summary):
+        self.summary = summary
         self.summary_model = SummaryModel(self.summary)
         self.tbl_summary.setModel(self.summary_model)
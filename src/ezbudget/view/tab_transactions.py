@@ -1,12 +1,14 @@
-from PySide6.QtCore import QDate, Qt
+from PySide6.QtCore import QDate, Qt, QTimer, Signal
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QCheckBox,
     QComboBox,
+    QFileDialog,
     QFormLayout,
     QGroupBox,
     QHBoxLayout,
     QHeaderView,
+    QLabel,
     QLineEdit,
     QPushButton,
     QTableView,
@@ -17,8 +19,14 @@ from PySide6.QtWidgets import (
 from ezbudget.view.models import CurrencyItem, TableModel, TransactionItem
 from ezbudget.view.styles import DateSetup, DoubleSpinBox, MainTitle
 
+# the search waits for the user to stop typing for this long, in milliseconds
+SEARCH_DELAY = 250
+
 
 class Transactions(QWidget):
+    # the rows read and the rows per second of the statement being imported, emitted from the worker thread
+    import_progress = Signal(int, float)
+
     def __init__(self, parent, presenter):
         super().__init__()
         self.presenter = presenter
@@ -28,6 +36,7 @@ class Transactions(QWidget):
         # instances of necessary widgets
         hbl_transactions = QHBoxLayout()
         vbl_add_edit_transactions = QVBoxLayout()
+        vbl_transactions_table = QVBoxLayout()
         vbl_main_layout = QVBoxLayout()
         frm_add_edit_transactions = QFormLayout()
         self.cbx_account = QComboBox()
@@ -41,6 +50,9 @@ class Transactions(QWidget):
         self.btn_edit_transaction = QPushButton("Save transaction")
         self.btn_delete_transaction = QPushButton("Delete transaction")
         self.btn_clear = QPushButton("Clear")
+        self.btn_import_statement = QPushButton("Import statement")
+        self.lbl_import_status = QLabel("")
+        self.lne_search = QLineEdit()
         self.tbl_transactions = QTableView()
         self.dsp_value = DoubleSpinBox()
         grb_add_transaction = QGroupBox("Add/Save/Delete transactions")
@@ -50,6 +62,7 @@ class Transactions(QWidget):
         self.cbx_transaction_type.setEditable(False)
         self.cbx_transaction_type.setDisabled(True)
         self.cbx_category.setMaximumWidth(210)
+        self.lbl_import_status.setWordWrap(True)
 
         lbl_title_transactions = MainTitle("Manage transactions")
         self.dte_transaction_date = DateSetup("dd/MM/yyyy", "yearly")
@@ -58,10 +71,8 @@ class Transactions(QWidget):
 
         self.starting_setup()
 
-        # setup the model and set it to the table
-        self.transactions_list = self.presenter.get_transactions_list()
-        transaction_items = [TransactionItem(transaction) for transaction in self.transactions_list]
-        self.transactions_list_model = TableModel(transaction_items)
+        # setup the model and set it to the table, the transactions are loaded a page at a time when scrolling
+        self.transactions_list_model = TableModel(fetch_page=self.fetch_transactions_page)
         self.tbl_transactions.setModel(self.transactions_list_model)
 
         # setup the tables
@@ -72,6 +83,15 @@ class Transactions(QWidget):
         table_header = self.tbl_transactions.horizontalHeader()
         table_header.setSectionResizeMode(QHeaderView.Stretch)
 
+        # the search runs once the user stops typing, the table shows all the transactions again when it is empty
+        self.lne_search.setPlaceholderText("Search descriptions")
+        self.lne_search.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.search_transactions)
+        self.lne_search.textChanged.connect(self.on_search_change)
+
         # target accounts setup
         self.cbx_target_account.setEnabled(False)
         self.cbx_account.currentTextChanged.connect(self.on_transfer_account_toggle)
@@ -98,6 +118,8 @@ class Transactions(QWidget):
         vbl_add_edit_transactions.addWidget(self.btn_edit_transaction)
         vbl_add_edit_transactions.addWidget(self.btn_delete_transaction)
         vbl_add_edit_transactions.addWidget(self.btn_clear)
+        vbl_add_edit_transactions.addWidget(self.btn_import_statement)
+        vbl_add_edit_transactions.addWidget(self.lbl_import_status)
         vbl_add_edit_transactions.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
         self.btn_edit_transaction.setEnabled(False)
         self.btn_delete_transaction.setEnabled(False)
@@ -106,24 +128,21 @@ class Transactions(QWidget):
         self.btn_edit_transaction.clicked.connect(self.update_transaction)
         self.btn_delete_transaction.clicked.connect(self.remove_transaction)
         self.btn_clear.clicked.connect(self.reset_fields)
+        self.btn_import_statement.clicked.connect(self.import_statement)
+        self.import_progress.connect(self.show_import_progress)
         self.cbx_category.currentTextChanged.connect(self.on_subcategory_change)
 
         # setup the horizontal layouts
         hbl_transactions.addLayout(vbl_add_edit_transactions, 1)
-        hbl_transactions.addWidget(self.tbl_transactions, 3)
-
-        # listen for an accounts signal
-        self._parent.accounts.account_list_model.rowsInserted.connect(self.populate_accounts)
-        self._parent.user_categories.user_subcategory_list_model.rowsInserted.connect(self.populate_subcategories)
-        self._parent.user_categories.user_subcategory_list_model.rowsRemoved.connect(self.populate_subcategories)
-        self._parent.categories.subcategories_model.modelReset.connect(self.populate_subcategories)
-        self._parent.income_sources.incoming_list_model.rowsInserted.connect(self.populate_subcategories)
-        self.transactions_list_model.rowsInserted.connect(self.on_model_update)
-        self.transactions_list_model.dataChanged.connect(self.on_model_update)
-        self.transactions_list_model.rowsRemoved.connect(self.on_model_update)
-        self.transactions_list_model.rowsInserted.connect(self.presenter.update_accounts_from_transaction)
-        self.transactions_list_model.dataChanged.connect(self.presenter.update_accounts_from_transaction)
-        self.transactions_list_model.rowsRemoved.connect(self.presenter.update_accounts_from_transaction)
+        vbl_transactions_table.addWidget(self.lne_search)
+        vbl_transactions_table.addWidget(self.tbl_transactions)
+        hbl_transactions.addLayout(vbl_transactions_table, 3)
+
+        # listen for the accounts and categories signals
+        self.presenter.event_bus.accounts_changed.connect(self.populate_accounts)
+        self.presenter.event_bus.user_subcategories_changed.connect(self.populate_subcategories)
+        self.presenter.event_bus.subcategories_reset.connect(self.populate_subcategories)
+        self.presenter.event_bus.incomes_changed.connect(self.populate_subcategories)
 
         # setup everything on the main layout
         vbl_main_layout.addLayout(hbl_transactions)
@@ -161,7 +180,7 @@ class Transactions(QWidget):
             self.chk_transfer_account_toggle.setChecked(False)
         self.cbx_category.setCurrentText(transaction_item.category())
         self.dte_transaction_date.setDate(transaction_item._date)
-        self.cbx_currencies.setCurrentText(transaction_item.currencyName())
+        self.cbx_currencies.setCurrentText(self.presenter.get_currency_record(transaction_item.currencyId()).name)
         self.cbx_transaction_type.setCurrentText(transaction_item.transactionTypeName())
         self.dsp_value.setValue(transaction_item.value())
         self.lne_description.setText(transaction_item.description)
@@ -178,6 +197,35 @@ class Transactions(QWidget):
         self.btn_delete_transaction.setEnabled(True)
         self.btn_clear.setEnabled(True)
 
+    def fetch_transactions_page(self, after, limit):
+        transactions = self.presenter.get_transactions_page(after, limit)
+        return [self.transaction_item(transaction) for transaction in transactions]
+
+    def transaction_item(self, transaction):
+        # the rows share the currency records, loaded once by the presenter
+        return TransactionItem(transaction, self.presenter.get_currency_record(transaction.currency_id))
+
+    def on_search_change(self):
+        # every change restarts the timer, so only the last text is searched
+        self.search_timer.start()
+
+    def search_transactions(self):
+        text = self.lne_search.text().strip()
+        if not text:
+            self.presenter.cancel_requests("transactions.search")
+            self.transactions_list_model.refresh()
+            return
+        self.presenter.run_async(
+            "transactions.search", self.presenter.search_transactions, text, on_result=self.show_search_results
+        )
+
+    def show_search_results(self, transactions):
+        # a search that finished after the search box was cleared is ignored
+        if self.lne_search.text().strip():
+            self.transactions_list_model.showTransactions(
+                self.transaction_item(transaction) for transaction in transactions
+            )
+
     def get_transaction_data(self):
         data = {
             "account_name": self.cbx_account.currentText(),
@@ -198,20 +246,62 @@ class Transactions(QWidget):
             # TODO add a label for the message error
             print(new_transaction)
         else:
-            self.transactions_list_model.addTransaction(TransactionItem(new_transaction))
+            self.transactions_list_model.addTransaction(self.transaction_item(new_transaction))
+            self.on_model_update()
 
     def update_transaction(self):
         item = self.get_selected_item()
         transaction_data = self.get_transaction_data()
         updated_transaction_data = self.presenter.update_transaction(item, transaction_data)
-        updated_transaction_item = TransactionItem(updated_transaction_data)
+        updated_transaction_item = self.transaction_item(updated_transaction_data)
         self.transactions_list_model.updateTransaction(item, updated_transaction_item)
+        self.on_model_update()
 
     def remove_transaction(self):
         item = self.get_selected_item()
         # TODO add a label for the message error
         self.presenter.remove_transaction(item)
         self.transactions_list_model.removeTransaction(item)
+        self.on_model_update()
+
+    def import_statement(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import statement", "", "Statements (*.csv *.ofx *.qfx *.qif)")
+        if not file_path:
+            return
+        self.btn_import_statement.setEnabled(False)
+        self.lbl_import_status.setText("Importing...")
+        # the selected account and category are used for the statement rows that don't have one
+        self.presenter.run_async(
+            "transactions.import",
+            self.presenter.import_statement,
+            file_path,
+            self.cbx_account.currentText(),
+            self.cbx_category.currentText(),
+            progress=self.import_progress.emit,
+            on_result=self.show_import_result,
+            on_error=self.show_import_error,
+        )
+
+    def show_import_progress(self, rows_read, rows_per_second):
+        self.lbl_import_status.setText(f"Importing... {rows_read} rows read, {rows_per_second:.0f} rows/s")
+
+    def show_import_result(self, result):
+        self.btn_import_statement.setEnabled(True)
+        if isinstance(result, str):
+            self.lbl_import_status.setText(result)
+            return
+        message = f"Imported {result['imported']} transactions in {result['seconds']:.1f} s"
+        if result["skipped"]:
+            # the reason of the first skipped row is shown, the rows are usually skipped for the same one
+            record, reason = result["skipped"][0]
+            message += f", skipped {len(result['skipped'])} rows (row {record}: {reason})"
+        self.lbl_import_status.setText(message)
+        self.transactions_list_model.refresh()
+        self.on_model_update()
+
+    def show_import_error(self, error):
+        self.btn_import_statement.setEnabled(True)
+        self.lbl_import_status.setText(error)
 
     def populate_accounts(self):
         self.accounts: list = self.presenter.get_accounts()
@@ -318,3 +408,4 @@ class Transactions(QWidget):
 
     def on_model_update(self):
         self.reset_fields()
+        self.presenter.update_accounts_from_transaction()
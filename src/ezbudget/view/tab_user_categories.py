@@ -66,10 +66,11 @@ class UserCategories(QWidget):
         vbl_main_layout.addLayout(hbl_select_user_categories)
 
         # signals
-        self._parent.categories.subcategories_model.rowsInserted.connect(self.refresh_subcategory_model_data)
-        self._parent.categories.subcategories_model.rowsRemoved.connect(self.refresh_subcategory_model_data)
-        self._parent.categories.subcategories_model.modelReset.connect(self.refresh_subcategory_model_data)
-        self._parent.categories.subcategories_model.modelReset.connect(self.refresh_user_category_model_data)
+        self.presenter.event_bus.subcategories_changed.connect(self.refresh_subcategory_model_data)
+        self.presenter.event_bus.subcategories_reset.connect(self.refresh_subcategory_model_data)
+        self.presenter.event_bus.subcategories_reset.connect(self.refresh_user_category_model_data)
+        self.user_subcategory_list_model.rowsInserted.connect(self.presenter.event_bus.user_subcategories_changed)
+        self.user_subcategory_list_model.rowsRemoved.connect(self.presenter.event_bus.user_subcategories_changed)
         btn_select_users_categories.clicked.connect(self.add_user_categories)
         btn_remove_users_categories.clicked.connect(self.remove_user_categories)
 
@@ -8,32 +8,42 @@ from ezbudget.utils import get_hashed_password
 
 @pytest.fixture(name="db_session")
 def fixture_db_session():
-    model = Model("test")
+    model = Model(category_data=None, currency_data=None, database_name="test")
     try:
         yield model
     finally:
         model.close_session()
 
 
+@pytest.fixture(name="valid_currency")
+def fixture_valid_currency(db_session):
+    db_session.model_currency.create_currency(name="Euro", symbol="€", code="EUR", symbol_position="prefix")
+
+
 @pytest.fixture(name="valid_user")
 def fixture_valid_user(db_session):
-    db_session.model_user.create_user(username="validUser", password=get_hashed_password("ValidPassword1"))
+    db_session.model_user.create_user(
+        username="validUser", password=get_hashed_password("ValidPassword1"), personal_key=b"validKey"
+    )
 
 
 @pytest.fixture(name="valid_account")
-def fixture_valid_account(db_session, valid_user):
+def fixture_valid_account(db_session, valid_user, valid_currency):
     _ = valid_user
-    db_session.model_account.create_account(user_id=1, name="validAccount")
+    _ = valid_currency
+    db_session.model_account.create_account(
+        user_id=1, name="validAccount", account_type="DEBIT", currency_id=1, balance=0
+    )
 
 
 @pytest.fixture(name="valid_category")
 def fixture_valid_category(db_session):
-    db_session.model_category.create_category(name="validCategory")
+    db_session.model_category.create_category(name="validCategory", category_type="NEED")
 
 
 @pytest.fixture()
 def second_valid_category(db_session):
-    db_session.model_category.create_category(name="secondvalidCategory")
+    db_session.model_category.create_category(name="secondvalidCategory", category_type="WANT")
 
 
 @pytest.fixture(name="valid_subcategory")
@@ -46,14 +56,18 @@ def fixture_valid_subcategory(db_session, valid_category):
 def valid_income(db_session, valid_account, valid_user):
     _ = valid_account
     _ = valid_user
-    db_session.model_income.create_income(account_id=1, user_id=1, name="validIncome")
+    db_session.model_income.create_income(
+        account_id=1, user_id=1, name="validIncome", recurrence_value=0, currency_id=1
+    )
 
 
 @pytest.fixture()
 def valid_income_second(db_session, valid_account, valid_user):
     _ = valid_account
     _ = valid_user
-    db_session.model_income.create_income(account_id=1, user_id=1, name="validIncomeSecond")
+    db_session.model_income.create_income(
+        account_id=1, user_id=1, name="validIncomeSecond", recurrence_value=0, currency_id=1
+    )
 
 
 @pytest.fixture()
@@ -61,7 +75,13 @@ def valid_transaction(db_session, valid_account, valid_subcategory):
     _ = valid_account
     _ = valid_subcategory
     db_session.model_transaction.create_transaction(
-        account_id=1, subcategory_id=1, date=datetime(2022, 12, 12), value=100, description="validTransaction"
+        account_id=1,
+        subcategory_id=1,
+        date=datetime(2022, 12, 12),
+        transaction_type="Expense",
+        value=100,
+        currency_id=1,
+        description="validTransaction",
     )
 
 
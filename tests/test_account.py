@@ -1,3 +1,5 @@
+from datetime import datetime
+
 #
 # DEFAULT BEHAVIOUR
 #
@@ -18,9 +20,12 @@ def test_success_account_read_by_name(db_session, valid_account):
     assert account.id == 1
 
 
-def test_success_account_creation(db_session, valid_user):
+def test_success_account_creation(db_session, valid_user, valid_currency):
     _ = valid_user
-    account = db_session.model_account.create_account(user_id=1, name="accountName")
+    _ = valid_currency
+    account = db_session.model_account.create_account(
+        user_id=1, name="accountName", account_type="DEBIT", currency_id=1, balance=0
+    )
 
     assert isinstance(account.id, int)
     assert account.id == 1
@@ -42,6 +47,52 @@ def test_success_account_update(db_session, valid_account):
     assert updated_account.balance == 100
 
 
+def test_success_account_balance_kept_by_transactions(db_session, valid_account, valid_subcategory):
+    """Tests that creating, updating and deleting transactions keeps the account balances."""
+    _ = valid_account
+    _ = valid_subcategory
+    db_session.model_account.create_account(user_id=1, name="card", account_type="CARD", currency_id=1, balance=1000)
+    expense = db_session.model_transaction.create_transaction(
+        account_id=1, subcategory_id=1, date=datetime(2023, 1, 1), transaction_type="Expense", value=300, currency_id=1
+    )
+    db_session.model_transaction.create_transaction(
+        account_id=2, subcategory_id=1, date=datetime(2023, 1, 2), transaction_type="Expense", value=200, currency_id=1
+    )
+    transfer = db_session.model_transaction.create_transaction(
+        account_id=1,
+        subcategory_id=1,
+        date=datetime(2023, 1, 3),
+        transaction_type="Transfer",
+        value=500,
+        currency_id=1,
+        target_account_id=2,
+    )
+    assert db_session.model_account.read_account_by_id(1).balance == -800
+    assert db_session.model_account.read_account_by_id(2).balance == 1700
+
+    expense.value = 100
+    expense.account_id = 2
+    db_session.model_transaction.update_transaction(expense)
+    db_session.model_transaction.delete_transaction(transfer.id)
+
+    assert db_session.model_account.read_account_by_id(1).balance == 0
+    assert db_session.model_account.read_account_by_id(2).balance == 1300
+    assert db_session.model_account.recompute_balances() == {}
+
+
+def test_success_account_recompute_balances(db_session, valid_transaction):
+    """Tests that recompute_balances finds and fixes a balance that doesn't match the transactions."""
+    _ = valid_transaction
+    account = db_session.model_account.read_account_by_id(1)
+    account.balance = 55
+    db_session.model_account.update_account(account)
+
+    assert db_session.model_account.recompute_balances() == {1: (55, -100)}
+    assert db_session.model_account.recompute_balances(fix=True) == {1: (55, -100)}
+    assert db_session.model_account.read_account_by_id(1).balance == -100
+    assert db_session.model_account.recompute_balances() == {}
+
+
 def test_success_user_accounts_list(db_session, valid_account):
     _ = valid_account
     account_list = db_session.model_account.read_accounts_by_user(user_id=1, account_type="DEBIT")
@@ -71,21 +122,28 @@ def test_error_account_read_by_name(db_session, valid_account):
 
 def test_error_account_creation_invalid_user(db_session, valid_account):
     _ = valid_account
-    account = db_session.model_account.create_account(user_id=20, name="accountName")
+    account = db_session.model_account.create_account(
+        user_id=20, name="accountName", account_type="DEBIT", currency_id=1, balance=0
+    )
 
     assert isinstance(account, str) and "User ID does not exist" in account
 
 
 def test_error_account_creation_invalid_name(db_session, valid_account):
     _ = valid_account
-    account = db_session.model_account.create_account(user_id=1, name="validAccount")
+    account = db_session.model_account.create_account(
+        user_id=1, name="validAccount", account_type="DEBIT", currency_id=1, balance=0
+    )
 
     assert account == "Account name already exists"
 
 
-def test_error_account_creation_invalid_type(db_session, valid_user):
+def test_error_account_creation_invalid_type(db_session, valid_user, valid_currency):
     _ = valid_user
-    account = db_session.model_account.create_account(user_id=1, name="validAccount", account_type="STUPID")
+    _ = valid_currency
+    account = db_session.model_account.create_account(
+        user_id=1, name="validAccount", account_type="STUPID", currency_id=1, balance=0
+    )
 
     assert (
         account
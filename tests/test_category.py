@@ -28,7 +28,7 @@ def test_success_read_category_list(db_session, valid_category):
 
 
 def test_success_category_creation(db_session):
-    category = db_session.model_category.create_category(name="newCategory")
+    category = db_session.model_category.create_category(name="newCategory", category_type="NEED")
 
     assert isinstance(category.id, int)
     assert category.id == 1
@@ -62,6 +62,6 @@ def test_error_read_category_list(db_session):
 
 def test_error_category_creation_name_exist(db_session, valid_category):
     _ = valid_category
-    category_id = db_session.model_category.create_category(name="validCategory")
+    category_id = db_session.model_category.create_category(name="validCategory", category_type="NEED")
 
     assert category_id == "Category already exists"
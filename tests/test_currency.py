@@ -0,0 +1,44 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+from sqlalchemy import event
+
+from ezbudget.model import CurrencyRecord
+
+
+# DEFAULT BEHAVIOUR
+def test_success_currency_read_records(db_session, valid_currency):
+    """Tests the success of the read_currency_records method, reading the currencies once until one is created."""
+    _ = valid_currency
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _ = conn, cursor, parameters, context, executemany
+        statements.append(statement)
+
+    records = db_session.model_currency.read_currency_records()
+    event.listen(db_session.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        assert db_session.model_currency.read_currency_records() is records
+        assert db_session.model_currency.read_currency_record(1) is records[1]
+    finally:
+        event.remove(db_session.engine, "before_cursor_execute", before_cursor_execute)
+
+    assert statements == []
+    assert records == {1: CurrencyRecord(id=1, name="Euro", symbol="€", code="EUR", symbol_position="prefix")}
+
+    db_session.model_currency.create_currency(name="Dollar", symbol="$", code="USD", symbol_position="prefix")
+    assert [record.code for record in db_session.model_currency.read_currency_records().values()] == ["EUR", "USD"]
+
+
+# ERROR HANDLING
+def test_error_currency_read_records(db_session, valid_currency):
+    """Tests the records can't be changed, and the None of the read_currency_record method for an unknown id."""
+    _ = valid_currency
+    records = db_session.model_currency.read_currency_records()
+
+    with pytest.raises(FrozenInstanceError):
+        records[1].symbol = "$"
+    with pytest.raises(TypeError):
+        records[2] = records[1]
+    assert db_session.model_currency.read_currency_record(55) is None
@@ -0,0 +1,95 @@
+import logging
+import threading
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from ezbudget.presenter.dispatcher import Dispatcher
+
+
+@pytest.fixture(name="application")
+def fixture_application():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture(name="dispatcher")
+def fixture_dispatcher(db_session, application):
+    _ = application
+    dispatcher = Dispatcher(unit_of_work=db_session.unit_of_work, max_threads=1)
+    yield dispatcher
+    dispatcher.wait()
+
+
+def deliver(dispatcher, application):
+    dispatcher.wait()
+    application.processEvents()
+
+
+# DEFAULT BEHAVIOUR
+def test_submit_runs_the_read_in_a_worker_thread_with_its_own_session(
+    db_session, dispatcher, application, valid_account
+):
+    _ = valid_account
+    results = []
+
+    def read_accounts():
+        return threading.get_ident(), db_session.session(), db_session.model_account.read_accounts_by_user(user_id=1)
+
+    dispatcher.submit("accounts", read_accounts, on_result=results.append)
+    deliver(dispatcher, application)
+
+    thread_id, session, accounts = results[0]
+    assert thread_id != threading.get_ident()
+    assert session is not db_session.session()
+    assert [account.name for account in accounts] == ["validAccount"]
+    assert not dispatcher.is_pending("accounts")
+
+
+def test_submit_on_the_same_channel_drops_the_stale_result(dispatcher, application):
+    results = []
+    release = threading.Event()
+
+    dispatcher.submit("blocker", release.wait)
+    dispatcher.submit("summary", lambda: "stale", on_result=results.append)
+    dispatcher.submit("summary", lambda: "fresh", on_result=results.append)
+    release.set()
+    deliver(dispatcher, application)
+
+    assert results == ["fresh"]
+
+
+def test_cancel_drops_the_sub_channels(dispatcher, application):
+    results = []
+    release = threading.Event()
+
+    dispatcher.submit("blocker", release.wait)
+    dispatcher.submit("monthly_budget.totals", lambda: "totals", on_result=results.append)
+    dispatcher.submit("monthly_budget.summary", lambda: "summary", on_result=results.append)
+    dispatcher.submit("transactions", lambda: "transactions", on_result=results.append)
+
+    assert dispatcher.cancel("monthly_budget") == 2
+    release.set()
+    deliver(dispatcher, application)
+
+    assert results == ["transactions"]
+    assert not dispatcher.is_pending("monthly_budget.totals")
+
+
+# ERROR HANDLING
+def test_submit_delivers_the_error_message(dispatcher, application):
+    errors = []
+
+    dispatcher.submit("broken", lambda: 1 / 0, on_error=errors.append)
+    deliver(dispatcher, application)
+
+    assert errors == ["A ZeroDivisionError occurred: division by zero"]
+
+
+def test_submit_logs_the_error(dispatcher, application, caplog):
+    with caplog.at_level(logging.ERROR, logger="ezbudget.presenter.dispatcher"):
+        request_id = dispatcher.submit("broken", lambda: 1 / 0)
+        deliver(dispatcher, application)
+
+    (record,) = caplog.records
+    assert record.getMessage() == f"The request {request_id} failed"
+    assert record.exc_info[0] is ZeroDivisionError
@@ -0,0 +1,207 @@
+import io
+import math
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import numpy as np
+from cryptography.fernet import Fernet
+
+from ezbudget.analytics import ExchangeRateCache, ExchangeRates
+from ezbudget.importers import import_exchange_rates, read_rates_csv
+from ezbudget.presenter import Presenter
+from ezbudget.utils import get_hashed_password, save_user_settings
+
+EUR, USD, GBP, JPY = 1, 2, 3, 4
+ROWS = [
+    (EUR, USD, datetime(2024, 1, 1), 1.10),
+    (EUR, USD, datetime(2024, 2, 1), 1.20),
+    (EUR, GBP, datetime(2024, 1, 1), 0.80),
+]
+
+
+def create_currencies(db_session):
+    db_session.model_currency.create_currency(name="Dollar", symbol="$", code="USD", symbol_position="prefix")
+    db_session.model_currency.create_currency(name="Pound", symbol="£", code="GBP", symbol_position="prefix")
+
+
+def create_rates(db_session):
+    return db_session.model_exchange_rate.create_exchange_rates(
+        {"base_currency_id": base, "quote_currency_id": quote, "rate_date": rate_date, "rate": rate}
+        for base, quote, rate_date, rate in ROWS
+    )
+
+
+# DEFAULT BEHAVIOUR
+def test_success_exchange_rates_create(db_session, valid_currency):
+    _ = valid_currency
+    create_currencies(db_session)
+
+    assert create_rates(db_session) == 3
+    # the rate of a pair on a date that already has one is replaced
+    assert (
+        db_session.model_exchange_rate.create_exchange_rates(
+            [{"base_currency_id": EUR, "quote_currency_id": USD, "rate_date": datetime(2024, 2, 1), "rate": 1.25}]
+        )
+        == 1
+    )
+    assert [tuple(row) for row in db_session.model_exchange_rate.read_exchange_rates()] == [
+        (EUR, USD, datetime(2024, 1, 1), 1.10),
+        (EUR, USD, datetime(2024, 2, 1), 1.25),
+        (EUR, GBP, datetime(2024, 1, 1), 0.80),
+    ]
+
+
+def test_exchange_rates_as_of_lookups():
+    exchange_rates = ExchangeRates(ROWS)
+
+    assert exchange_rates.rate(EUR, USD, date(2024, 1, 31)) == 1.10
+    assert exchange_rates.rate(EUR, USD, date(2024, 2, 1)) == 1.20
+    assert exchange_rates.rate(EUR, EUR, date(2020, 1, 1)) == 1.0
+    # the inverse of the opposite pair, and through a currency with rates to both
+    assert math.isclose(exchange_rates.rate(USD, EUR, date(2024, 3, 1)), 1 / 1.20)
+    assert math.isclose(exchange_rates.rate(USD, GBP, date(2024, 1, 15)), 0.80 / 1.10)
+    assert math.isclose(exchange_rates.rate(GBP, USD, date(2024, 2, 15)), 1.20 / 0.80)
+
+
+def test_exchange_rates_vectorized_convert():
+    exchange_rates = ExchangeRates(ROWS)
+    currency_ids = np.array([EUR, USD, USD, GBP, USD])
+    days = np.array(["2024-01-10", "2024-01-10", "2024-02-10", "2024-02-10", "2024-02-10"], dtype="datetime64[D]")
+
+    converted = exchange_rates.convert([100, 110, 120, 80, 160], currency_ids, EUR, days)
+    assert np.allclose(converted, [100, 100, 100, 100, 160 / 1.20])
+    # the vectorized rates are the ones of the single lookups
+    expected = [exchange_rates.rate(int(currency_id), GBP, day.item()) for currency_id, day in zip(currency_ids, days)]
+    assert np.allclose(exchange_rates.rates_to(currency_ids, GBP, days), expected)
+    # a single day is used for every value
+    assert np.allclose(exchange_rates.convert([110, 220], [USD, USD], EUR, date(2024, 1, 10)), [100, 200])
+
+
+def test_exchange_rate_cache(db_session, valid_currency):
+    _ = valid_currency
+    create_currencies(db_session)
+    cache = ExchangeRateCache(db_session)
+    exchange_rates = cache.get()
+    assert len(exchange_rates) == 0
+    assert cache.get() is exchange_rates
+
+    create_rates(db_session)
+    assert len(cache.get()) == 3
+
+
+def test_read_rates_csv_long_and_wide():
+    long_file = io.StringIO('date,base,quote,rate\n2024-01-01,eur,usd,1.10\n2024-01-02,EUR,GBP,"0,80"\n')
+    assert [(row["base"], row["quote"], row["rate"]) for row in read_rates_csv(long_file)] == [
+        ("EUR", "USD", 1.10),
+        ("EUR", "GBP", 0.80),
+    ]
+
+    wide_file = io.StringIO("Date,USD,GBP,JPY\n2024-01-01,1.10,0.80,N/A\n2024-01-02,1.12,,160.5\n")
+    rows = list(read_rates_csv(wide_file, columns={"date": "Date"}, base="EUR"))
+    assert [(row["record"], row["rate_date"], row["quote"], row["rate"]) for row in rows] == [
+        (1, datetime(2024, 1, 1), "USD", 1.10),
+        (1, datetime(2024, 1, 1), "GBP", 0.80),
+        (2, datetime(2024, 1, 2), "USD", 1.12),
+        (2, datetime(2024, 1, 2), "JPY", 160.5),
+    ]
+
+
+def test_success_import_exchange_rates(db_session, valid_currency):
+    _ = valid_currency
+    create_currencies(db_session)
+    source = io.StringIO("Date,USD,GBP,JPY\n2024-01-01,1.10,0.80,160.5\n")
+
+    summary = import_exchange_rates(db_session, source, columns={"date": "Date"}, base="EUR")
+    assert summary == {"imported": 2, "skipped": [(1, "Unknown currency: JPY")]}
+    assert len(db_session.model_exchange_rate.read_exchange_rates()) == 2
+
+
+def test_presenter_totals_in_default_currency(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    create_currencies(db_session)
+    db_session.model_account.create_account(
+        user_id=1, name="dollarAccount", account_type="DEBIT", currency_id=USD, balance=0
+    )
+    db_session.model_exchange_rate.create_exchange_rates(
+        [{"base_currency_id": EUR, "quote_currency_id": USD, "rate_date": datetime(2020, 1, 1), "rate": 1.25}]
+    )
+    for account_id, currency_id in ((1, EUR), (2, USD)):
+        db_session.model_transaction.create_transaction(
+            account_id=account_id,
+            date=datetime.now(),
+            transaction_type="Expense",
+            value=500,
+            currency_id=currency_id,
+            subcategory_id=1,
+        )
+    presenter = Presenter(db_session)
+    presenter.model.user = db_session.model_user.read_user_by_id(1)
+
+    # without a default currency the values are added as they are
+    assert presenter.get_total_real()["total_expenses"] == 1000
+    presenter.set_default_currency("Euro")
+    assert presenter.get_total_real()["total_expenses"] == 900
+    assert presenter.handle_set_total_accounts()["balance"] == -900
+    presenter.set_default_currency("Dollar")
+    assert presenter.get_total_real()["total_expenses"] == 1125
+
+
+def test_presenter_login_loads_default_currency(db_session, valid_currency, tmp_path):
+    _ = valid_currency
+    create_currencies(db_session)
+    user = db_session.model_user.create_user(
+        username="settingsUser", password=get_hashed_password("ValidPassword1"), personal_key=Fernet.generate_key()
+    )
+    save_user_settings(tmp_path, user, {"default_currency": "Dollar", "user_currencies": ["Euro", "Dollar"]})
+    presenter = Presenter(db_session, settings_dir=tmp_path)
+    presenter.view = SimpleNamespace(show_homepage=lambda user: None)
+
+    # the settings view is never built, the currency comes from the saved settings
+    presenter.login({"username": "settingsUser", "password": "ValidPassword1"})
+    assert presenter.default_currency_id == USD
+
+    # without saved settings the values are added as they are
+    db_session.model_user.create_user(
+        username="newUser", password=get_hashed_password("ValidPassword1"), personal_key=Fernet.generate_key()
+    )
+    presenter.login({"username": "newUser", "password": "ValidPassword1"})
+    assert presenter.default_currency_id is None
+
+
+# ERROR HANDLING
+def test_error_exchange_rates_create(db_session, valid_currency):
+    _ = valid_currency
+    create_currencies(db_session)
+    rate = {"base_currency_id": EUR, "quote_currency_id": USD, "rate_date": datetime(2024, 1, 1), "rate": 1.1}
+
+    assert (
+        db_session.model_exchange_rate.create_exchange_rates([rate, dict(rate, quote_currency_id=55)])
+        == "Either the base or the quote currency does not exist"
+    )
+    assert db_session.model_exchange_rate.create_exchange_rates([dict(rate, rate=0)]) == (
+        "The exchange rates must be positive"
+    )
+    assert db_session.model_exchange_rate.read_exchange_rates() == []
+
+
+def test_error_exchange_rates_missing():
+    exchange_rates = ExchangeRates(ROWS)
+
+    # before the first rate of a pair, and between currencies without rates
+    assert math.isnan(exchange_rates.rate(EUR, USD, date(2023, 12, 31)))
+    assert math.isnan(exchange_rates.rate(EUR, JPY, date(2024, 1, 10)))
+    assert np.isnan(exchange_rates.convert([100, 100], [USD, JPY], EUR, date(2023, 12, 31))).all()
+
+
+def test_error_import_exchange_rates(db_session, valid_currency):
+    _ = valid_currency
+    create_currencies(db_session)
+
+    assert import_exchange_rates(db_session, io.StringIO("date,base,quote,rate\n2024-01-01,EUR,USD,abc\n")) == (
+        "Failed to read the exchange rates: Invalid rate: 'abc'"
+    )
+    assert import_exchange_rates(db_session, io.StringIO("day,base,quote,rate\n2024-01-01,EUR,USD,1\n")) == (
+        "Failed to read the exchange rates: 'date'"
+    )
+    assert db_session.model_exchange_rate.read_exchange_rates() == []
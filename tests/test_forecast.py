@@ -0,0 +1,137 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from ezbudget.analytics import ForecastCache, build_cash_flow_forecast
+from ezbudget.model import RecurrenceEnum
+
+
+def create_second_account(db_session):
+    db_session.model_account.create_account(
+        user_id=1, name="savings", account_type="DEBIT", currency_id=1, balance=10000
+    )
+
+
+def create_salary(db_session, account_id: int = 1):
+    return db_session.model_income.create_income(
+        account_id=account_id,
+        user_id=1,
+        name="salary",
+        income_date=date(2024, 1, 25),
+        recurrent=True,
+        recurrence=RecurrenceEnum.MONTH,
+        recurrence_value=100000,
+        currency_id=1,
+    )
+
+
+def create_rent(db_session):
+    subcategory = db_session.model_subcategory.create_subcategory(
+        category_id=1, name="rent", recurrent=True, recurrence=RecurrenceEnum.MONTH, recurrence_value=60000
+    )
+    db_session.model_user_subcategory.create_user_subcategory(user_id=1, subcategory_id=subcategory.id)
+    return subcategory
+
+
+# DEFAULT BEHAVIOUR
+def test_cash_flow_forecast(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    create_second_account(db_session)
+    create_salary(db_session)
+    rent = create_rent(db_session)
+    # the rent is paid from the account most of its transactions were made from
+    db_session.model_transaction.create_transaction(
+        account_id=2,
+        date=datetime(2024, 1, 2),
+        transaction_type="Expense",
+        value=60000,
+        currency_id=1,
+        subcategory_id=rent.id,
+    )
+
+    forecast = build_cash_flow_forecast(db_session, user_id=1, months=3, start=date(2024, 2, 10))
+
+    assert forecast.account_ids.tolist() == [1, 2]
+    assert forecast.account_names == ["validAccount", "savings"]
+    assert str(forecast.days[0]) == "2024-02-10"
+    assert str(forecast.days[-1]) == "2024-05-09"
+    months, balances = forecast.month_ends()
+    assert [str(month) for month in months] == ["2024-02", "2024-03", "2024-04", "2024-05"]
+    assert balances.tolist() == [[100000, 200000, 300000, 300000], [-50000, -110000, -170000, -230000]]
+    assert forecast.total()[-1] == 70000
+    assert forecast.alerts(threshold=0) == [(2, date(2024, 2, 10), -230000.0)]
+    assert forecast.alerts(threshold=-100000) == [(2, date(2024, 3, 1), -230000.0)]
+    assert forecast.alerts(threshold=-300000) == []
+
+
+def test_forecast_cache_is_rebuilt_after_a_write(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    create_salary(db_session)
+    cache = ForecastCache(db_session)
+
+    forecast = cache.get(user_id=1, months=2, start=date(2024, 2, 1))
+    assert cache.get(user_id=1, months=2, start=date(2024, 2, 1)) is forecast
+
+    create_rent(db_session)
+    rebuilt = cache.get(user_id=1, months=2, start=date(2024, 2, 1))
+    assert rebuilt is not forecast
+    assert rebuilt.balances[0, -1] == forecast.balances[0, -1] - 120000
+
+    db_session.model_transaction.create_transactions_bulk([(1, datetime(2024, 1, 5), "Expense", 500, 1, 1)])
+    assert cache.get(user_id=1, months=2, start=date(2024, 2, 1)).balances[0, 0] == rebuilt.balances[0, 0] - 500
+
+
+def test_model_revision_counts_writes(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    revision = db_session.revision("accounts", "transactions", "incomes")
+
+    db_session.model_transaction.create_transaction(
+        account_id=1, date=datetime(2024, 1, 5), transaction_type="Expense", value=500, currency_id=1, subcategory_id=1
+    )
+
+    # the balance triggers write the accounts with the transactions
+    accounts, transactions, incomes = db_session.revision("accounts", "transactions", "incomes")
+    assert accounts > revision[0]
+    assert transactions > revision[1]
+    assert incomes == revision[2]
+
+
+# ERROR HANDLING
+def test_cash_flow_forecast_without_accounts(db_session, valid_user):
+    _ = valid_user
+
+    forecast = build_cash_flow_forecast(db_session, user_id=1, months=12, start=date(2024, 1, 1))
+
+    assert forecast.balances.shape == (0, 366)
+    assert forecast.alerts() == []
+    assert np.array_equal(forecast.total(), np.zeros(366))
+
+
+def test_cash_flow_forecast_leaves_out_the_incomes_of_other_accounts(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    db_session.model_user.create_user(username="otherUser", password=b"-", personal_key=b"-")
+    # the user accounts are 1 and 3, the accounts 2 and 4 are of the other user
+    for user_id, name in ((2, "other"), (1, "savings"), (2, "otherSavings")):
+        db_session.model_account.create_account(
+            user_id=user_id, name=name, account_type="DEBIT", currency_id=1, balance=0
+        )
+    for account_id in (1, 2, 4):
+        db_session.model_income.create_income(
+            account_id=account_id,
+            user_id=1,
+            name=f"salary{account_id}",
+            income_date=date(2024, 1, 25),
+            recurrent=True,
+            recurrence=RecurrenceEnum.MONTH,
+            recurrence_value=100000,
+            currency_id=1,
+        )
+
+    forecast = build_cash_flow_forecast(db_session, user_id=1, months=1, start=date(2024, 2, 1))
+
+    assert forecast.account_ids.tolist() == [1, 3]
+    assert forecast.balances[:, -1].tolist() == [100000, 0]
@@ -0,0 +1,179 @@
+from datetime import datetime
+from io import StringIO
+
+from ezbudget.importers import (
+    StatementImporter,
+    parse_amount,
+    read_csv,
+    read_ofx,
+    read_qif,
+)
+
+CSV_STATEMENT = """date,value,description,category
+2023-01-02,-12.50,Groceries,validCategory - validSubCategory
+2023-01-31,"1,500.00",Salary,Income - validIncome
+2023-02-01,-3.00,Unknown,
+"""
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20230102120000[0:GMT]
+<TRNAMT>-12.50
+<NAME>Groceries
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20230131<TRNAMT>1500.00<MEMO>Salary</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF_STATEMENT = """!Account
+NvalidAccount
+TBank
+^
+!Type:Bank
+D01/02'23
+T-12.50
+PGroceries
+LvalidCategory:validSubCategory
+^
+D02/01/2023
+T-100.00
+PSavings
+L[savingsAccount]
+^
+"""
+
+#
+# DEFAULT BEHAVIOUR
+#
+
+
+def test_success_parse_amount():
+    """Tests the success of parse_amount with the separators used in bank statements."""
+
+    assert parse_amount("-12.5") == -1250
+    assert parse_amount("1,234.56") == 123456
+    assert parse_amount("1.234,56") == 123456
+    assert parse_amount("-3,10") == -310
+    assert parse_amount("1,234") == 123400
+    assert parse_amount("(7.00)") == -700
+
+
+def test_success_read_csv():
+    """Tests the success of read_csv, skipping the empty columns."""
+    rows = list(read_csv(StringIO(CSV_STATEMENT)))
+
+    assert len(rows) == 3
+    assert rows[0] == {
+        "record": 1,
+        "date": datetime(2023, 1, 2),
+        "value": -1250,
+        "description": "Groceries",
+        "category_name": "validCategory - validSubCategory",
+    }
+    assert rows[1]["value"] == 150000
+    assert "category_name" not in rows[2]
+
+
+def test_success_read_ofx():
+    """Tests the success of read_ofx, with SGML tags in many lines and in a single line."""
+    rows = list(read_ofx(StringIO(OFX_STATEMENT)))
+
+    assert rows == [
+        {"record": 1, "date": datetime(2023, 1, 2), "value": -1250, "description": "Groceries"},
+        {"record": 2, "date": datetime(2023, 1, 31), "value": 150000, "description": "Salary"},
+    ]
+
+
+def test_success_read_qif():
+    """Tests the success of read_qif, with the account list, categories and transfers."""
+    rows = list(read_qif(StringIO(QIF_STATEMENT)))
+
+    assert rows[0] == {
+        "record": 1,
+        "date": datetime(2023, 1, 2),
+        "value": -1250,
+        "description": "Groceries",
+        "account_name": "validAccount",
+        "category_name": "validCategory - validSubCategory",
+    }
+    assert rows[1]["target_account_name"] == "savingsAccount"
+
+
+def test_success_import_statement(db_session, valid_income, valid_subcategory):
+    """Tests the success of the StatementImporter, skipping the rows that can't be mapped."""
+    _ = valid_income
+    _ = valid_subcategory
+    progress = []
+    importer = StatementImporter(db_session, user_id=1, chunk_size=2, progress=lambda *args: progress.append(args))
+    summary = importer.import_file(StringIO(CSV_STATEMENT), file_format=".csv", account_name="validAccount")
+
+    assert summary["imported"] == 2
+    assert summary["skipped"] == [(3, "Unknown category: None")]
+    assert [rows for rows, _ in progress] == [2, 3]
+    assert db_session.model_account.read_account_by_id(1).balance == 148750
+
+
+def test_success_import_statement_transfer(db_session, valid_account, valid_subcategory):
+    """Tests the success of the StatementImporter with a QIF transfer and a default category."""
+    _ = valid_account
+    _ = valid_subcategory
+    db_session.model_account.create_account(
+        user_id=1, name="savingsAccount", account_type="DEBIT", currency_id=1, balance=0
+    )
+    importer = StatementImporter(db_session, user_id=1)
+    summary = importer.import_file(
+        StringIO(QIF_STATEMENT), file_format=".qif", default_category="validCategory - validSubCategory"
+    )
+
+    assert summary["imported"] == 2
+    assert db_session.model_account.read_account_by_id(1).balance == -11250
+    assert db_session.model_account.read_account_by_id(2).balance == 10000
+
+
+#
+# ERROR HANDLING
+#
+
+
+def test_error_import_statement_format(db_session):
+    """Tests the error of the StatementImporter when the file format is not supported."""
+    summary = StatementImporter(db_session, user_id=1).import_file("statement.xlsx")
+
+    assert summary == "Unsupported statement format: .xlsx"
+
+
+def test_error_import_statement_malformed_rows(db_session, valid_account, valid_subcategory):
+    """Tests the error of the StatementImporter when rows can't be parsed, they are skipped and the rest imported."""
+    _ = valid_account
+    _ = valid_subcategory
+    statement = (
+        "date,value,category\n"
+        "2023-01-02,-1.00,validCategory - validSubCategory\n"
+        "2023-01-03,abc,validCategory - validSubCategory\n"
+        "2023-01-04,-2.00,validCategory - validSubCategory\n"
+        "Total\n"
+    )
+    summary = StatementImporter(db_session, user_id=1).import_file(
+        StringIO(statement), file_format=".csv", account_name="validAccount"
+    )
+
+    assert summary["imported"] == 2
+    assert summary["skipped"] == [
+        (2, "Invalid amount: 'abc'"),
+        (4, "time data 'Total' does not match format '%Y-%m-%d'"),
+    ]
+    assert db_session.model_account.read_account_by_id(1).balance == -300
+
+
+def test_error_read_malformed_records():
+    """Tests the error rows of read_ofx and read_qif, for a missing amount and an invalid date."""
+    ofx_rows = list(read_ofx(StringIO("<OFX><STMTTRN><DTPOSTED>20230102<NAME>Groceries</STMTTRN></OFX>")))
+    qif_rows = list(read_qif(StringIO("!Type:Bank\nD31/31/2023\nT-1.00\n^\nD01/02/2023\nT-2.00\n^\n")))
+
+    assert ofx_rows == [{"record": 1, "error": "Missing field: TRNAMT"}]
+    assert qif_rows[0] == {"record": 1, "error": "time data '31/31/2023' does not match format '%m/%d/%Y'"}
+    assert qif_rows[1]["value"] == -200
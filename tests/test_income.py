@@ -14,7 +14,9 @@ def test_success_income_read_by_name(db_session, valid_income):
 def test_success_income_creation(db_session, valid_account, valid_user):
     _ = valid_account
     _ = valid_user
-    income = db_session.model_income.create_income(account_id=1, user_id=1, name="newIncome")
+    income = db_session.model_income.create_income(
+        account_id=1, user_id=1, name="newIncome", recurrence_value=0, currency_id=1
+    )
 
     assert isinstance(income.id, int)
     assert income.id == 1
@@ -58,14 +60,18 @@ def test_error_income_read_by_name(db_session, valid_income):
 
 def test_error_income_creation_invalid_account(db_session, valid_user):
     _ = valid_user
-    income = db_session.model_income.create_income(account_id=1, user_id=1, name="newIncome")
+    income = db_session.model_income.create_income(
+        account_id=1, user_id=1, name="newIncome", recurrence_value=0, currency_id=1
+    )
 
     assert income == "User ID or Account ID does not exist"
 
 
 def test_error_income_creation_invalid_name(db_session, valid_income):
     _ = valid_income
-    income = db_session.model_income.create_income(account_id=1, user_id=1, name="validIncome")
+    income = db_session.model_income.create_income(
+        account_id=1, user_id=1, name="validIncome", recurrence_value=0, currency_id=1
+    )
 
     assert income == "Income name already exists"
 
@@ -0,0 +1,125 @@
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ezbudget.model import Account
+from ezbudget.presenter import Presenter, QueryTracer
+
+
+def create_user_subcategories(db_session, number: int):
+    for subcategory_number in range(2, number + 1):
+        db_session.model_subcategory.create_subcategory(category_id=1, name=f"subcategory{subcategory_number}")
+    for subcategory_id in range(1, number + 1):
+        db_session.model_user_subcategory.create_user_subcategory(user_id=1, subcategory_id=subcategory_id)
+
+
+def traced_presenter(db_session, tracer):
+    presenter = Presenter(db_session)
+    presenter.model.user = db_session.model_user.read_user_by_id(1)
+    db_session.session.expunge_all()
+    tracer.instrument(presenter)
+    return presenter
+
+
+# DEFAULT BEHAVIOUR
+def test_trace_presenter_calls(db_session, valid_account, valid_subcategory, caplog):
+    _ = valid_account
+    _ = valid_subcategory
+    for day in range(1, 4):
+        db_session.model_transaction.create_transaction(
+            account_id=1,
+            date=datetime(2024, 1, day),
+            transaction_type="Expense",
+            value=100,
+            currency_id=1,
+            subcategory_id=1,
+        )
+    tracer = QueryTracer(db_session)
+    tracer.enable()
+    presenter = traced_presenter(db_session, tracer)
+
+    with caplog.at_level(logging.INFO, logger="ezbudget.instrumentation"):
+        transactions = presenter.get_transactions_list()
+        presenter.get_total_real()
+
+    assert len(transactions) == 3
+    listing, totals = tracer.traces
+    assert listing.name == "Presenter.get_transactions_list"
+    assert (listing.statements, listing.rows) == (1, 3)
+    assert listing.slowest_sql.startswith("SELECT") and listing.slowest_ms <= listing.db_ms <= listing.call_ms
+    assert listing.n_plus_one == []
+    assert totals.name == "Presenter.get_total_real"
+    assert json.loads(caplog.records[0].getMessage())["name"] == "Presenter.get_transactions_list"
+    assert [total["name"] for total in tracer.summary()].count("Presenter.get_total_real") == 1
+    assert "Presenter.get_transactions_list" in tracer.format_summary()
+
+    with caplog.at_level(logging.INFO, logger="ezbudget.instrumentation"):
+        tracer.log_summary()
+    assert json.loads(caplog.records[-1].getMessage())["summary"] == tracer.summary()
+
+
+def test_trace_reports_n_plus_one(db_session, valid_account, valid_subcategory, caplog):
+    _ = valid_account
+    _ = valid_subcategory
+    create_user_subcategories(db_session, 6)
+    tracer = QueryTracer(db_session, n_plus_one=5)
+    tracer.enable()
+    presenter = traced_presenter(db_session, tracer)
+
+    with caplog.at_level(logging.INFO, logger="ezbudget.instrumentation"):
+        # the subcategory of each user subcategory is lazy loaded
+        presenter.get_total_budgeted()
+
+    (trace,) = tracer.traces
+    ((statement, times),) = trace.n_plus_one
+    assert "FROM subcategories" in statement and times == 6
+    # the rows of the lazy loads are counted with the rows of the list
+    assert trace.rows == 12
+    assert caplog.records[0].levelno == logging.WARNING
+    assert caplog.records[0].getMessage().startswith("N+1 queries in Presenter.get_total_budgeted")
+
+
+def test_nested_calls_count_in_the_outer_trace(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    tracer = QueryTracer(db_session)
+    tracer.enable()
+    presenter = traced_presenter(db_session, tracer)
+
+    presenter.get_month_totals()
+
+    (trace,) = tracer.traces
+    assert trace.name == "Presenter.get_month_totals"
+    assert trace.statements >= 3
+
+
+# ERROR HANDLING
+def test_trace_is_opt_in(db_session, valid_account):
+    _ = valid_account
+    tracer = QueryTracer(db_session)
+    presenter = traced_presenter(db_session, tracer)
+
+    presenter.get_transactions_list()
+    with tracer.trace("untraced") as trace:
+        db_session.model_account.read_accounts_by_user(user_id=1)
+    assert trace is None
+
+    tracer.enable()
+    tracer.disable()
+    presenter.get_transactions_list()
+    assert len(tracer.traces) == 0
+
+
+def test_trace_rows_only_of_the_model_sessions(db_session, valid_account):
+    _ = valid_account
+    tracer = QueryTracer(db_session)
+    tracer.enable()
+
+    # the statements of another session are counted, its results are left as they are
+    with Session(db_session.engine) as session, tracer.trace("other session") as trace:
+        assert len(session.scalars(select(Account)).all()) == 1
+    assert (trace.statements, trace.rows) == (1, 0)
+    tracer.disable()
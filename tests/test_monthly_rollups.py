@@ -0,0 +1,122 @@
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from ezbudget.model import MonthlyRollup, Transaction, TransactionTypeEnum
+
+
+def read_rollups(db_session) -> list:
+    rows = db_session.read_rows_basequery(
+        select(
+            MonthlyRollup.month,
+            MonthlyRollup.account_id,
+            MonthlyRollup.transaction_type,
+            MonthlyRollup.subcategory_id,
+            MonthlyRollup.income_id,
+            MonthlyRollup.total,
+            MonthlyRollup.count,
+        ).order_by(MonthlyRollup.month, MonthlyRollup.transaction_type)
+    )
+    return [tuple(row) for row in rows]
+
+
+def create_transaction(db_session, day: datetime, value: int, transaction_type="Expense", **ids):
+    return db_session.model_transaction.create_transaction(
+        account_id=1, date=day, transaction_type=transaction_type, value=value, currency_id=1, **ids
+    )
+
+
+# DEFAULT BEHAVIOUR
+def test_rollups_follow_transaction_writes(db_session, valid_account, valid_subcategory, valid_income):
+    _ = valid_account
+    _ = valid_subcategory
+    _ = valid_income
+    first = create_transaction(db_session, datetime(2024, 1, 10), 500, subcategory_id=1)
+    create_transaction(db_session, datetime(2024, 1, 20), 300, subcategory_id=1)
+    create_transaction(db_session, datetime(2024, 1, 25), 2000, "Income", income_id=1)
+
+    assert read_rollups(db_session) == [
+        ("2024-01", 1, TransactionTypeEnum.Expense, 1, None, 800, 2),
+        ("2024-01", 1, TransactionTypeEnum.Income, None, 1, 2000, 1),
+    ]
+
+    first.date = datetime(2024, 2, 1)
+    first.value = 700
+    db_session.model_transaction.update_transaction(first)
+    db_session.model_transaction.delete_transaction(3)
+
+    assert read_rollups(db_session) == [
+        ("2024-01", 1, TransactionTypeEnum.Expense, 1, None, 300, 1),
+        ("2024-02", 1, TransactionTypeEnum.Expense, 1, None, 700, 1),
+    ]
+
+
+def test_rollups_follow_bulk_inserts(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    rows = [(1, datetime(2024, 3, day), "Expense", 100, 1, 1) for day in range(1, 11)]
+    db_session.model_transaction.create_transactions_bulk(rows)
+
+    assert read_rollups(db_session) == [("2024-03", 1, TransactionTypeEnum.Expense, 1, None, 1000, 10)]
+
+
+def test_read_user_subcategories_with_month_totals(db_session, valid_account, valid_user_subcategory):
+    _ = valid_account
+    _ = valid_user_subcategory
+    create_transaction(db_session, datetime(2024, 1, 10), 500, subcategory_id=1)
+    create_transaction(db_session, datetime(2024, 2, 1), 900, subcategory_id=1)
+
+    rows = db_session.model_user_subcategory.read_user_subcategories_with_month_totals(user_id=1, month="2024-01")
+    assert [(user_subcategory.subcategory.name, total) for user_subcategory, total in rows] == [
+        ("validSubCategory", 500)
+    ]
+
+
+def test_read_currency_totals(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    db_session.model_currency.create_currency(name="Dollar", symbol="$", code="USD", symbol_position="prefix")
+    create_transaction(db_session, datetime(2024, 1, 10), 500, subcategory_id=1)
+    create_transaction(db_session, datetime(2024, 1, 12), 200, subcategory_id=1)
+    db_session.model_transaction.create_transaction(
+        account_id=1, date=datetime(2024, 1, 15), transaction_type="Expense", value=300, currency_id=2, subcategory_id=1
+    )
+    create_transaction(db_session, datetime(2024, 3, 1), 900, subcategory_id=1)
+
+    rows = db_session.model_monthly_rollup.read_currency_totals(
+        user_id=1, first_month="2024-01", last_month="2024-02", group_by="subcategory_id"
+    )
+    assert sorted(tuple(row) for row in rows) == [(1, "2024-01", 1, 700), (1, "2024-01", 2, 300)]
+
+
+def test_rebuild_rollups(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    create_transaction(db_session, datetime(2024, 1, 10), 500, subcategory_id=1)
+    create_transaction(db_session, datetime(2024, 2, 10), 300, subcategory_id=1)
+    expected = read_rollups(db_session)
+    db_session.session.execute(update(MonthlyRollup).values(total=0, count=99))
+    db_session.session.commit()
+
+    assert db_session.model_monthly_rollup.rebuild_rollups() == 2
+    assert read_rollups(db_session) == expected
+
+
+# ERROR HANDLING
+def test_rollups_are_untouched_by_a_rolled_back_write(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    create_transaction(db_session, datetime(2024, 1, 10), 500, subcategory_id=1)
+    db_session.session.execute(update(Transaction).values(value=10000))
+    db_session.session.rollback()
+
+    assert read_rollups(db_session) == [("2024-01", 1, TransactionTypeEnum.Expense, 1, None, 500, 1)]
+
+
+def test_read_currency_totals_unknown_group(db_session):
+    assert (
+        db_session.model_monthly_rollup.read_currency_totals(
+            user_id=1, first_month="2024-01", last_month="2024-01", group_by="category_id"
+        )
+        == "Unknown rollup group: category_id"
+    )
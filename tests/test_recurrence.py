@@ -0,0 +1,126 @@
+from calendar import monthcalendar, monthrange
+from datetime import date
+
+import numpy as np
+
+from ezbudget.analytics import (
+    Recurrences,
+    month_calendar,
+    monthly_amounts,
+    recurrence_codes,
+    yearly_amounts,
+)
+from ezbudget.model import RecurrenceEnum
+
+
+def days(*dates: str) -> np.ndarray:
+    return np.array(dates, dtype="datetime64[D]")
+
+
+# DEFAULT BEHAVIOUR
+def test_month_calendar_matches_the_calendar_module():
+    months = np.arange(np.datetime64("1999-01"), np.datetime64("2031-01"))
+    number_of_days, number_of_weeks = month_calendar(months)
+    for month, month_days, month_weeks in zip(months.tolist(), number_of_days, number_of_weeks):
+        assert month_days == monthrange(month.year, month.month)[1]
+        assert month_weeks == len(monthcalendar(month.year, month.month))
+
+
+def test_budget_amounts():
+    codes = recurrence_codes([RecurrenceEnum.DAY, RecurrenceEnum.WEEK, RecurrenceEnum.MONTH, RecurrenceEnum.YEAR, None])
+    values = np.array([10, 100, 1000, 1200, 50])
+
+    # february 2024 has 29 days over 5 calendar weeks
+    assert monthly_amounts(codes, values, np.array(["2024-02"], dtype="datetime64[M]"))[:, 0].tolist() == [
+        290,
+        500,
+        1000,
+        100,
+        0,
+    ]
+    assert yearly_amounts(codes, values, np.array([2023, 2024])).tolist() == [
+        [3650, 3660],
+        [5200, 5200],
+        [12000, 12000],
+        [1200, 1200],
+        [0, 0],
+    ]
+
+
+def test_period_amounts():
+    recurrences = Recurrences.from_records(
+        [
+            (True, RecurrenceEnum.ONE, 1, date(2024, 2, 10)),
+            (True, RecurrenceEnum.DAY, 1, date(2024, 1, 15)),
+            (True, RecurrenceEnum.WEEK, 1, date(2024, 1, 3)),
+            (True, RecurrenceEnum.MONTH, 1, date(2024, 1, 31)),
+            (True, RecurrenceEnum.YEAR, 1, date(2020, 2, 29)),
+            (False, RecurrenceEnum.DAY, 1, date(2024, 1, 1)),
+        ]
+    )
+
+    amounts = recurrences.period_amounts(days("2023-12-01", "2024-01-01", "2024-02-01", "2024-03-01", "2025-03-01"))
+
+    assert amounts.tolist() == [
+        [0, 0, 1, 0],
+        [0, 17, 29, 365],
+        [0, 5, 4, 52],
+        [0, 1, 1, 12],
+        [0, 0, 1, 1],
+        [0, 0, 0, 0],
+    ]
+
+
+def test_daily_amounts_clamp_monthly_and_yearly_occurrences_to_the_end_of_the_month():
+    recurrences = Recurrences.from_records(
+        [
+            (True, RecurrenceEnum.MONTH, 500, date(2024, 1, 31)),
+            (True, RecurrenceEnum.YEAR, 100, date(2020, 2, 29)),
+        ]
+    )
+
+    dates, amounts = recurrences.daily_amounts(date(2023, 2, 1), date(2023, 4, 30))
+
+    assert dates[amounts[0] > 0].tolist() == []
+    dates, amounts = recurrences.daily_amounts(date(2024, 2, 1), date(2025, 4, 30))
+    assert [str(day) for day in dates[amounts[0] > 0][:3]] == ["2024-02-29", "2024-03-31", "2024-04-30"]
+    assert [str(day) for day in dates[amounts[1] > 0]] == ["2024-02-29", "2025-02-28"]
+
+
+def test_recurrences_from_objects_use_the_default_anchor(db_session, valid_account):
+    _ = valid_account
+    income = db_session.model_income.create_income(
+        account_id=1,
+        user_id=1,
+        name="salary",
+        income_date=date(2024, 1, 25),
+        recurrent=True,
+        recurrence=RecurrenceEnum.MONTH,
+        recurrence_value=1000,
+        currency_id=1,
+    )
+    without_date = db_session.model_income.create_income(
+        account_id=1,
+        user_id=1,
+        name="bonus",
+        recurrent=True,
+        recurrence=RecurrenceEnum.YEAR,
+        recurrence_value=50,
+        currency_id=1,
+    )
+
+    recurrences = Recurrences.from_objects(
+        [income, without_date], anchor_attribute="income_date", default_anchor=date(2024, 6, 1)
+    )
+
+    assert recurrences.anchors.tolist() == [date(2024, 1, 25), date(2024, 6, 1)]
+    assert recurrences.period_amounts(days("2024-01-01", "2025-01-01"))[:, 0].tolist() == [12000, 50]
+
+
+# ERROR HANDLING
+def test_recurrences_without_records():
+    recurrences = Recurrences.from_records([])
+
+    assert len(recurrences) == 0
+    assert recurrences.period_amounts(days("2024-01-01", "2024-02-01")).shape == (0, 1)
+    assert recurrences.monthly_budget(np.array(["2024-01"], dtype="datetime64[M]")).shape == (0, 1)
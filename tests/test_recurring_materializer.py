@@ -0,0 +1,156 @@
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+
+from ezbudget.analytics import build_cash_flow_forecast
+from ezbudget.model import RecurrenceEnum, RecurringOccurrence, Transaction
+from ezbudget.scheduler import RecurringMaterializer
+
+
+def create_salary(db_session):
+    return db_session.model_income.create_income(
+        account_id=1,
+        user_id=1,
+        name="salary",
+        income_date=date(2024, 1, 25),
+        recurrent=True,
+        recurrence=RecurrenceEnum.MONTH,
+        recurrence_value=100000,
+        currency_id=1,
+    )
+
+
+def create_gym(db_session):
+    subcategory = db_session.model_subcategory.create_subcategory(
+        category_id=1, name="gym", recurrent=True, recurrence=RecurrenceEnum.WEEK, recurrence_value=1500
+    )
+    db_session.model_user_subcategory.create_user_subcategory(user_id=1, subcategory_id=subcategory.id)
+    return subcategory
+
+
+def read_transactions(db_session) -> list:
+    rows = db_session.read_rows_basequery(
+        select(Transaction.date, Transaction.value, Transaction.income_id, Transaction.subcategory_id).order_by(
+            Transaction.date, Transaction.id
+        )
+    )
+    return [tuple(row) for row in rows]
+
+
+# DEFAULT BEHAVIOUR
+def test_first_run_only_creates_the_occurrences_of_its_day(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    create_salary(db_session)
+    materializer = RecurringMaterializer(db_session, user_id=1)
+
+    summary = materializer.run(until=date(2024, 3, 25))
+
+    assert summary["first_day"] == date(2024, 3, 25)
+    assert len(summary["transaction_ids"]) == 1
+    assert read_transactions(db_session) == [(datetime(2024, 3, 25), 100000, 1, None)]
+    assert db_session.model_recurring_occurrence.read_last_run(user_id=1) == datetime(2024, 3, 25)
+
+
+def test_catch_up_creates_the_due_occurrences_once(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    create_salary(db_session)
+    gym = create_gym(db_session)
+    materializer = RecurringMaterializer(db_session, user_id=1)
+    materializer.run(until=date(2024, 1, 31))
+
+    summary = materializer.run(until=date(2024, 2, 29))
+
+    assert summary["first_day"] == date(2024, 2, 1)
+    # the subcategories without a date recur from a Monday
+    assert read_transactions(db_session) == [
+        (datetime(2024, 2, 5), 1500, None, gym.id),
+        (datetime(2024, 2, 12), 1500, None, gym.id),
+        (datetime(2024, 2, 19), 1500, None, gym.id),
+        (datetime(2024, 2, 25), 100000, 1, None),
+        (datetime(2024, 2, 26), 1500, None, gym.id),
+    ]
+    assert db_session.model_account.read_account_by_id(1).balance == 100000 - 4 * 1500
+
+    assert materializer.run(until=date(2024, 2, 29))["transaction_ids"] == []
+    assert len(read_transactions(db_session)) == 5
+
+
+def test_deleted_occurrences_are_not_created_again(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    create_salary(db_session)
+    materializer = RecurringMaterializer(db_session, user_id=1)
+    transaction_id = materializer.run(until=date(2024, 1, 25))["transaction_ids"][0]
+
+    assert db_session.model_transaction.delete_transaction(transaction_id) == transaction_id
+    db_session.model_recurring_occurrence.create_occurrences(user_id=1, transactions=[], last_run=datetime(2024, 1, 24))
+    materializer.run(until=date(2024, 1, 25))
+
+    assert read_transactions(db_session) == []
+    assert db_session.session.scalar(select(RecurringOccurrence.transaction_id)) is None
+
+
+def test_forecast_continues_after_the_last_run(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    create_salary(db_session)
+    create_gym(db_session)
+    # a recurrent subcategory without a value is only listed, it has no transactions
+    empty = db_session.model_subcategory.create_subcategory(
+        category_id=1, name="empty", recurrent=True, recurrence=RecurrenceEnum.WEEK
+    )
+    db_session.model_user_subcategory.create_user_subcategory(user_id=1, subcategory_id=empty.id)
+    materializer = RecurringMaterializer(db_session, user_id=1)
+    # a Monday with a salary, the first run books the gym and the salary of the day
+    materializer.run(until=date(2024, 3, 25))
+    assert db_session.model_account.read_account_by_id(1).balance == 100000 - 1500
+
+    forecast = build_cash_flow_forecast(db_session, user_id=1, months=2, start=date(2024, 3, 25))
+    # the occurrences of the first run are in the balance and not counted again, and the gym of the forecast is on
+    # the Mondays the materializer books it on
+    assert forecast.balances[0, 0] == 100000 - 1500
+    materializer.run(until=date(2024, 5, 10))
+    balance = db_session.model_account.read_account_by_id(1).balance
+    assert balance == 2 * 100000 - 7 * 1500
+    assert forecast.balances[0, (date(2024, 5, 10) - date(2024, 3, 25)).days] == balance
+    assert all(value != 0 for _, value, *_ in read_transactions(db_session))
+
+    # after the run the forecast starts from the balance it left
+    assert build_cash_flow_forecast(db_session, user_id=1, months=1, start=date(2024, 5, 1)).balances[0, 9] == balance
+
+
+# ERROR HANDLING
+def test_create_occurrences_rejects_an_occurrence_created_twice(db_session, valid_account, valid_category):
+    _ = valid_account
+    _ = valid_category
+    income = create_salary(db_session)
+    transaction = {
+        "account_id": 1,
+        "date": datetime(2024, 1, 25),
+        "transaction_type": "Income",
+        "value": 100000,
+        "currency_id": 1,
+        "subcategory_id": None,
+        "income_id": income.id,
+        "description": "salary",
+    }
+    db_session.model_recurring_occurrence.create_occurrences(
+        user_id=1, transactions=[transaction], last_run=datetime(2024, 1, 25)
+    )
+
+    response = db_session.model_recurring_occurrence.create_occurrences(
+        user_id=1, transactions=[transaction], last_run=datetime(2024, 1, 26)
+    )
+
+    assert response == "Some of the recurring transactions were already created"
+    assert db_session.session.scalar(select(func.count()).select_from(Transaction)) == 1
+    assert db_session.model_recurring_occurrence.read_last_run(user_id=1) == datetime(2024, 1, 25)
+
+
+def test_run_without_accounts(db_session, valid_user):
+    _ = valid_user
+    summary = RecurringMaterializer(db_session, user_id=1).run(until=date(2024, 1, 1))
+
+    assert summary["transaction_ids"] == []
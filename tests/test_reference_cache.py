@@ -0,0 +1,147 @@
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event
+
+from ezbudget.model import RecurrenceEnum
+from ezbudget.presenter import Presenter
+from ezbudget.presenter.reference_cache import ReferenceCache
+
+
+@contextmanager
+def count_queries(db_session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _ = conn, cursor, parameters, context, executemany
+        statements.append(statement)
+
+    event.listen(db_session.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db_session.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def create_salary(db_session):
+    return db_session.model_income.create_income(
+        account_id=1,
+        user_id=1,
+        name="salary",
+        income_date=date(2024, 1, 25),
+        recurrent=True,
+        recurrence=RecurrenceEnum.MONTH,
+        recurrence_value=100000,
+        currency_id=1,
+    )
+
+
+# DEFAULT BEHAVIOUR
+def test_reference_cache_lookups(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    create_salary(db_session)
+    cache = ReferenceCache(db_session)
+
+    with count_queries(db_session) as statements:
+        lookup_tables = cache.get(user_id=1)
+    # one query for each of the accounts, categories, incomes and subcategories
+    assert len(statements) == 4
+    assert lookup_tables.account_id("validAccount") == 1
+    assert lookup_tables.category_id("validCategory") == 1
+    assert lookup_tables.subcategory_id("validCategory - validSubCategory") == 1
+    assert lookup_tables.subcategories[("validCategory", "validSubCategory")] == 1
+    assert lookup_tables.income_id("Income - salary") == 1
+
+    with count_queries(db_session) as statements:
+        assert cache.get(user_id=1) is lookup_tables
+    assert statements == []
+
+
+def test_reference_cache_is_rebuilt_after_a_write(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    cache = ReferenceCache(db_session)
+    lookup_tables = cache.get(user_id=1)
+    assert lookup_tables.income_id("salary") is None
+
+    create_salary(db_session)
+    rebuilt = cache.get(user_id=1)
+    assert rebuilt is not lookup_tables
+    assert rebuilt.income_id("salary") == 1
+
+    subcategory = db_session.model_subcategory.read_subcategory_by_id(1)
+    subcategory.name = "renamed"
+    db_session.model_subcategory.update_subcategory(subcategory)
+    assert cache.get(user_id=1).subcategory_id("validCategory - renamed") == 1
+    assert cache.get(user_id=1).subcategory_id("validCategory - validSubCategory") is None
+
+
+def test_format_transaction_data_without_lookup_queries(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    create_salary(db_session)
+    presenter = Presenter(db_session)
+    presenter.model.user = db_session.model_user.read_user_by_id(1)
+    transaction_data = {
+        "account_name": "validAccount",
+        "target_account_name": "",
+        "category_name": "validCategory - validSubCategory",
+        "date": "2024/01/10",
+        "currency_id": 1,
+        "transaction_type": "Expense",
+        "value": 1234.0,
+        "description": "coffee",
+    }
+    presenter.format_transaction_data(dict(transaction_data))
+
+    with count_queries(db_session) as statements:
+        expense = presenter.format_transaction_data(dict(transaction_data))
+        income = presenter.format_transaction_data(
+            dict(transaction_data, category_name="Income - salary", transaction_type="Income")
+        )
+    assert statements == []
+    assert (expense["account_id"], expense["subcategory_id"], expense["value"]) == (1, 1, 1234)
+    assert income["income_id"] == 1
+
+
+def test_submit_after_a_transaction_without_lookup_queries(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    presenter = Presenter(db_session)
+    presenter.model.user = db_session.model_user.read_user_by_id(1)
+    transaction_data = {
+        "account_name": "validAccount",
+        "target_account_name": "",
+        "category_name": "validCategory - validSubCategory",
+        "date": "2024/01/10",
+        "currency_id": 1,
+        "transaction_type": "Expense",
+        "value": 1234.0,
+        "description": "coffee",
+    }
+    lookup_tables = presenter.references.get(user_id=1)
+    presenter.create_transaction(dict(transaction_data))
+
+    # the balance the trigger wrote with the first transaction doesn't reload the names
+    with count_queries(db_session) as statements:
+        presenter.create_transaction(dict(transaction_data))
+    lookups = [
+        statement for statement in statements if any(f"FROM {table}" in statement for table in ReferenceCache.TABLES)
+    ]
+    assert lookups == []
+    assert presenter.references.get(user_id=1) is lookup_tables
+    assert db_session.revision("accounts", triggered=False) < db_session.revision("accounts")
+
+
+# ERROR HANDLING
+def test_reference_cache_unknown_names(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    lookup_tables = ReferenceCache(db_session).get(user_id=1)
+
+    assert lookup_tables.account_id("unknown") is None
+    assert lookup_tables.category_id("unknown") is None
+    assert lookup_tables.subcategory_id("validCategory") is None
+    assert lookup_tables.subcategory_id(None) is None
+    assert ReferenceCache(db_session).get(user_id=55).accounts == {}
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import numpy as np
+
+from ezbudget.analytics import build_budget_report
+from ezbudget.model import RecurrenceEnum
+
+
+def create_recurrent_subcategory(db_session, name: str, recurrence: RecurrenceEnum, recurrence_value: int):
+    subcategory = db_session.model_subcategory.create_subcategory(
+        category_id=1, name=name, recurrent=True, recurrence=recurrence, recurrence_value=recurrence_value
+    )
+    db_session.model_user_subcategory.create_user_subcategory(user_id=1, subcategory_id=subcategory.id)
+    return subcategory
+
+
+def create_expense(db_session, day: datetime, value: int, subcategory_id: int):
+    db_session.model_transaction.create_transaction(
+        account_id=1, date=day, transaction_type="Expense", value=value, currency_id=1, subcategory_id=subcategory_id
+    )
+
+
+# DEFAULT BEHAVIOUR
+def test_budget_report(db_session, valid_account, valid_user_subcategory):
+    _ = valid_account
+    _ = valid_user_subcategory
+    weekly = create_recurrent_subcategory(db_session, "weekly", RecurrenceEnum.WEEK, 1000)
+    create_expense(db_session, datetime(2023, 1, 5), 100, subcategory_id=1)
+    create_expense(db_session, datetime(2023, 1, 20), 200, subcategory_id=1)
+    create_expense(db_session, datetime(2024, 1, 3), 450, subcategory_id=1)
+    create_expense(db_session, datetime(2023, 2, 1), 3000, subcategory_id=weekly.id)
+    create_expense(db_session, datetime(2022, 12, 31), 9999, subcategory_id=weekly.id)
+
+    report = build_budget_report(db_session, user_id=1, first_month="2023-01", last_month="2024-02")
+
+    assert report.labels == ["validCategory - validSubCategory", "validCategory - weekly"]
+    assert report.month_labels[0] == "2023-01"
+    assert report.month_labels[-1] == "2024-02"
+    assert report.actual[:, :2].tolist() == [[300, 0], [0, 3000]]
+    assert report.actual[:, 12:].tolist() == [[450, 0], [0, 0]]
+    assert report.budget[0].tolist() == [0] * 14
+    # january 2023 spans 6 calendar weeks and february 2023 spans 5
+    assert report.budget[1, :2].tolist() == [6000, 5000]
+    assert report.difference()[1, :2].tolist() == [6000, 2000]
+
+    assert np.isnan(report.year_over_year()[:, :12]).all()
+    assert report.year_over_year()[:, 12:].tolist() == [[150, 0], [0, -3000]]
+    assert report.year_over_year(relative=True)[0, 12] == 0.5
+    assert np.isnan(report.year_over_year(relative=True)[0, 13])
+
+    averages = report.rolling_average(window=2)
+    assert np.isnan(averages[:, 0]).all()
+    assert averages[:, 1].tolist() == [150, 1500]
+
+    years, actual, budget = report.yearly_totals()
+    assert years.tolist() == [2023, 2024]
+    assert actual.tolist() == [[300, 450], [3000, 0]]
+    assert budget[1].tolist() == [report.budget[1, :12].sum(), report.budget[1, 12:].sum()]
+
+
+# ERROR HANDLING
+def test_budget_report_without_user_subcategories(db_session, valid_account, valid_subcategory):
+    _ = valid_account
+    _ = valid_subcategory
+    create_expense(db_session, datetime(2023, 1, 5), 100, subcategory_id=1)
+
+    report = build_budget_report(db_session, user_id=1, first_month="2023-01", last_month="2023-03")
+
+    assert report.actual.shape == (0, 3)
+    assert report.budget.shape == (0, 3)
+    assert report.rolling_average(window=6).shape == (0, 3)
@@ -0,0 +1,40 @@
+import pytest
+
+from ezbudget.model import PROFILES, get_profile
+
+#
+# DEFAULT BEHAVIOUR
+#
+
+
+def test_success_default_profile_applied(db_session):
+    """Tests that the default profile pragmas are applied on the model connections."""
+    connection = db_session.session.connection()
+
+    assert connection.exec_driver_sql("PRAGMA journal_mode;").scalar() == "wal"
+    assert connection.exec_driver_sql("PRAGMA temp_store;").scalar() == 2  # MEMORY
+
+
+def test_success_get_profile_by_name():
+    """Tests the success of the get_profile function with a preset name."""
+    assert get_profile("durable") == PROFILES["durable"]
+    assert get_profile() == PROFILES["balanced"]
+
+
+def test_success_get_profile_with_overrides():
+    """Tests the success of the get_profile function with a configuration table that overrides a pragma."""
+    profile = get_profile({"profile": "bulk_load", "cache_size": -1000})
+
+    assert profile.synchronous == "OFF"
+    assert profile.cache_size == -1000
+
+
+#
+# ERROR HANDLING
+#
+
+
+def test_error_get_profile_unknown_pragma():
+    """Tests the error of the get_profile function when the configuration has an unknown pragma."""
+    with pytest.raises(TypeError, match="page_size"):
+        get_profile({"page_size": 4096})
@@ -5,7 +5,7 @@
 
 def test_success_read_subcategory_by_name(db_session, valid_subcategory):
     _ = valid_subcategory
-    subcategory = db_session.model_subcategory.read_subcategory_by_name("validSubCategory")
+    subcategory = db_session.model_subcategory.read_subcategory_by_name("validSubCategory", category_id=1)
 
     assert isinstance(subcategory.id, int)
     assert subcategory.id == 1
@@ -42,7 +42,7 @@ def test_success_subcategory_creation(db_session, valid_category):
 
 def test_error_read_subcategory_by_name(db_session, valid_subcategory):
     _ = valid_subcategory
-    subcategory_id = db_session.model_subcategory.read_subcategory_by_name("wrongSubCategory")
+    subcategory_id = db_session.model_subcategory.read_subcategory_by_name("wrongSubCategory", category_id=1)
 
     assert subcategory_id is None
 
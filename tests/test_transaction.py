@@ -1,6 +1,11 @@
 from datetime import datetime
 
-from ezbudget.model.base_models import Transaction
+from ezbudget.model import (
+    Transaction,
+    TransactionFilters,
+    TransactionTypeEnum,
+    transaction_cursor,
+)
 
 #
 # DEFAULT BEHAVIOUR
@@ -12,7 +17,13 @@ def test_success_transaction_created(db_session, valid_account, valid_subcategor
     _ = valid_account
     _ = valid_subcategory
     transaction = db_session.model_transaction.create_transaction(
-        account_id=1, subcategory_id=1, date=datetime(2022, 10, 10), value=100, description="Desc"
+        account_id=1,
+        subcategory_id=1,
+        date=datetime(2022, 10, 10),
+        transaction_type="Expense",
+        value=100,
+        currency_id=1,
+        description="Desc",
     )
 
     assert transaction.id == 1
@@ -56,25 +67,143 @@ def test_success_transaction_read_list_by_user(db_session, valid_user, valid_tra
         assert transaction.account.user_id == 1
 
 
+def test_success_transaction_read_page(db_session, valid_account, valid_subcategory):
+    """Tests the success of the read_transaction_page method, paging from the most recent transaction."""
+    _ = valid_account
+    _ = valid_subcategory
+    rows = [(1, datetime(2023, 1, day % 3 + 1), "Expense", day, 1, 1) for day in range(5)]
+    db_session.model_transaction.create_transactions_bulk(rows)
+
+    first_page = db_session.model_transaction.read_transaction_page(user_id=1, limit=3)
+    last_transaction = first_page[-1]
+    second_page = db_session.model_transaction.read_transaction_page(
+        user_id=1, after=(last_transaction.date, last_transaction.id), limit=3
+    )
+
+    assert [transaction.id for transaction in first_page] == [3, 5, 2]
+    assert [transaction.id for transaction in second_page] == [4, 1]
+    assert second_page[0].subcategory.category.name == "validCategory"
+
+
+def test_success_transaction_query(db_session, valid_account, valid_subcategory, valid_income):
+    """Tests the success of the query_transactions method, filtering and paging by value."""
+    _ = valid_account
+    _ = valid_subcategory
+    _ = valid_income
+    rows = [
+        (1, datetime(2023, 1, 10), "Expense", 500, 1, 1, None, "Groceries at the market"),
+        (1, datetime(2023, 1, 20), "Expense", 700, 1, 1, None, "Market 100% organic"),
+        (1, datetime(2023, 2, 5), "Expense", 700, 1, 1, None, "Rent"),
+        (1, datetime(2023, 2, 25), "Income", 2000, 1, None, 1, "Salary"),
+        (1, datetime(2023, 3, 1), "Expense", 300, 1, 1, None, None),
+    ]
+    db_session.model_transaction.create_transactions_bulk(rows)
+
+    january = TransactionFilters(start=datetime(2023, 1, 1), end=datetime(2023, 2, 1))
+    expenses = {"transaction_types": ("Expense",), "min_value": 400, "max_value": 700}
+    assert [t.id for t in db_session.model_transaction.query_transactions(user_id=1, filters=january)] == [2, 1]
+    assert [t.id for t in db_session.model_transaction.query_transactions(user_id=1, filters=expenses)] == [3, 2, 1]
+    assert [
+        t.id for t in db_session.model_transaction.query_transactions(user_id=1, filters={"description": "MARKET"})
+    ] == [2, 1]
+    assert [
+        t.id for t in db_session.model_transaction.query_transactions(user_id=1, filters={"description": "100%"})
+    ] == [2]
+    assert [t.id for t in db_session.model_transaction.query_transactions(user_id=1, filters={"income_ids": (1,)})] == [
+        4
+    ]
+
+    first_page = db_session.model_transaction.query_transactions(user_id=1, order="value_desc", limit=2)
+    second_page = db_session.model_transaction.query_transactions(
+        user_id=1, order="value_desc", after_cursor=transaction_cursor(first_page[-1], "value_desc"), limit=2
+    )
+    last_page = db_session.model_transaction.query_transactions(
+        user_id=1, order="value_desc", after_cursor=transaction_cursor(second_page[-1], "value_desc"), limit=2
+    )
+    assert [t.id for t in first_page + second_page + last_page] == [4, 3, 2, 1, 5]
+    assert [t.id for t in db_session.model_transaction.query_transactions(user_id=1, order="date_asc")] == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+
+
+def test_success_transaction_search(db_session, valid_account, valid_subcategory):
+    """Tests the success of the search method, matching the start of the description words and keeping the search
+    index in sync with the transaction writes."""
+    _ = valid_account
+    _ = valid_subcategory
+    rows = [
+        (1, datetime(2023, 1, 10), "Expense", 500, 1, 1, None, "Café at the station"),
+        (1, datetime(2023, 1, 20), "Expense", 700, 1, 1, None, "Coffee beans, cafe and more cafe"),
+        (1, datetime(2023, 2, 5), "Expense", 700, 1, 1, None, "Rent"),
+        (1, datetime(2023, 3, 1), "Expense", 300, 1, 1, None, None),
+    ]
+    db_session.model_transaction.create_transactions_bulk(rows)
+
+    assert db_session.model_transaction.search(user_id=1, query="CAFE") == [2, 1]
+    assert db_session.model_transaction.search(user_id=1, query="caf sta") == [1]
+    assert db_session.model_transaction.search(user_id=1, query="rent OR cafe") == []
+    assert db_session.model_transaction.search(user_id=1, query="cafe", limit=1) == [2]
+    assert db_session.model_transaction.search(user_id=1, query="cafe", candidates=1) == [2]
+
+    transaction = db_session.model_transaction.read_transaction_by_id(1)
+    transaction.description = "Groceries"
+    db_session.model_transaction.update_transaction(transaction)
+    db_session.model_transaction.delete_transaction(2)
+    assert db_session.model_transaction.search(user_id=1, query="cafe") == []
+    assert db_session.model_transaction.search(user_id=1, query="groc") == [1]
+
+    db_session.model_transaction.rebuild_search_index()
+    assert db_session.model_transaction.search(user_id=1, query="groc") == [1]
+    assert [
+        t.id for t in db_session.model_transaction.query_transactions(user_id=1, filters={"transaction_ids": (1, 3)})
+    ] == [3, 1]
+
+
 def test_success_transaction_updated(db_session, valid_transaction):
     """Tests the success of the update_transaction method."""
     _ = valid_transaction
-    updated_data = {
-        "account_id": 1,
-        "subcategory_id": 1,
-        "date": datetime(2022, 10, 10),
-        "value": 100,
-        "description": "Desc 2",
-    }
+    transaction = db_session.model_transaction.read_transaction_by_id(transaction_id=1)
+    transaction.date = datetime(2022, 10, 10)
+    transaction.description = "Desc 2"
 
     # Update the database
-    updated_transaction_id = db_session.model_transaction.update_transaction(
-        transaction_id=1, transaction_data=updated_data
-    )
+    updated_transaction = db_session.model_transaction.update_transaction(transaction)
+    db_session.session.expunge_all()
     # Read from database again
-    transaction = db_session.model_transaction.read_transaction_by_id(transaction_id=updated_transaction_id)
+    transaction = db_session.model_transaction.read_transaction_by_id(transaction_id=updated_transaction.id)
 
     assert transaction.description == "Desc 2"
+    assert transaction.date == datetime(2022, 10, 10)
+
+
+def test_success_transaction_created_bulk(db_session, valid_account, valid_subcategory):
+    """Tests the success of the create_transactions_bulk method, with dict and tuple rows and a small chunk size."""
+    _ = valid_account
+    _ = valid_subcategory
+    db_session.model_account.create_account(user_id=1, name="card", account_type="CARD", currency_id=1, balance=0)
+    rows = [
+        {
+            "account_id": 1,
+            "subcategory_id": 1,
+            "date": datetime(2023, 1, 1),
+            "transaction_type": "Income",
+            "value": 1000,
+            "currency_id": 1,
+        },
+        (1, datetime(2023, 1, 2), "Expense", 300, 1, 1),
+        (2, datetime(2023, 1, 3), TransactionTypeEnum.Expense, 200, 1, 1, None, "card expense"),
+        (1, datetime(2023, 1, 4), "Transfer", 150, 1, 1, None, "pay card", 2),
+    ]
+    transaction_ids = db_session.model_transaction.create_transactions_bulk(rows, chunk_size=3)
+
+    assert transaction_ids == [1, 2, 3, 4]
+    assert db_session.model_transaction.read_transaction_by_id(3).description == "card expense"
+    assert db_session.model_account.read_account_by_id(1).balance == 550
+    assert db_session.model_account.read_account_by_id(2).balance == 350
 
 
 def test_success_transaction_delete(db_session, valid_transaction):
@@ -95,12 +224,33 @@ def test_error_transaction_created(db_session, valid_subcategory):
     """Tests the error of the create_transaction method when the account or the subcategory don't exits."""
     _ = valid_subcategory
     transaction = db_session.model_transaction.create_transaction(
-        account_id=1, subcategory_id=1, date=datetime(2023, 5, 5), value=100, description="teste"
+        account_id=1,
+        subcategory_id=1,
+        date=datetime(2023, 5, 5),
+        transaction_type="Expense",
+        value=100,
+        currency_id=1,
+        description="teste",
     )
 
     assert transaction == "Either Account ID or SubCategory ID does not exist"
 
 
+def test_error_transaction_created_bulk(db_session, valid_account, valid_subcategory):
+    """Tests the error of the create_transactions_bulk method, when a row has an account that doesn't exist."""
+    _ = valid_account
+    _ = valid_subcategory
+    rows = [
+        (1, datetime(2023, 1, 1), "Expense", 300, 1, 1),
+        (55, datetime(2023, 1, 2), "Expense", 300, 1, 1),
+    ]
+    transaction_ids = db_session.model_transaction.create_transactions_bulk(rows, chunk_size=1)
+
+    assert transaction_ids == "Either Account ID or SubCategory ID does not exist"
+    assert db_session.model_transaction.read_transaction_list_by_account(account_id=1) == []
+    assert db_session.model_account.read_account_by_id(1).balance == 0
+
+
 def test_error_transaction_read_by_id(db_session, valid_subcategory):
     """Tests the error of the read_transaction_by_id method when the transaction don't exit."""
     _ = valid_subcategory
@@ -118,22 +268,62 @@ def test_error_transaction_read_list_by_user(db_session):
     assert transaction_list == []
 
 
+def test_error_transaction_read_page_wrong_user(db_session, valid_transaction):
+    """Tests the return of an empty page of the read_transaction_page method, when the user has no transactions."""
+    _ = valid_transaction
+    page = db_session.model_transaction.read_transaction_page(user_id=55)
+
+    assert page == []
+
+
+def test_error_transaction_query(db_session, valid_transaction):
+    """Tests the errors of the query_transactions method, for another user, an unknown order or filter."""
+    _ = valid_transaction
+    assert db_session.model_transaction.query_transactions(user_id=55) == []
+    assert db_session.model_transaction.query_transactions(user_id=1, filters={"account_ids": (55,)}) == []
+    assert db_session.model_transaction.query_transactions(user_id=1, order="name") == (
+        "Unknown transaction order: name"
+    )
+    assert db_session.model_transaction.query_transactions(user_id=1, filters={"name": "x"}).startswith(
+        "Invalid transaction filters"
+    )
+
+
+def test_error_transaction_search(db_session, valid_transaction):
+    """Tests the return of an empty list of the search method, for another user or a text without words."""
+    _ = valid_transaction
+    db_session.model_transaction.create_transaction(
+        account_id=1,
+        date=datetime(2023, 1, 1),
+        transaction_type="Expense",
+        value=1,
+        currency_id=1,
+        subcategory_id=1,
+        description="Books",
+    )
+
+    assert db_session.model_transaction.search(user_id=1, query="books") == [2]
+    assert db_session.model_transaction.search(user_id=55, query="books") == []
+    assert db_session.model_transaction.search(user_id=1, query=' "* - ') == []
+
+
 def test_error_transaction_updated_wrong_id(db_session):
-    """Tests the error of the update_transaction method, if wrong id is given."""
-
-    updated_data = {
-        "account_id": 1,
-        "subcategory_id": 1,
-        "date": datetime(2022, 10, 10),
-        "value": 100,
-        "description": "Desc 2",
-    }
-
-    updated_transaction_id = db_session.model_transaction.update_transaction(
-        transaction_id=1, transaction_data=updated_data
+    """Tests the error of the update_transaction method, if the transaction has an account that doesn't exist."""
+
+    transaction = Transaction(
+        id=1,
+        account_id=1,
+        subcategory_id=1,
+        date=datetime(2022, 10, 10),
+        transaction_type="Expense",
+        value=100,
+        currency_id=1,
+        description="Desc 2",
     )
+    updated_transaction = db_session.model_transaction.update_transaction(transaction)
 
-    assert updated_transaction_id is None
+    assert updated_transaction == "Either Account ID or SubCategory ID does not exist"
+    assert db_session.model_transaction.read_transaction_by_id(transaction_id=1) is None
 
 
 def test_error_transaction_delete(db_session, valid_transaction):
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+from sqlalchemy import select
+
+from ezbudget.model import Account
+
+
+# DEFAULT BEHAVIOUR
+def test_unit_of_work_objects_are_readable_after_the_block(db_session, valid_user, valid_currency):
+    _ = valid_user
+    _ = valid_currency
+    main_session = db_session.session()
+    with db_session.unit_of_work() as session:
+        account = db_session.model_account.create_account(
+            user_id=1, name="validAccount", account_type="DEBIT", currency_id=1, balance=100
+        )
+        assert db_session.session() is session
+        assert session is not main_session
+
+    assert db_session.session() is main_session
+    assert account.name == "validAccount"
+    assert account.balance == 100
+    assert db_session.model_account.read_account_by_name("validAccount").id == account.id
+
+
+def test_unit_of_work_in_a_thread_without_session(db_session, valid_account):
+    _ = valid_account
+    names = []
+
+    def read_accounts():
+        with db_session.unit_of_work():
+            names.extend(account.name for account in db_session.model_account.read_accounts_by_user(user_id=1))
+        names.append(db_session.session.registry.has())
+
+    thread = threading.Thread(target=read_accounts)
+    thread.start()
+    thread.join()
+
+    assert names == ["validAccount", False]
+
+
+def test_unit_of_work_trims_the_identity_map_on_commit(db_session, valid_user, valid_currency):
+    _ = valid_user
+    _ = valid_currency
+    for number in range(5):
+        db_session.model_account.create_account(
+            user_id=1, name=f"account{number}", account_type="DEBIT", currency_id=1, balance=0
+        )
+
+    with db_session.unit_of_work(identity_map_limit=3) as session:
+        accounts = session.scalars(select(Account)).all()
+        accounts[0].balance = 500
+        assert len(session.identity_map) == 5
+        session.commit()
+        assert len(session.identity_map) == 1
+        assert accounts[1].name == "account1"
+
+    assert db_session.model_account.read_account_by_name("account0").balance == 500
+
+
+# ERROR HANDLING
+def test_unit_of_work_rolls_back_when_the_block_raises(db_session, valid_user, valid_currency):
+    _ = valid_user
+    _ = valid_currency
+    with pytest.raises(ValueError):
+        with db_session.unit_of_work() as session:
+            session.add(Account(user_id=1, name="validAccount", account_type="DEBIT", currency_id=1, balance=0))
+            session.flush()
+            raise ValueError("stop")
+
+    assert db_session.model_account.read_account_by_name("validAccount") is None
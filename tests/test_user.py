@@ -4,7 +4,7 @@
 
 
 def test_success_user_creation(db_session):
-    user = db_session.model_user.create_user("username", "password")
+    user = db_session.model_user.create_user("username", "password", b"personalKey")
 
     assert isinstance(user.id, int)
     assert user.id == 1
@@ -33,7 +33,7 @@ def test_success_read_user_by_id(db_session, valid_user):
 
 def test_error_username_exist(db_session, valid_user):
     _ = valid_user
-    user = db_session.model_user.create_user("validUser", "password")
+    user = db_session.model_user.create_user("validUser", "password", b"personalKey")
 
     assert user == "User already exists"
 
@@ -46,7 +46,7 @@ def test_success_read_user_subcategory_from_user(db_session, valid_user_subcateg
 
 def test_success_delete_user_subcategory(db_session, valid_user_subcategory):
     _ = valid_user_subcategory
-    deleted_rows = db_session.model_user_subcategory.delete_user_subcategory(subcategory_id=1)
+    deleted_rows = db_session.model_user_subcategory.delete_user_subcategory(user_id=1, subcategory_id=1)
 
     assert deleted_rows == 1
 
@@ -0,0 +1,177 @@
+from datetime import datetime
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from ezbudget.view.models import TableModel, TransactionItem
+
+
+@pytest.fixture(name="application")
+def fixture_application():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture(name="transactions")
+def fixture_transactions(db_session, valid_account, valid_subcategory):
+    """Seven expenses, on the first seven days of January 2024, with ids 1 to 7."""
+    _ = valid_account
+    _ = valid_subcategory
+    db_session.model_transaction.create_transactions_bulk(
+        (1, datetime(2024, 1, day), "Expense", day * 100, 1, 1, None, f"expense{day}") for day in range(1, 8)
+    )
+
+
+def transaction_items(db_session, after=None, limit=200):
+    currency = db_session.model_currency.read_currency_record(1)
+    return [
+        TransactionItem(transaction, currency)
+        for transaction in db_session.model_transaction.read_transaction_page(user_id=1, after=after, limit=limit)
+    ]
+
+
+def transaction_item(db_session, transaction_id):
+    transaction = db_session.model_transaction.read_transaction_by_id(transaction_id)
+    return TransactionItem(transaction, db_session.model_currency.read_currency_record(transaction.currency_id))
+
+
+def row_ids(table_model):
+    return [item.id() for item in table_model.transactions]
+
+
+def assert_rows_indexed(table_model):
+    assert table_model.rows_by_id == {item.id(): row for row, item in enumerate(table_model.transactions)}
+
+
+# DEFAULT BEHAVIOUR
+def test_table_model_fetches_pages(db_session, application, transactions):
+    _ = application
+    _ = transactions
+    pages = []
+
+    def fetch_page(after, limit):
+        pages.append(after)
+        return transaction_items(db_session, after, limit)
+
+    table_model = TableModel(fetch_page=fetch_page, page_size=3)
+    assert row_ids(table_model) == [7, 6, 5]
+    assert table_model.canFetchMore()
+
+    table_model.fetchMore()
+    table_model.fetchMore()
+    assert row_ids(table_model) == [7, 6, 5, 4, 3, 2, 1]
+    assert not table_model.canFetchMore()
+    # every page starts after the (date, id) of the last row of the previous one
+    assert pages == [None, (datetime(2024, 1, 5), 5), (datetime(2024, 1, 2), 2)]
+    assert_rows_indexed(table_model)
+
+    table_model.fetchMore()
+    assert len(pages) == 3
+    table_model.refresh()
+    assert row_ids(table_model) == [7, 6, 5] and table_model.canFetchMore()
+    assert_rows_indexed(table_model)
+
+
+def test_table_model_add_transaction_in_date_order(db_session, application, transactions):
+    _ = application
+    _ = transactions
+    items = transaction_items(db_session)
+    table_model = TableModel([item for item in items if item.id() in (6, 4, 2)])
+
+    # the rows are all loaded, so a transaction older than every row is added at the end
+    for transaction_id in (5, 7, 1):
+        table_model.addTransaction(items[7 - transaction_id])
+    assert row_ids(table_model) == [7, 6, 5, 4, 2, 1]
+    assert_rows_indexed(table_model)
+
+    # on the same date, the row with the highest id is the most recent
+    db_session.model_transaction.create_transaction(
+        account_id=1, subcategory_id=1, date=datetime(2024, 1, 5), transaction_type="Expense", value=1, currency_id=1
+    )
+    table_model.addTransaction(transaction_item(db_session, 8))
+    assert row_ids(table_model) == [7, 6, 8, 5, 4, 2, 1]
+    assert_rows_indexed(table_model)
+
+
+def test_table_model_add_transaction_older_than_the_loaded_pages(db_session, application, transactions):
+    _ = application
+    _ = transactions
+    table_model = TableModel(fetch_page=lambda after, limit: transaction_items(db_session, after, limit), page_size=3)
+
+    # the transaction will be in one of the next pages
+    table_model.addTransaction(transaction_item(db_session, 1))
+    assert row_ids(table_model) == [7, 6, 5]
+    db_session.model_transaction.create_transaction(
+        account_id=1, subcategory_id=1, date=datetime(2024, 1, 6), transaction_type="Expense", value=1, currency_id=1
+    )
+    table_model.addTransaction(transaction_item(db_session, 8))
+    assert row_ids(table_model) == [7, 8, 6, 5]
+    assert_rows_indexed(table_model)
+
+
+def test_table_model_remove_transactions_by_runs(db_session, application, transactions):
+    _ = application
+    _ = transactions
+    table_model = TableModel(transaction_items(db_session))
+    removed = []
+    table_model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+
+    # ids 7 and 6 are rows 0 and 1, id 3 is row 4, an unknown id is ignored
+    table_model.removeTransactions([3, 99, 7, 6])
+    assert removed == [(4, 4), (0, 1)]
+    assert row_ids(table_model) == [5, 4, 2, 1]
+    assert_rows_indexed(table_model)
+
+    table_model.removeTransaction(transaction_item(db_session, 1))
+    assert row_ids(table_model) == [5, 4, 2]
+    assert_rows_indexed(table_model)
+
+
+def test_table_model_update_transactions_by_runs(db_session, application, transactions):
+    _ = application
+    _ = transactions
+    # the transaction with id 2 isn't in the table, its update is ignored
+    table_model = TableModel([item for item in transaction_items(db_session) if item.id() != 2])
+    changed = []
+    table_model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row(), last.column())))
+
+    updated_items = [transaction_item(db_session, transaction_id) for transaction_id in (1, 2, 6, 7)]
+    table_model.updateTransactions(updated_items)
+    assert changed == [(0, 1, 5), (5, 5, 5)]
+    assert table_model.transactions[0] is updated_items[3]
+    assert table_model.transactions[5] is updated_items[0]
+    assert_rows_indexed(table_model)
+
+
+def test_contiguous_runs():
+    assert TableModel.contiguousRuns([]) == []
+    assert TableModel.contiguousRuns([5, 1, 2, 7, 3, 8]) == [(1, 3), (5, 5), (7, 8)]
+
+
+def test_transaction_item_display(db_session, valid_income, transactions):
+    _ = valid_income
+    _ = transactions
+    db_session.model_transaction.create_transaction(
+        account_id=1,
+        income_id=1,
+        date=datetime(2024, 2, 1),
+        transaction_type="Income",
+        value=123456,
+        currency_id=1,
+        description="salary",
+    )
+
+    expense = transaction_item(db_session, 3)
+    assert expense.display == (
+        "validAccount",
+        "validCategory - validSubCategory",
+        "03/01/2024",
+        "Expense",
+        "€ 3.0",
+        "expense3",
+    )
+    income = transaction_item(db_session, 8)
+    assert income.display == ("validAccount", "Income - validIncome", "01/02/2024", "Income", "€ 1234.56", "salary")
+
+    table_model = TableModel([income, expense])
+    assert table_model.data(table_model.index(1, 1)) == "validCategory - validSubCategory"
+    assert table_model.data(table_model.index(0, 4)) == "€ 1234.56"